@@ -0,0 +1,54 @@
+"""create embedding_cache table
+
+Revision ID: 9c1e7a2b5d40
+Revises: 4e84b95a4b3a
+Create Date: 2026-10-17 10:12:31.402115
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c1e7a2b5d40"
+down_revision: Union[str, Sequence[str], None] = "4e84b95a4b3a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # key: sha256(model_name + 정규화된 텍스트), embedding: float32 원시 바이트
+    op.create_table(
+        "embedding_cache",
+        sa.Column("key", sa.Text, primary_key=True),
+        sa.Column("model_name", sa.Text, nullable=False),
+        sa.Column("embedding", sa.LargeBinary, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        # 조회/저장 시 갱신, 오래 쓰이지 않은 항목 정리 기준
+        sa.Column(
+            "last_used_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_embedding_cache_model_name", "embedding_cache", ["model_name"])
+    op.create_index(
+        "ix_embedding_cache_last_used_at", "embedding_cache", ["last_used_at"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_embedding_cache_last_used_at", table_name="embedding_cache")
+    op.drop_index("ix_embedding_cache_model_name", table_name="embedding_cache")
+    op.drop_table("embedding_cache")
@@ -0,0 +1,30 @@
+"""add tool_registry fingerprint
+
+Revision ID: b7d3f0e18a62
+Revises: 9c1e7a2b5d40
+Create Date: 2026-10-17 14:03:52.118730
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d3f0e18a62"
+down_revision: Union[str, Sequence[str], None] = "9c1e7a2b5d40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # sha256(name, description, domain, schema, 임베딩 모델). NULL이면 다음 부팅 시 재임베딩
+    op.add_column("tool_registry", sa.Column("fingerprint", sa.Text, nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tool_registry", "fingerprint")
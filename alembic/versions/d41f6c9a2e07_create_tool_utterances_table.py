@@ -0,0 +1,50 @@
+"""create tool_utterances table
+
+Revision ID: d41f6c9a2e07
+Revises: b7d3f0e18a62
+Create Date: 2026-10-17 16:42:10.503281
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f6c9a2e07"
+down_revision: Union[str, Sequence[str], None] = "b7d3f0e18a62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 도구별 예시 발화 임베딩 (max-sim 검색용). 저장 표현은 e3b8a1d05c47에서 일괄 전환
+    op.create_table(
+        "tool_utterances",
+        sa.Column(
+            "tool_name",
+            sa.Text,
+            sa.ForeignKey("tool_registry.name", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("utterance", sa.Text, primary_key=True),
+        sa.Column("embedding", sa.Text, nullable=False),
+    )
+    op.execute(
+        "ALTER TABLE tool_utterances ALTER COLUMN embedding TYPE vector(768) "
+        "USING embedding::vector"
+    )
+    op.execute(
+        "CREATE INDEX ix_tool_utterances_embedding ON tool_utterances "
+        "USING hnsw (embedding vector_cosine_ops)"
+    )
+    # 예시 발화가 없던 기존 도구도 다음 부팅 시 재임베딩되도록 지문 초기화
+    op.execute("UPDATE tool_registry SET fingerprint = NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("tool_utterances")
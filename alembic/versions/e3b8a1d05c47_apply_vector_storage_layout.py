@@ -0,0 +1,41 @@
+"""apply vector storage layout
+
+Revision ID: e3b8a1d05c47
+Revises: d41f6c9a2e07
+Create Date: 2026-10-17 21:18:44.902615
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from panager.db.vector import VectorLayout, layout_migration_sql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b8a1d05c47"
+down_revision: Union[str, Sequence[str], None] = "d41f6c9a2e07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 이 리비전 시점의 임베딩 테이블 (이후 추가되는 테이블은 자체 리비전에서 처리)
+TABLES = ("memories", "tool_registry", "tool_utterances")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 이전 리비전까지는 모두 vector(768). VECTOR_STORAGE/VECTOR_DIMENSIONS 표현으로 전환
+    target = VectorLayout.from_env()
+    for table in TABLES:
+        for statement in layout_migration_sql(table, VectorLayout(), target):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # upgrade와 같은 환경변수가 필요. 축소된 차원은 되돌릴 수 없어 ValueError
+    source = VectorLayout.from_env()
+    for table in TABLES:
+        for statement in layout_migration_sql(table, source, VectorLayout()):
+            op.execute(statement)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import logging
 import zoneinfo
 from datetime import datetime
@@ -13,11 +12,23 @@ from langchain_core.messages import (
     AnyMessage,
 )
 
+from panager.agent.prompt import (
+    build_context_prompt,
+    build_system_prompt,
+    with_turn_context,
+)
 from panager.agent.state import AgentState
-from panager.agent.utils import WEEKDAY_KO, get_llm, trim_agent_messages
+from panager.agent.utils import (
+    WEEKDAY_KO,
+    get_llm,
+    message_tokens,
+    trim_agent_messages,
+)
 
 if TYPE_CHECKING:
     from panager.agent.interfaces import UserSessionProvider
+    from panager.agent.llm import LLMClient
+    from panager.agent.registry import ToolRegistry
     from panager.core.config import Settings
 
 
@@ -35,10 +46,28 @@ class AgentNodeOutput(TypedDict):
     next_worker: NotRequired[str]
 
 
+def _log_prompt_cache(response: AnyMessage, llm_client: LLMClient | None) -> None:
+    """제공자가 보고한 캐시 적중 토큰 수를 기록합니다."""
+    if llm_client is None:
+        return
+    usage = llm_client.cache_stats.record(response)
+    if usage is None:
+        return
+    input_tokens, cached_tokens = usage
+    log.info(
+        "LLM 프롬프트 캐시: 입력 %d 토큰 중 %d 토큰 적중 (누적 적중률 %.1f%%)",
+        input_tokens,
+        cached_tokens,
+        llm_client.cache_stats.snapshot()["hit_rate"] * 100,
+    )
+
+
 async def agent_node(
     state: AgentState,
     settings: Settings,
     session_provider: UserSessionProvider,
+    registry: ToolRegistry | None = None,
+    llm_client: LLMClient | None = None,
 ) -> AgentNodeOutput:
     """사용자의 요청을 분석하여 도구를 호출하거나 응답을 생성합니다."""
     user_id = state["user_id"]
@@ -58,24 +87,19 @@ async def agent_node(
     weekday_ko = WEEKDAY_KO[now.weekday()]
     now_str = now.strftime(f"%Y년 %m월 %d일 ({weekday_ko}) %H:%M:%S")
 
-    llm = get_llm(settings)
+    # 공유 클라이언트가 주입되면 keep-alive 연결 풀을 재사용
+    llm = llm_client.chat if llm_client is not None else get_llm(settings)
 
     # 검색된 도구들이 있으면 LLM에 바인딩
     discovered_tools = state.get("discovered_tools", [])
-    if discovered_tools:
-        # Pydantic 모델 리스트를 OpenAI 규격의 dict 리스트로 변환
-        tool_schemas = [t.model_dump() for t in discovered_tools]
-        llm = llm.bind_tools(tool_schemas)
-
-    system_prompt = (
-        "당신은 Panager, 유능한 개인 비서 봇입니다. "
-        "사용자의 요청을 효율적으로 처리하기 위해 제공된 도구들을 사용하세요. "
-        "모든 응답은 반드시 한국어로 작성해야 합니다.\n"
-        f"현재 시각: {now_str} ({tz_name})\n\n"
-        "도구가 있다면 도구를 사용하여 작업을 수행하세요. "
-        "여러 단계가 필요한 작업이라면 도구를 하나씩 호출하며 진행하세요. "
-        "요청이 완료되었거나 최종 답변을 제공했다면, 추가 호출 없이 사용자에게 응답을 마칩니다.\n"
-    )
+    if discovered_tools and registry is not None:
+        # 레지스트리에 미리 계산된 스키마를 그대로 사용 (호출마다 변환하지 않음)
+        # 도구 정의는 요청 맨 앞에 직렬화되므로 관련도 순이 아닌 이름 순으로 고정
+        tool_schemas = registry.get_tool_schemas(
+            sorted(name for name in discovered_tools if isinstance(name, str))
+        )
+        if tool_schemas:
+            llm = llm.bind_tools(tool_schemas)
 
     # 메시지 정리 (예약어 제거)
     last_msg = state["messages"][-1]
@@ -97,22 +121,26 @@ async def agent_node(
         max_tokens=settings.checkpoint_max_tokens,
     )
 
-    if state.get("is_system_trigger"):
-        system_prompt += "\n\n참고: 이 메시지는 시스템 자동 트리거(예: 예약된 알림)에 의해 발생했습니다. 사용자가 보낸 것처럼 자연스럽게 처리하세요."
-
-    # 추가 컨텍스트 주입
-    task_summary = state.get("task_summary")
-    if task_summary:
-        system_prompt += f"\n\n최근 도구 실행 요약: {task_summary}"
-
-    pending_reflections = state.get("pending_reflections")
-    if pending_reflections:
-        reflections_data = [r.model_dump() for r in pending_reflections]
-        system_prompt += f"\n\n보류 중인 회고 (GitHub 변경 사항): \n{json.dumps(reflections_data, indent=2, ensure_ascii=False)}"
-
-    messages = [SystemMessage(content=system_prompt)] + trimmed_messages
+    # 시스템 메시지는 고정 프리픽스(페르소나/규칙/요약) 하나만 맨 앞에 두고, 호출마다
+    # 달라지는 컨텍스트는 최신 사용자 메시지의 사본에 붙여 제공자 캐시가 이전 이력까지
+    # 적중하도록 함 (사본은 이번 호출에만 쓰이고 상태에 저장되지 않음)
+    context_prompt = build_context_prompt(
+        now_str,
+        tz_name,
+        is_system_trigger=bool(state.get("is_system_trigger")),
+        task_summary=state.get("task_summary"),
+        pending_reflections=state.get("pending_reflections"),
+        memory_context=state.get("memory_context"),
+    )
+    messages = [
+        SystemMessage(content=build_system_prompt(state.get("conversation_summary"))),
+        *with_turn_context(trimmed_messages, context_prompt),
+    ]
 
     response = await llm.ainvoke(messages)
+    _log_prompt_cache(response, llm_client)
+    # 다음 턴 트리밍에서 재사용하도록 토큰 수를 체크포인트에 함께 저장
+    message_tokens(response)
 
     # 결과 구성
     res: AgentNodeOutput = {
@@ -0,0 +1,128 @@
+"""외부 서비스 도메인별 서킷 브레이커."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from enum import Enum
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+
+def _status_code(exc: BaseException) -> int | None:
+    """클라이언트 라이브러리별 HTTP 오류에서 상태 코드를 꺼냅니다.
+
+    httpx.HTTPStatusError(`response.status_code`), notion_client
+    APIResponseError(`status`), googleapiclient HttpError(`resp.status`).
+    """
+    for value in (
+        getattr(getattr(exc, "response", None), "status_code", None),
+        getattr(exc, "status", None),
+        getattr(getattr(exc, "resp", None), "status", None),
+    ):
+        if value is None:
+            continue
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """서비스 자체의 장애(타임아웃, 연결 오류, 5xx)인지 판단합니다.
+
+    4xx, 리소스 없음, 잘못된 데이터, 토큰 만료 등은 특정 사용자의 요청에
+    국한된 오류이므로 모든 사용자가 공유하는 브레이커에 반영하지 않습니다.
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    status = _status_code(exc)
+    return status is not None and status >= 500
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """연속 실패가 임계값에 도달하면 일정 시간 동안 호출을 즉시 거부합니다.
+
+    Google/GitHub/Notion 등 상위 서비스가 장애일 때 매 도구 호출이 타임아웃까지
+    기다리며 사용자 락과 LLM 반복을 소모하지 않도록 합니다. `reset_seconds`가
+    지나면 한 번의 시험 호출(half-open)을 허용하고, 성공하면 닫고 실패하면
+    다시 엽니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def retry_after(self) -> float:
+        """열린 상태에서 시험 호출이 허용되기까지 남은 초."""
+        if self._state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_seconds - self._clock())
+
+    def allow(self) -> bool:
+        """호출을 진행해도 되는지 반환합니다 (half-open에서는 시험 호출 하나만 허용)."""
+        if self._state is CircuitState.CLOSED:
+            return True
+        if self._state is CircuitState.OPEN:
+            if self.retry_after() > 0:
+                return False
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        if self._state is not CircuitState.CLOSED:
+            log.info("서킷 브레이커 닫힘 (%s): 서비스 응답 회복", self.name)
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """서비스 상태와 무관하게 끝난 호출(인증 필요, 잘못된 인자, 취소)을 반영합니다."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if (
+            self._state is CircuitState.HALF_OPEN
+            or self._failures >= self.failure_threshold
+        ):
+            if self._state is not CircuitState.OPEN:
+                log.warning(
+                    "서킷 브레이커 열림 (%s): 연속 실패 %d회, %.0f초 동안 호출 차단",
+                    self.name,
+                    self._failures,
+                    self.reset_seconds,
+                )
+            self._state = CircuitState.OPEN
+            self._opened_at = self._clock()
@@ -0,0 +1,275 @@
+"""대화 이력 압축(compaction) 노드.
+
+thread_id가 Discord 사용자 ID이므로 `messages`는 사용 기간에 비례해 계속
+늘어나고, 트리밍으로 LLM에서 가려도 매 단계 체크포인트에 직렬화/로드됩니다.
+이력이 임계값을 넘으면 가장 오래된 메시지를 누적 요약(`conversation_summary`)에
+접어 넣고 `RemoveMessage`로 상태에서 제거합니다.
+노드는 턴 시작 시 다른 사전 조회 노드와 병렬로 실행되지만, 요약 LLM 호출은
+`BackgroundCompactor`에서 응답과 별도로 진행하고 그 결과는 다음 턴 시작에
+반영합니다. 그래서 압축하는 턴에도 첫 응답 토큰이 요약 호출을 기다리지 않고,
+그래프 구조(agent → END)도 바뀌지 않습니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypedDict
+
+from langchain_core.messages import (
+    AIMessage,
+    AnyMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langgraph.constants import TAG_NOSTREAM
+
+from panager.agent.state import AgentState
+from panager.agent.utils import get_llm, message_tokens, trim_agent_messages
+
+if TYPE_CHECKING:
+    from panager.agent.llm import LLMClient
+    from panager.core.config import Settings
+
+log = logging.getLogger(__name__)
+
+# 요약 입력에 넣을 도구 결과 최대 길이 (긴 JSON 응답이 요약 프롬프트를 차지하지 않도록)
+_TOOL_RESULT_PREVIEW_CHARS = 500
+
+SUMMARY_PROMPT = (
+    "당신은 개인 비서 Panager와 사용자의 대화 기록을 관리합니다. "
+    "기존 요약과 새로 추가된 오래된 대화를 합쳐 하나의 요약으로 갱신하세요.\n"
+    "- 사용자의 선호, 진행 중인 작업, 약속/일정, 결정 사항처럼 이후 대화에 필요한 정보만 남깁니다.\n"
+    "- 인사나 도구 호출 과정 같은 세부 사항은 생략합니다.\n"
+    "- 한국어로, 간결한 글머리표 목록으로 작성합니다. 요약 본문만 출력하세요."
+)
+
+
+class CompactionOutput(TypedDict, total=False):
+    """압축 노드의 출력 타입 (임계값 이하이면 빈 dict)."""
+
+    conversation_summary: str
+    messages: list[AnyMessage]
+
+
+@dataclass(frozen=True)
+class PreparedSummary:
+    """반영 대기 중인 요약과 그 요약이 전제하는 이력."""
+
+    previous_summary: str | None
+    folded_ids: tuple[str, ...]
+    summary: str
+
+
+def _render(message: AnyMessage) -> str:
+    content = message.content if isinstance(message.content, str) else ""
+    if isinstance(message, HumanMessage):
+        return f"사용자: {content}"
+    if isinstance(message, ToolMessage):
+        return f"도구 결과: {content[:_TOOL_RESULT_PREVIEW_CHARS]}"
+    if isinstance(message, AIMessage):
+        calls = ", ".join(call["name"] for call in message.tool_calls)
+        if calls and not content:
+            return f"Panager: (도구 호출: {calls})"
+        return f"Panager: {content}"
+    return content
+
+
+def select_messages_to_fold(
+    messages: list[AnyMessage],
+    keep_tokens: int,
+    max_input_tokens: int,
+) -> list[AnyMessage]:
+    """요약에 접어 넣을 가장 오래된 메시지들을 고릅니다.
+
+    최근 `keep_tokens` 구간(HumanMessage로 시작)은 그대로 두고, 그 앞의 메시지를
+    오래된 순으로 최대 `max_input_tokens`만큼 선택합니다. 남은 과거 메시지는
+    다음 턴의 압축에서 이어서 처리됩니다.
+    """
+    kept = trim_agent_messages(messages, keep_tokens)
+    if kept:
+        keep_start = len(messages) - len(kept)
+    else:
+        # 마지막 턴 자체가 keep_tokens보다 크면 마지막 HumanMessage부터 유지
+        keep_start = next(
+            (
+                i
+                for i in range(len(messages) - 1, -1, -1)
+                if isinstance(messages[i], HumanMessage)
+            ),
+            len(messages),
+        )
+
+    fold: list[AnyMessage] = []
+    total = 0
+    for message in messages[:keep_start]:
+        tokens = message_tokens(message)
+        if fold and total + tokens > max_input_tokens:
+            break
+        fold.append(message)
+        total += tokens
+    return fold
+
+
+async def summarize(
+    llm_client: LLMClient | None,
+    settings: Settings,
+    previous_summary: str | None,
+    messages: list[AnyMessage],
+) -> str:
+    """기존 요약과 오래된 메시지를 하나의 요약으로 합칩니다."""
+    llm = llm_client.chat if llm_client is not None else get_llm(settings)
+    transcript = "\n".join(_render(m) for m in messages)
+    response = await llm.ainvoke(
+        [
+            SystemMessage(content=SUMMARY_PROMPT),
+            HumanMessage(
+                content=f"[기존 요약]\n{previous_summary or '(없음)'}\n\n"
+                f"[오래된 대화]\n{transcript}"
+            ),
+        ],
+        # 요약 토큰이 Discord 응답 스트림(stream_mode="messages")에 섞이지 않도록 제외
+        config={"tags": [TAG_NOSTREAM]},
+    )
+    return str(response.content).strip()
+
+
+async def prepare_summary(
+    messages: list[AnyMessage],
+    previous_summary: str | None,
+    settings: Settings,
+    llm_client: LLMClient | None = None,
+) -> PreparedSummary | None:
+    """이력이 임계값을 넘으면 오래된 메시지를 접은 요약을 만듭니다."""
+    total = sum(message_tokens(m) for m in messages)
+    if total <= settings.compaction_trigger_tokens:
+        return None
+
+    fold = select_messages_to_fold(
+        messages,
+        keep_tokens=settings.compaction_keep_tokens,
+        max_input_tokens=settings.compaction_max_input_tokens,
+    )
+    folded_ids = tuple(m.id for m in fold if m.id)
+    if not folded_ids:
+        return None
+
+    summary = await summarize(llm_client, settings, previous_summary, fold)
+    folded_tokens = sum(message_tokens(m) for m in fold)
+    log.info(
+        "대화 압축: 메시지 %d개(%d 토큰)를 요약으로 대체, 이력 %d → %d 토큰",
+        len(fold),
+        folded_tokens,
+        total,
+        total - folded_tokens,
+    )
+    return PreparedSummary(previous_summary, folded_ids, summary)
+
+
+def apply_summary(
+    state: AgentState, prepared: PreparedSummary | None
+) -> CompactionOutput:
+    """요약이 전제한 이력이 그대로일 때만 상태 갱신을 반환합니다."""
+    if prepared is None:
+        return {}
+    present = {m.id for m in state.get("messages", [])}
+    if state.get("conversation_summary") != prepared.previous_summary or not all(
+        message_id in present for message_id in prepared.folded_ids
+    ):
+        # 그사이 이력이 바뀌었으면 버리고 다음 턴에 다시 준비
+        return {}
+    return {
+        "conversation_summary": prepared.summary,
+        "messages": [
+            RemoveMessage(id=message_id) for message_id in prepared.folded_ids
+        ],
+    }
+
+
+class BackgroundCompactor:
+    """사용자별 요약 호출을 응답 경로 밖에서 실행하고 결과를 보관합니다.
+
+    사용자당 하나의 작업만 유지하며, 완료된 결과는 다음 턴의
+    `compaction_node`가 가져가 반영합니다. 실패는 로그만 남기고 다음 턴에
+    다시 시도합니다.
+    """
+
+    def __init__(self, settings: Settings, llm_client: LLMClient | None = None):
+        self._settings = settings
+        self._llm_client = llm_client
+        self._tasks: dict[int, asyncio.Task[PreparedSummary | None]] = {}
+
+    def take(self, user_id: int) -> PreparedSummary | None:
+        """완료된 요약을 꺼냅니다 (진행 중이거나 없으면 None)."""
+        task = self._tasks.get(user_id)
+        if task is None or not task.done():
+            return None
+        del self._tasks[user_id]
+        if task.cancelled() or task.exception() is not None:
+            return None
+        return task.result()
+
+    def schedule(self, user_id: int, state: AgentState) -> bool:
+        """진행 중인 작업이 없으면 현재 이력으로 요약 준비를 시작합니다."""
+        if user_id in self._tasks:
+            return False
+        task = asyncio.create_task(
+            prepare_summary(
+                list(state.get("messages", [])),
+                state.get("conversation_summary"),
+                self._settings,
+                self._llm_client,
+            )
+        )
+        self._tasks[user_id] = task
+        task.add_done_callback(functools.partial(self._on_done, user_id))
+        return True
+
+    def _on_done(
+        self, user_id: int, task: asyncio.Task[PreparedSummary | None]
+    ) -> None:
+        # 결과는 take()가 가져가므로 여기서는 실패만 기록
+        if not task.cancelled() and task.exception() is not None:
+            log.warning(
+                "대화 요약 실패 (사용자 %s)", user_id, exc_info=task.exception()
+            )
+
+
+async def compaction_node(
+    state: AgentState,
+    settings: Settings,
+    llm_client: LLMClient | None = None,
+    compactor: BackgroundCompactor | None = None,
+) -> CompactionOutput:
+    """이력이 임계값을 넘으면 오래된 메시지를 요약으로 대체합니다.
+
+    compactor가 주어지면 이전 턴에 준비된 요약만 반영하고, 새 요약은
+    백그라운드에서 준비해 이번 턴의 응답을 지연시키지 않습니다.
+    """
+    if compactor is None:
+        try:
+            prepared = await prepare_summary(
+                state.get("messages", []),
+                state.get("conversation_summary"),
+                settings,
+                llm_client,
+            )
+        except Exception:
+            # 요약 실패는 응답에 영향을 주지 않도록 다음 턴에 재시도
+            log.warning(
+                "대화 요약 실패 (사용자 %s)", state.get("user_id"), exc_info=True
+            )
+            return {}
+        return apply_summary(state, prepared)
+
+    user_id = state["user_id"]
+    result = apply_summary(state, compactor.take(user_id))
+    # 반영한 턴은 줄어든 이력으로 다음 턴에 다시 판단
+    total = sum(message_tokens(m) for m in state.get("messages", []))
+    if not result and total > settings.compaction_trigger_tokens:
+        compactor.schedule(user_id, state)
+    return result
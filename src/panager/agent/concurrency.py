@@ -0,0 +1,39 @@
+"""사용자별 도구 동시 실행 제한."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+
+class UserConcurrencyLimiter:
+    """사용자별로 동시에 실행할 수 있는 도구 호출 수를 제한합니다.
+
+    모델이 한 턴에 여러 도구를 요청하면 병렬로 실행하되, 한 사용자가 외부 API
+    (Google, Notion 등)의 요청 한도를 혼자 소모하지 않도록 상한을 둡니다.
+    세마포어는 사용 중인 동안만 유지하고 마지막 호출이 끝나면 제거합니다.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._semaphores: dict[int, asyncio.Semaphore] = {}
+        self._holders: dict[int, int] = {}
+
+    @asynccontextmanager
+    async def slot(self, user_id: int) -> AsyncIterator[None]:
+        semaphore = self._semaphores.get(user_id)
+        if semaphore is None:
+            semaphore = self._semaphores[user_id] = asyncio.Semaphore(self.limit)
+        self._holders[user_id] = self._holders.get(user_id, 0) + 1
+        try:
+            async with semaphore:
+                yield
+        finally:
+            self._holders[user_id] -= 1
+            if not self._holders[user_id]:
+                del self._holders[user_id]
+                del self._semaphores[user_id]
+
+    def active_users(self) -> int:
+        return len(self._semaphores)
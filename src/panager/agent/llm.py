@@ -0,0 +1,85 @@
+"""애플리케이션 수명 동안 공유하는 LLM 클라이언트.
+
+`ChatOpenAI`를 노드 호출마다 만들면 내부 HTTP 클라이언트도 새로 생성되어
+에이전트 루프의 매 반복이 `llm_base_url`과의 TCP/TLS 핸드셰이크를 다시
+수행합니다. 하나의 httpx 연결 풀을 시작 시 만들어 그래프에 주입합니다.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+from typing import TYPE_CHECKING
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from panager.agent.prompt import PromptCacheStats
+
+if TYPE_CHECKING:
+    from panager.core.config import Settings
+
+log = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """HTTP/2 사용에 필요한 `h2` 패키지(`httpx[http2]`) 설치 여부."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_http_client(settings: Settings) -> httpx.AsyncClient:
+    """keep-alive 연결 풀을 사용하는 LLM 엔드포인트용 HTTP 클라이언트."""
+    http2 = settings.llm_http2 and http2_available()
+    if settings.llm_http2 and not http2:
+        log.info("h2 패키지가 없어 LLM 클라이언트는 HTTP/1.1을 사용합니다.")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(
+            settings.llm_timeout_seconds, connect=settings.llm_connect_timeout_seconds
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+            keepalive_expiry=settings.llm_keepalive_seconds,
+        ),
+    )
+
+
+class LLMClient:
+    """공유 HTTP 연결 풀 위의 ChatOpenAI 인스턴스를 소유합니다.
+
+    `bind_tools`는 새 Runnable을 반환할 뿐 `chat`을 변경하지 않으므로
+    여러 요청이 동시에 같은 인스턴스를 사용해도 안전합니다.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+        self.http_client = build_http_client(settings)
+        self.chat = ChatOpenAI(
+            model=settings.llm_model,
+            base_url=settings.llm_base_url,
+            api_key=settings.llm_api_key,
+            streaming=True,
+            # 스트리밍 응답에도 usage(캐시 적중 토큰 포함)를 포함하도록 요청
+            stream_usage=settings.llm_stream_usage,
+            http_async_client=self.http_client,
+        )
+        self.cache_stats = PromptCacheStats()
+
+    async def warm_up(self, timeout: float = 10.0) -> None:
+        """공유 연결 풀에 LLM 엔드포인트 연결을 미리 수립하고 도달 가능한지 확인합니다.
+
+        `/models`는 토큰을 소비하지 않으며, 5xx나 연결 오류만 실패로 간주합니다.
+        """
+        response = await self.http_client.get(
+            f"{self._settings.llm_base_url.rstrip('/')}/models",
+            headers={"Authorization": f"Bearer {self._settings.llm_api_key}"},
+            timeout=timeout,
+        )
+        if response.status_code >= 500:
+            raise RuntimeError(f"LLM 엔드포인트 응답 오류: HTTP {response.status_code}")
+        log.info("LLM 연결 수립 완료 (%s)", response.http_version)
+
+    async def aclose(self) -> None:
+        await self.http_client.aclose()
@@ -0,0 +1,123 @@
+"""노드 호출마다 만드는 LLM 클라이언트와 공유 LLMClient의 TTFT 비교 도구.
+
+    python -m panager.agent.llm_benchmark --calls 10 --gap 8
+
+같은 프롬프트를 `--calls`번 스트리밍 호출하며 첫 청크까지의 시간(TTFT)을
+측정합니다. `--gap`은 호출 사이의 유휴 시간으로, 사용자가 메시지를 보내는
+간격을 흉내 냅니다. langchain-openai의 기본 클라이언트는 유휴 연결을 5초 뒤
+닫으므로 간격이 그보다 길면 per-call 모드는 매번 TCP/TLS 연결을 다시 맺습니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import timeit
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage
+
+from panager.agent.llm import LLMClient
+from panager.agent.utils import get_llm
+from panager.core.config import Settings
+
+
+@dataclass
+class TTFTReport:
+    mode: str
+    calls: int
+    first_ms: float
+    median_ms: float  # 첫 호출 제외
+    p95_ms: float  # 첫 호출 제외
+    construct_us: float  # 호출당 클라이언트 준비 비용 (네트워크 제외)
+
+
+async def _ttft_ms(llm: BaseChatModel, prompt: str) -> float:
+    start = time.perf_counter()
+    async for _ in llm.astream([HumanMessage(content=prompt)]):
+        break
+    return (time.perf_counter() - start) * 1000
+
+
+def _p95(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+async def measure(
+    mode: str,
+    get_model: Callable[[], BaseChatModel],
+    calls: int,
+    gap: float,
+    prompt: str,
+) -> TTFTReport:
+    samples: list[float] = []
+    for i in range(calls):
+        if i and gap:
+            await asyncio.sleep(gap)
+        samples.append(await _ttft_ms(get_model(), prompt))
+
+    repeated = samples[1:] or samples
+    construct_us = timeit.timeit(get_model, number=20) / 20 * 1e6
+    return TTFTReport(
+        mode=mode,
+        calls=calls,
+        first_ms=samples[0],
+        median_ms=statistics.median(repeated),
+        p95_ms=_p95(repeated),
+        construct_us=construct_us,
+    )
+
+
+async def _run(args: argparse.Namespace) -> list[TTFTReport]:
+    settings = Settings()
+    reports = [
+        await measure(
+            "per-call", lambda: get_llm(settings), args.calls, args.gap, args.prompt
+        )
+    ]
+
+    llm_client = LLMClient(settings)
+    try:
+        reports.append(
+            await measure(
+                "shared",
+                lambda: llm_client.chat,
+                args.calls,
+                args.gap,
+                args.prompt,
+            )
+        )
+    finally:
+        await llm_client.aclose()
+    return reports
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="LLM 클라이언트 TTFT 벤치마크")
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--gap", type=float, default=0.0, help="호출 사이 유휴 초")
+    parser.add_argument("--prompt", default="'네'라고만 답하세요.")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    reports = asyncio.run(_run(args))
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], ensure_ascii=False))
+        return
+
+    for r in reports:
+        print(
+            f"{r.mode:<9} calls={r.calls} first={r.first_ms:.0f}ms "
+            f"median={r.median_ms:.0f}ms p95={r.p95_ms:.0f}ms "
+            f"construct={r.construct_us:.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
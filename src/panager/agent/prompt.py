@@ -0,0 +1,174 @@
+"""agent_node 시스템 프롬프트 구성과 프롬프트 캐시 지표.
+
+제공자 측 prompt/KV 캐시는 요청 앞부분이 바이트 단위로 같을 때만 적중합니다.
+요청은 `tools` → 시스템 프롬프트 → 대화 순으로 직렬화되므로, 모든 사용자와
+턴에서 동일한 내용(페르소나, 규칙)과 이전 대화 요약만 맨 앞 시스템 메시지에
+두고, 현재 시각·메모리·작업 요약 등 매 호출 달라지는 컨텍스트는 최신 사용자
+메시지의 호출용 사본에 붙입니다. 그래야 캐시 가능한 프리픽스가 이전 턴의
+대화 이력 전체를 덮고, 시스템 메시지가 맨 앞 하나뿐이어야 하는 OpenAI 호환
+채팅 템플릿과도 충돌하지 않습니다.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from langchain_core.messages import HumanMessage
+
+if TYPE_CHECKING:
+    from langchain_core.messages import AnyMessage, BaseMessage
+
+    from panager.agent.state import PendingReflection
+
+log = logging.getLogger(__name__)
+
+# 사용자/시각과 무관하게 바이트 단위로 고정되는 프리픽스 (값을 바꾸면 캐시가 초기화됨)
+STABLE_SYSTEM_PROMPT = (
+    "당신은 Panager, 유능한 개인 비서 봇입니다. "
+    "사용자의 요청을 효율적으로 처리하기 위해 제공된 도구들을 사용하세요. "
+    "모든 응답은 반드시 한국어로 작성해야 합니다.\n\n"
+    "도구가 있다면 도구를 사용하여 작업을 수행하세요. "
+    "여러 단계가 필요한 작업이라면 도구를 하나씩 호출하며 진행하세요. "
+    "요청이 완료되었거나 최종 답변을 제공했다면, 추가 호출 없이 사용자에게 응답을 마칩니다.\n"
+)
+
+
+def format_memory_digest(memories: list[str], max_chars: int) -> str:
+    """관련 메모리를 시스템 프롬프트용 글머리표 목록으로 요약합니다.
+
+    중복을 제거하고 관련도 순서를 유지하며, 전체 길이가 `max_chars`를
+    넘으면 마지막 항목을 잘라냅니다.
+    """
+    lines: list[str] = []
+    used = 0
+    for memory in dict.fromkeys(" ".join(m.split()) for m in memories):
+        if not memory:
+            continue
+        remaining = max_chars - used - 2  # "- " 접두사
+        if remaining <= 0:
+            break
+        if len(memory) > remaining:
+            memory = memory[: max(0, remaining - 1)] + "…"
+        line = f"- {memory}"
+        lines.append(line)
+        used += len(line) + 1
+    return "\n".join(lines)
+
+
+def build_system_prompt(conversation_summary: str | None = None) -> str:
+    """대화 이력 앞에 두는 시스템 프롬프트 (고정 프리픽스 + 이전 대화 요약).
+
+    요약은 압축으로 이력 앞부분이 바뀔 때만 갱신되므로 프리픽스를 깨지 않습니다.
+    """
+    if not conversation_summary:
+        return STABLE_SYSTEM_PROMPT
+    return STABLE_SYSTEM_PROMPT + f"\n이전 대화 요약:\n{conversation_summary}"
+
+
+def build_context_prompt(
+    now_str: str,
+    tz_name: str,
+    is_system_trigger: bool = False,
+    task_summary: str | None = None,
+    pending_reflections: list[PendingReflection] | None = None,
+    memory_context: str | None = None,
+) -> str:
+    """최신 사용자 메시지에 붙이는, 호출마다 달라지는 컨텍스트."""
+    sections = [f"현재 시각: {now_str} ({tz_name})"]
+
+    if is_system_trigger:
+        sections.append(
+            "참고: 이 메시지는 시스템 자동 트리거(예: 예약된 알림)에 의해 발생했습니다. "
+            "사용자가 보낸 것처럼 자연스럽게 처리하세요."
+        )
+    if memory_context:
+        sections.append(
+            "사용자 관련 기억 (현재 메시지 기준 자동 조회, "
+            "여기에 없는 정보가 필요할 때만 메모리 검색 도구를 사용하세요):\n"
+            f"{memory_context}"
+        )
+    if task_summary:
+        sections.append(f"최근 도구 실행 요약: {task_summary}")
+    if pending_reflections:
+        reflections_data = [r.model_dump() for r in pending_reflections]
+        sections.append(
+            "보류 중인 회고 (GitHub 변경 사항): \n"
+            f"{json.dumps(reflections_data, indent=2, ensure_ascii=False)}"
+        )
+
+    return "\n\n".join(sections)
+
+
+def with_turn_context(messages: list[AnyMessage], context: str) -> list[AnyMessage]:
+    """마지막 HumanMessage를 컨텍스트가 앞에 붙은 사본으로 바꾼 호출용 목록.
+
+    상태의 메시지는 바꾸지 않으므로 체크포인트와 다음 턴의 프리픽스에는
+    컨텍스트가 남지 않습니다.
+    """
+    prefix = f"[현재 컨텍스트]\n{context}\n\n[사용자 메시지]\n"
+    for i in range(len(messages) - 1, -1, -1):
+        message = messages[i]
+        if not isinstance(message, HumanMessage):
+            continue
+        if isinstance(message.content, str):
+            content: str | list[str | dict[str, Any]] = prefix + message.content
+        else:
+            content = [{"type": "text", "text": prefix}, *message.content]
+        return [
+            *messages[:i],
+            message.model_copy(update={"content": content}),
+            *messages[i + 1 :],
+        ]
+    return [*messages, HumanMessage(content=prefix.rstrip())]
+
+
+def cached_prompt_tokens(message: BaseMessage) -> int | None:
+    """제공자가 보고한 캐시 적중 입력 토큰 수 (보고하지 않으면 None)."""
+    usage: dict[str, Any] = getattr(message, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    if "cache_read" in details:
+        return details["cache_read"]
+
+    # usage_metadata로 정규화되지 않은 OpenAI 호환 응답
+    token_usage = (getattr(message, "response_metadata", None) or {}).get(
+        "token_usage"
+    ) or {}
+    prompt_details = token_usage.get("prompt_tokens_details") or {}
+    return prompt_details.get("cached_tokens")
+
+
+@dataclass
+class PromptCacheStats:
+    """LLM 호출별 입력 토큰 중 제공자 캐시에 적중한 비율."""
+
+    calls: int = 0
+    reported_calls: int = 0  # 캐시 토큰 수를 보고한 호출
+    input_tokens: int = 0  # 캐시 정보를 보고한 호출의 입력 토큰 합
+    cached_tokens: int = 0
+
+    def record(self, message: BaseMessage) -> tuple[int, int] | None:
+        """응답의 사용량을 누적하고 (입력 토큰, 캐시 토큰)을 반환합니다."""
+        self.calls += 1
+        cached = cached_prompt_tokens(message)
+        usage = getattr(message, "usage_metadata", None) or {}
+        if cached is None or "input_tokens" not in usage:
+            return None
+
+        self.reported_calls += 1
+        self.input_tokens += usage["input_tokens"]
+        self.cached_tokens += cached
+        return usage["input_tokens"], cached
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "reported_calls": self.reported_calls,
+            "input_tokens": self.input_tokens,
+            "cached_tokens": self.cached_tokens,
+            "hit_rate": (
+                self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+            ),
+        }
@@ -1,16 +1,34 @@
 from __future__ import annotations
 
-import asyncio
+import hashlib
 import json
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import asyncpg
+import numpy as np
 from langchain_core.tools import BaseTool
-from sentence_transformers import SentenceTransformer
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from panager.agent.retrieval import (
+    DOMAIN_KEYWORDS,
+    LexicalIndex,
+    ToolMatch,
+    adaptive_cutoff,
+    filter_unlinked,
+    reciprocal_rank_fusion,
+)
+from panager.agent.schema import (
+    SchemaTokenReport,
+    minify_tool_schema,
+    report_tokens,
+)
+from panager.db.vector import VectorLayout
+from panager.services.embedding_cache import normalize_text
 
 if TYPE_CHECKING:
     from panager.core.config import Settings
+    from panager.services.embedding import EmbeddingService
     from panager.services.google import GoogleService
     from panager.services.github import GithubService
     from panager.services.notion import NotionService
@@ -24,45 +42,90 @@ log = logging.getLogger(__name__)
 class ToolRegistry:
     """도구 등록 및 시멘틱 검색을 담당하는 레지스트리."""
 
-    def __init__(self, pool: asyncpg.Pool, settings: Settings) -> None:
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        settings: Settings,
+        embedding: EmbeddingService,
+        layout: VectorLayout | None = None,
+    ) -> None:
         self._pool = pool
         self._settings = settings
+        self._embedding = embedding
+        self._layout = layout or VectorLayout()
         self._tools: dict[str, BaseTool] = {}
-        self._model: SentenceTransformer | None = None
-        self._lock = asyncio.Lock()
-
-    async def _get_model(self) -> SentenceTransformer:
-        if self._model is None:
-            async with self._lock:
-                if self._model is None:
-                    log.info("ToolRegistry: SentenceTransformer 모델 로딩 시작...")
-                    self._model = await asyncio.to_thread(
-                        SentenceTransformer, "paraphrase-multilingual-mpnet-base-v2"
-                    )
-                    log.info("ToolRegistry: SentenceTransformer 모델 로딩 완료.")
-        return self._model
-
-    async def _get_embedding(self, text: str) -> list[float]:
-        model = await self._get_model()
-        embedding = await asyncio.to_thread(model.encode, text)
-        if hasattr(embedding, "tolist"):
-            return embedding.tolist()
-        return list(embedding)
+        # 등록 시 한 번 계산/압축한 OpenAI function 스키마 (읽기 전용으로 공유)
+        self._schemas: dict[str, dict[str, Any]] = {}
+        self._raw_schemas: dict[str, dict[str, Any]] = {}
+        # 도구 검색용 인메모리 인덱스 (행 단위 L2 정규화된 float32 행렬)
+        # 도구 하나가 설명 + 예시 발화 수만큼의 행을 가지며, _index_owners[행]은
+        # 해당 행이 속한 도구의 _index_names 위치
+        self._index_names: list[str] = []
+        self._index_owners: np.ndarray | None = None
+        self._index_matrix: np.ndarray | None = None
+        self._lexical_index: LexicalIndex | None = None
 
     def register_tools(self, tools: list[BaseTool]) -> None:
         """도구를 메모리 레지스트리에 등록합니다."""
         for tool in tools:
             self._tools[tool.name] = tool
+            schema = convert_to_openai_tool(tool)
+            self._raw_schemas[tool.name] = schema
+            self._schemas[tool.name] = minify_tool_schema(schema)
             log.debug("Tool registered: %s", tool.name)
 
+    def schema_token_report(self) -> list[SchemaTokenReport]:
+        """등록된 도구별 스키마 압축 전후 토큰 수.
+
+        토크나이저 로딩이 필요할 수 있으므로 이벤트 루프 밖에서 호출하세요.
+        """
+        return [
+            report_tokens(name, raw, self._schemas[name])
+            for name, raw in self._raw_schemas.items()
+        ]
+
     async def sync_to_db(self) -> None:
         """메모리에 등록된 도구들을 데이터베이스와 동기화(인덱싱)합니다."""
         await self.sync_tools_by_prototypes(list(self._tools.values()))
 
+    @staticmethod
+    def _examples(tool: BaseTool) -> list[str]:
+        """도구 metadata에 선언된 예시 발화 (`{"examples": [...]}`)."""
+        return list((tool.metadata or {}).get("examples", ()))
+
+    def _fingerprint(
+        self,
+        name: str,
+        description: str,
+        domain: str,
+        schema: str,
+        examples: list[str],
+    ) -> str:
+        """도구 정의와 임베딩 모델이 같으면 동일한 값을 갖는 콘텐츠 지문."""
+        payload = json.dumps(
+            [name, description, domain, schema, examples, self._embedding.model_name],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
     async def sync_tools_by_prototypes(self, prototypes: list[BaseTool]) -> None:
-        """도구 프로토타입(설명용)을 기반으로 DB와 동기화합니다."""
+        """도구 프로토타입(설명용)을 기반으로 DB와 증분 동기화합니다.
+
+        지문이 바뀐 도구만 설명과 예시 발화를 한 번의 배치 encode로 재임베딩하고,
+        upsert와 더 이상 존재하지 않는 도구의 삭제는 하나의 트랜잭션에서 처리합니다.
+        예시 발화(tool_utterances)는 도구 삭제 시 FK로 함께 삭제됩니다.
+        """
         log.info("ToolRegistry: 도구 프로토타입 동기화 시작 (총 %d개)", len(prototypes))
         async with self._pool.acquire() as conn:
+            stored = {
+                row["name"]: row["fingerprint"]
+                for row in await conn.fetch(
+                    "SELECT name, fingerprint FROM tool_registry"
+                )
+            }
+
+            changed: list[tuple[str, str, str, str, str]] = []
+            examples: dict[str, list[str]] = {}
             for tool in prototypes:
                 name = tool.name
                 description = tool.description
@@ -75,37 +138,154 @@ class ToolRegistry:
                     and hasattr(tool.args_schema, "schema")
                 ):
                     tool_schema = tool.args_schema.schema()
+                schema_json = json.dumps(tool_schema)
 
-                embedding = await self._get_embedding(f"{name}: {description}")
-
-                await conn.execute(
-                    """
-                    INSERT INTO tool_registry (name, domain, description, schema, embedding)
-                    VALUES ($1, $2, $3, $4, $5::vector)
-                    ON CONFLICT (name) DO UPDATE SET
-                        description = EXCLUDED.description,
-                        schema = EXCLUDED.schema,
-                        embedding = EXCLUDED.embedding,
-                        domain = EXCLUDED.domain
-                    """,
-                    name,
-                    domain,
-                    description,
-                    json.dumps(tool_schema),
-                    str(embedding),
+                tool_examples = self._examples(tool)
+                fingerprint = self._fingerprint(
+                    name, description, domain, schema_json, tool_examples
                 )
-        log.info("ToolRegistry: 도구 동기화 완료.")
+                if stored.get(name) != fingerprint:
+                    changed.append(
+                        (name, domain, description, schema_json, fingerprint)
+                    )
+                    examples[name] = tool_examples
+
+            orphans = sorted(set(stored) - {tool.name for tool in prototypes})
 
-    async def get_tools_for_user(
+            utterances = [
+                (name, example) for name, *_ in changed for example in examples[name]
+            ]
+            embeddings = await self._embedding.embed_many(
+                [normalize_text(f"{name}: {desc}") for name, _, desc, _, _ in changed]
+                + [normalize_text(example) for _, example in utterances]
+            )
+            tool_embeddings = embeddings[: len(changed)]
+            utterance_embeddings = embeddings[len(changed) :]
+            async with conn.transaction():
+                if changed:
+                    await conn.executemany(
+                        f"""
+                        INSERT INTO tool_registry
+                            (name, domain, description, schema, embedding, fingerprint)
+                        VALUES ($1, $2, $3, $4, $5::{self._layout.sql_type}, $6)
+                        ON CONFLICT (name) DO UPDATE SET
+                            description = EXCLUDED.description,
+                            schema = EXCLUDED.schema,
+                            embedding = EXCLUDED.embedding,
+                            domain = EXCLUDED.domain,
+                            fingerprint = EXCLUDED.fingerprint
+                        """,
+                        [
+                            (name, domain, desc, schema, self._layout.prepare(e), fp)
+                            for (name, domain, desc, schema, fp), e in zip(
+                                changed, tool_embeddings
+                            )
+                        ],
+                    )
+                    await conn.execute(
+                        "DELETE FROM tool_utterances WHERE tool_name = ANY($1::text[])",
+                        [name for name, *_ in changed],
+                    )
+                if utterances:
+                    await conn.executemany(
+                        f"""
+                        INSERT INTO tool_utterances (tool_name, utterance, embedding)
+                        VALUES ($1, $2, $3::{self._layout.sql_type})
+                        ON CONFLICT (tool_name, utterance) DO NOTHING
+                        """,
+                        [
+                            (name, example, self._layout.prepare(e))
+                            for (name, example), e in zip(
+                                utterances, utterance_embeddings
+                            )
+                        ],
+                    )
+                if orphans:
+                    await conn.execute(
+                        "DELETE FROM tool_registry WHERE name = ANY($1::text[])",
+                        orphans,
+                    )
+            await self._load_index(conn)
+        log.info(
+            "ToolRegistry: 도구 동기화 완료 (변경 %d개, 유지 %d개, 삭제 %d개, 예시 발화 %d개)",
+            len(changed),
+            len(prototypes) - len(changed),
+            len(orphans),
+            len(utterances),
+        )
+
+    async def _load_index(self, conn: asyncpg.Connection) -> None:
+        """DB에 저장된 도구/예시 발화 임베딩을 하나의 연속된 행렬로 적재합니다."""
+        rows = await conn.fetch(
+            """
+            SELECT name, embedding FROM tool_registry
+            UNION ALL
+            SELECT tool_name, embedding FROM tool_utterances
+            """
+        )
+
+        positions: dict[str, int] = {}
+        owners: list[int] = []
+        vectors: list[np.ndarray] = []
+        missing: set[str] = set()
+        for row in rows:
+            name = row["name"]
+            if name not in self._tools:
+                if name not in missing:
+                    log.warning("Tool found in DB but not in memory registry: %s", name)
+                    missing.add(name)
+                continue
+            owners.append(positions.setdefault(name, len(positions)))
+            vectors.append(np.asarray(row["embedding"], dtype=np.float32))
+
+        if not vectors:
+            self._index_names, self._index_matrix = [], None
+            self._index_owners = None
+            self._lexical_index = None
+            return
+
+        names = list(positions)
+        matrix = np.ascontiguousarray(np.stack(vectors))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.maximum(norms, 1e-12)
+        self._index_names, self._index_matrix = names, matrix
+        self._index_owners = np.asarray(owners, dtype=np.intp)
+        self._lexical_index = LexicalIndex(
+            [self._lexical_document(self._tools[name]) for name in names]
+        )
+        log.info(
+            "ToolRegistry: 도구 인덱스 적재 완료 (도구 %d개, 벡터 %d개)",
+            len(names),
+            len(vectors),
+        )
+
+    @staticmethod
+    def _lexical_document(tool: BaseTool) -> str:
+        """어휘 검색용 문서: 도구 이름 + 설명 + 예시 발화 + 도메인 키워드."""
+        domain = (tool.metadata or {}).get("domain", "")
+        return " ".join(
+            [
+                tool.name.replace("_", " "),
+                tool.description,
+                *ToolRegistry._examples(tool),
+                domain,
+                DOMAIN_KEYWORDS.get(domain, ""),
+            ]
+        )
+
+    def register_service_tools(
         self,
-        user_id: int,
         google_service: GoogleService | None = None,
         github_service: GithubService | None = None,
         notion_service: NotionService | None = None,
         memory_service: MemoryService | None = None,
         scheduler_service: SchedulerService | None = None,
     ) -> list[BaseTool]:
-        """특정 사용자에 대해 모든 등록된 도구 인스턴스를 생성하여 반환합니다."""
+        """서비스별 도구를 한 번 생성하여 등록합니다.
+
+        도구는 사용자와 무관하게 공유되며, 호출한 사용자는 실행 시점의
+        RunnableConfig(`panager.tools.context.tool_config`)로 전달됩니다.
+        """
         all_tools: list[BaseTool] = []
 
         # 1. Google Tools
@@ -115,60 +295,133 @@ class ToolRegistry:
                 make_manage_google_tasks,
             )
 
-            all_tools.append(make_manage_google_calendar(user_id, google_service))
-            all_tools.append(make_manage_google_tasks(user_id, google_service))
+            all_tools.append(make_manage_google_calendar(google_service))
+            all_tools.append(make_manage_google_tasks(google_service))
 
         # 2. GitHub Tools
         if github_service:
             from panager.tools.github import make_github_tools
 
-            all_tools.extend(make_github_tools(user_id, github_service))
+            all_tools.extend(make_github_tools(github_service))
 
         # 3. Notion Tools
         if notion_service:
             from panager.tools.notion import make_notion_tools
 
-            all_tools.extend(make_notion_tools(user_id, notion_service))
+            all_tools.extend(make_notion_tools(notion_service))
 
         # 4. Memory Tools
         if memory_service:
             from panager.tools.memory import make_memory_tools
 
-            all_tools.extend(make_memory_tools(user_id, memory_service))
+            all_tools.extend(make_memory_tools(memory_service))
 
         # 5. Scheduler Tools
         if scheduler_service:
             from panager.tools.scheduler import make_scheduler_tools
 
-            all_tools.extend(make_scheduler_tools(user_id, scheduler_service))
+            all_tools.extend(make_scheduler_tools(scheduler_service))
 
+        self.register_tools(all_tools)
         return all_tools
 
-    async def search_tools(self, query: str, limit: int = 10) -> list[BaseTool]:
-        """쿼리와 유사한 도구를 검색하여 반환합니다."""
-        embedding = await self._get_embedding(query)
-
-        async with self._pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT name
-                FROM tool_registry
-                ORDER BY embedding <=> $1::vector
-                LIMIT $2
-                """,
-                str(embedding),
-                limit,
+    async def match_tools(
+        self, query: str, limit: int | None = None
+    ) -> list[ToolMatch]:
+        """임베딩 유사도와 어휘(BM25) 순위를 RRF로 결합해 점수와 함께 반환합니다.
+
+        어휘 순위에는 일치하는 토큰이 있는 도구만 참여하므로, 이름/도메인
+        키워드가 직접 언급된 도구가 임베딩 순위만 높은 도구보다 앞서게 됩니다.
+        """
+        if self._index_matrix is None:
+            log.warning("ToolRegistry: 도구 인덱스가 비어 있습니다 (sync_to_db 필요).")
+            return []
+
+        limit = limit if limit is not None else self._settings.tool_search_limit
+        if limit <= 0:
+            return []
+
+        query_vector = self._layout.prepare(await self._embedding.embed(query))
+        # 도구 행렬은 이미 정규화되어 있으므로 쿼리 크기는 순위에 영향을 주지 않음
+        # (쿼리 벡터를 정규화해 임계값 비교에 쓸 수 있는 코사인 값으로 맞춤)
+        query_vector = query_vector / max(float(np.linalg.norm(query_vector)), 1e-12)
+        # 도구별 점수는 설명/예시 발화 벡터 중 최댓값 (max-sim)
+        row_scores = self._index_matrix @ query_vector
+        vector_scores = np.full(len(self._index_names), -np.inf, dtype=np.float32)
+        np.maximum.at(vector_scores, self._index_owners, row_scores)
+        rankings = [np.argsort(-vector_scores, kind="stable").tolist()]
+
+        lexical_scores = np.zeros_like(vector_scores)
+        if self._lexical_index is not None:
+            lexical_scores = self._lexical_index.scores(query)
+            lexical_rank = np.argsort(-lexical_scores, kind="stable")
+            rankings.append([int(i) for i in lexical_rank if lexical_scores[i] > 0])
+
+        fused = reciprocal_rank_fusion(rankings, k=self._settings.tool_search_rrf_k)
+        matches: list[ToolMatch] = []
+        for i, fused_score in fused[:limit]:
+            name = self._index_names[i]
+            matches.append(
+                ToolMatch(
+                    name=name,
+                    domain=(self._tools[name].metadata or {}).get("domain", ""),
+                    score=float(vector_scores[i]),
+                    lexical=float(lexical_scores[i]),
+                    fused=fused_score,
+                )
             )
+        return matches
 
-            results = []
-            for row in rows:
-                name = row["name"]
-                if name in self._tools:
-                    results.append(self._tools[name])
-                else:
-                    log.warning("Tool found in DB but not in memory registry: %s", name)
-
-            return results
+    async def search_tools(
+        self, query: str, limit: int | None = None
+    ) -> list[BaseTool]:
+        """`match_tools`의 순위대로 도구 인스턴스를 반환합니다."""
+        return [self._tools[m.name] for m in await self.match_tools(query, limit)]
+
+    async def select_tools(
+        self, query: str, connected: frozenset[str] | None = None
+    ) -> list[ToolMatch]:
+        """후보 중 확신도가 충분한 도구만 남겨 k를 동적으로 결정합니다.
+
+        명확한 단일 의도 쿼리는 1~2개의 도구만 바인딩되어 프롬프트가 줄어듭니다.
+        `connected`가 주어지면 연동하지 않은 provider의 도구는 쿼리가 해당
+        provider를 명확히 가리킬 때만 남깁니다.
+        """
+        candidates = await self.match_tools(query)
+        eligible = candidates
+        if connected is not None:
+            eligible = filter_unlinked(
+                candidates,
+                query,
+                connected,
+                min_score=self._settings.tool_unlinked_min_score,
+            )
+        selected = adaptive_cutoff(
+            eligible,
+            min_score=self._settings.tool_min_score,
+            max_gap=self._settings.tool_score_gap,
+            domain_min_scores=self._settings.tool_domain_min_scores,
+        )
+        # *: 선택됨, -: 미연동 서비스라 제외됨
+        log.info(
+            "ToolRegistry: 도구 %d/%d개 선택 (%s)",
+            len(selected),
+            len(candidates),
+            ", ".join(
+                f"{'*' if m in selected else '' if m in eligible else '-'}"
+                f"{m.name}={m.score:.3f}/{m.lexical:.2f}"
+                for m in candidates
+            ),
+        )
+        return selected
+
+    def get_tool_schemas(self, names: list[str]) -> list[dict[str, Any]]:
+        """도구 이름 목록에 해당하는 OpenAI function 스키마를 반환합니다.
+
+        반환된 dict는 레지스트리가 보유한 인스턴스를 그대로 공유하므로 수정하면 안 됩니다.
+        `bind_tools`는 `type="function"` dict를 변환 없이 그대로 사용합니다.
+        """
+        return [self._schemas[name] for name in names if name in self._schemas]
 
     def get_tool(self, name: str) -> BaseTool | None:
         return self._tools.get(name)
@@ -0,0 +1,197 @@
+"""도구 검색용 어휘(lexical) 인덱스와 순위 융합.
+
+한국어는 조사/어미가 붙어 공백 단위 토큰이 잘 일치하지 않으므로("일정을",
+"일정") 단어 내부의 문자 2-gram/3-gram을 토큰으로 사용하는 BM25를 씁니다.
+임베딩 유사도 순위와는 Reciprocal Rank Fusion으로 결합합니다.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# 도메인별 사용자 표현(설명문에 없는 동의어/한영 표기)을 어휘 문서에 추가
+DOMAIN_KEYWORDS: dict[str, str] = {
+    "google": "구글 google 캘린더 calendar 일정 약속 회의 미팅 이벤트 할일 할 일 task todo",
+    "github": "깃허브 github 깃 git 저장소 레포 repository repo 커밋 commit 푸시 push 웹훅 webhook",
+    "notion": "노션 notion 페이지 page 데이터베이스 database 문서 노트",
+    "memory": "기억 기억해 메모리 memory 저장 취향 좋아하는 싫어하는",
+    "scheduler": "예약 알림 리마인더 remind 알려줘 스케줄 schedule 나중에 매일 매주",
+}
+
+# 연동 전인 provider의 도구를 허용할 만큼 "명시적으로" provider를 가리키는 표현
+PROVIDER_ALIASES: dict[str, tuple[str, ...]] = {
+    "google": ("구글", "google", "캘린더", "calendar", "gmail"),
+    "github": (
+        "깃허브",
+        "github",
+        "깃헙",
+        "레포",
+        "레포지토리",
+        "repo",
+        "repos",
+        "repository",
+    ),
+    "notion": ("노션", "notion"),
+}
+
+# 별칭 뒤에 붙어도 같은 단어로 보는 조사 ("노션에서", "github의")
+_PARTICLES = frozenset(
+    (
+        "은 는 이 가 을 를 에 에서 에게 한테 의 로 으로 와 과 랑 이랑 도 만 "
+        "까지 부터 에도 에서도 으로도 로도 에는 에서는 으로는 로는 하고 좀"
+    ).split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """단어 자체와 단어 내부의 문자 2/3-gram을 토큰으로 반환합니다."""
+    text = unicodedata.normalize("NFC", text).lower()
+    tokens: list[str] = []
+    for word in _WORD_RE.findall(text):
+        tokens.append(word)
+        for n in (2, 3):
+            if len(word) > n:
+                tokens.extend(word[i : i + n] for i in range(len(word) - n + 1))
+    return tokens
+
+
+class LexicalIndex:
+    """문자 n-gram 토큰 기반 BM25 인덱스."""
+
+    def __init__(
+        self, documents: Sequence[str], k1: float = 1.2, b: float = 0.75
+    ) -> None:
+        self._k1 = k1
+        self._b = b
+        self._term_freqs = [Counter(tokenize(doc)) for doc in documents]
+        self._lengths = np.array(
+            [sum(tf.values()) for tf in self._term_freqs], dtype=np.float32
+        )
+        self._avg_length = float(self._lengths.mean()) if len(documents) else 0.0
+
+        doc_freq: Counter[str] = Counter()
+        for tf in self._term_freqs:
+            doc_freq.update(tf.keys())
+        n = len(documents)
+        self._idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items()
+        }
+
+    def scores(self, query: str) -> np.ndarray:
+        """문서 순서대로 BM25 점수를 반환합니다 (일치 토큰이 없으면 0)."""
+        scores = np.zeros(len(self._term_freqs), dtype=np.float32)
+        if not self._term_freqs:
+            return scores
+
+        norm = self._k1 * (1 - self._b + self._b * self._lengths / self._avg_length)
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            tf = np.array([d.get(term, 0) for d in self._term_freqs], dtype=np.float32)
+            scores += idf * tf * (self._k1 + 1) / (tf + norm)
+        return scores
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[int]], k: int = 60
+) -> list[tuple[int, float]]:
+    """여러 순위 목록을 RRF(`sum 1 / (k + rank)`)로 결합해 점수 내림차순으로 반환합니다."""
+    fused: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            fused[doc] = fused.get(doc, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+@dataclass(frozen=True)
+class ToolMatch:
+    """검색된 도구 하나와 순위 산정에 사용된 점수."""
+
+    name: str
+    domain: str
+    score: float  # 쿼리와의 코사인 유사도
+    lexical: float  # BM25 점수 (일치 토큰이 없으면 0)
+    fused: float  # RRF 점수 (정렬 기준)
+
+
+def adaptive_cutoff(
+    matches: Sequence[ToolMatch],
+    min_score: float,
+    max_gap: float,
+    domain_min_scores: Mapping[str, float] | None = None,
+    min_k: int = 1,
+) -> list[ToolMatch]:
+    """RRF 순서의 후보에서 실제로 바인딩할 도구 수를 동적으로 정합니다.
+
+    RRF 점수는 순위(1/(k+rank))만 반영하므로 간격 판단에는 코사인 유사도를
+    사용하고, RRF 순서에서는 간격을 재지 않습니다.
+
+    - RRF 상위 `min_k`개는 항상 유지
+    - 코사인 유사도가 임계값(도메인별 값이 있으면 그 값) 미만인 후보는 제외
+    - 나머지를 코사인 유사도 순으로 보며, 직전 후보보다 `max_gap` 넘게
+      떨어지는 지점 아래는 제외
+    - 결과는 RRF 순서를 유지
+    """
+    domain_min_scores = domain_min_scores or {}
+    keep = {m.name for m in matches[:min_k]}
+
+    eligible = [
+        m for m in matches if m.score >= domain_min_scores.get(m.domain, min_score)
+    ]
+    previous: float | None = None
+    for match in sorted(eligible, key=lambda m: m.score, reverse=True):
+        if previous is not None and previous - match.score > max_gap:
+            break
+        keep.add(match.name)
+        previous = match.score
+
+    return [m for m in matches if m.name in keep]
+
+
+def mentions_provider(query: str, provider: str) -> bool:
+    """쿼리가 provider 이름(별칭)을 직접 언급하는지 확인합니다.
+
+    부분 문자열이 아닌 단어 단위로 비교하므로 "레포트"/"report"는 "레포"/"repo"로
+    보지 않습니다. 단어가 별칭 뒤에 조사만 붙은 형태이면 일치로 봅니다.
+    """
+    aliases = PROVIDER_ALIASES.get(provider, ())
+    words = _WORD_RE.findall(unicodedata.normalize("NFC", query).lower())
+    return any(
+        word == alias or (word.startswith(alias) and word[len(alias) :] in _PARTICLES)
+        for word in words
+        for alias in aliases
+    )
+
+
+def filter_unlinked(
+    matches: Sequence[ToolMatch],
+    query: str,
+    connected: frozenset[str],
+    min_score: float,
+) -> list[ToolMatch]:
+    """연동하지 않은 provider의 도구를 제외합니다.
+
+    쿼리가 provider를 직접 언급하거나, 해당 도구가 1위이면서 유사도가
+    `min_score` 이상이면 유지합니다 (호출 시 인증 링크가 안내됨).
+    """
+    kept: list[ToolMatch] = []
+    for rank, match in enumerate(matches):
+        if (
+            match.domain not in PROVIDER_ALIASES
+            or match.domain in connected
+            or mentions_provider(query, match.domain)
+            or (rank == 0 and match.score >= min_score)
+        ):
+            kept.append(match)
+    return kept
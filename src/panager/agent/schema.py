@@ -0,0 +1,147 @@
+"""LLM에 바인딩하는 도구 스키마 압축.
+
+pydantic이 생성한 JSON schema에는 `title`, 선택 필드의 `anyOf: [X, null]` +
+`default: null`, docstring 들여쓰기 공백처럼 의미 없이 프롬프트 토큰만 늘리는
+요소가 많습니다. 매 에이전트 루프마다 전송되므로 레지스트리 등록 시 한 번
+압축해 두고, 압축 전후 토큰 수를 함께 기록합니다.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n{2,}")
+
+# 값과 무관하게 모델 동작에 영향을 주지 않는 JSON schema 키
+_NOISE_KEYS = frozenset({"title", "$schema"})
+
+
+@dataclass(frozen=True)
+class SchemaTokenReport:
+    """도구 하나의 스키마 압축 전후 토큰 수."""
+
+    name: str
+    before: int
+    after: int
+
+    @property
+    def saved(self) -> int:
+        return self.before - self.after
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding() -> Any:
+    """tiktoken 인코딩 (캐시에 없고 네트워크도 없으면 None)."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        log.debug("tiktoken 인코딩을 불러올 수 없어 근사치로 계산합니다.")
+        return None
+
+
+def tokenizer_name() -> str:
+    """`count_tokens`가 사용하는 토크나이저 이름 (근사치면 'approx')."""
+    encoding = _encoding()
+    return encoding.name if encoding is not None else "approx"
+
+
+def count_tokens(value: Any) -> int:
+    """값을 compact JSON으로 직렬화했을 때의 토큰 수.
+
+    tiktoken을 사용할 수 없으면 UTF-8 바이트 수 / 4로 근사합니다.
+    """
+    text = value if isinstance(value, str) else compact_json(value)
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text.encode()) + 3) // 4
+    return len(encoding.encode(text))
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def compact_description(text: str) -> str:
+    """docstring 들여쓰기와 연속 공백/빈 줄을 제거합니다."""
+    lines = [_WHITESPACE_RE.sub(" ", line).strip() for line in text.splitlines()]
+    return _BLANK_LINES_RE.sub("\n", "\n".join(lines)).strip()
+
+
+def _strip_optional_null(prop: dict[str, Any]) -> dict[str, Any]:
+    """`anyOf: [X, {"type": "null"}]` + `default: null`을 X로 축약합니다.
+
+    required가 아닌 필드이므로 null을 보내는 것과 생략하는 것은 같습니다.
+    """
+    variants = prop.get("anyOf")
+    if not isinstance(variants, list):
+        return prop
+    non_null = [v for v in variants if v != {"type": "null"}]
+    if len(non_null) != 1 or len(non_null) == len(variants):
+        return prop
+
+    merged = {k: v for k, v in prop.items() if k != "anyOf"}
+    if merged.get("default", ...) is None:
+        del merged["default"]
+    return {**non_null[0], **merged}
+
+
+def _minify_node(node: Any) -> Any:
+    if isinstance(node, list):
+        return [_minify_node(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    result: dict[str, Any] = {}
+    for key, value in node.items():
+        if key in _NOISE_KEYS:
+            continue
+        if key == "description" and isinstance(value, str):
+            value = compact_description(value)
+        elif key == "properties" and isinstance(value, dict):
+            node_required = frozenset(node.get("required", ()))
+            value = {
+                name: _minify_node(
+                    prop if name in node_required else _strip_optional_null(prop)
+                )
+                for name, prop in value.items()
+            }
+        else:
+            value = _minify_node(value)
+        result[key] = value
+
+    # JSON schema 기본값과 같은 항목 제거
+    if result.get("additionalProperties") is True:
+        del result["additionalProperties"]
+    if result.get("required") == []:
+        del result["required"]
+    return result
+
+
+def minify_tool_schema(tool_schema: dict[str, Any]) -> dict[str, Any]:
+    """OpenAI tool 정의(`{"type": "function", "function": {...}}`)를 압축합니다.
+
+    원본은 수정하지 않고 새 dict를 반환합니다.
+    """
+    function = tool_schema["function"]
+    minified: dict[str, Any] = {"name": function["name"]}
+    if function.get("description"):
+        minified["description"] = compact_description(function["description"])
+    if "parameters" in function:
+        minified["parameters"] = _minify_node(function["parameters"])
+    return {"type": "function", "function": minified}
+
+
+def report_tokens(
+    name: str, before: dict[str, Any], after: dict[str, Any]
+) -> SchemaTokenReport:
+    return SchemaTokenReport(name, count_tokens(before), count_tokens(after))
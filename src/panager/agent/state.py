@@ -6,6 +6,8 @@ from langgraph.graph.message import add_messages
 from pydantic import BaseModel
 
 
+# FunctionSchema/DiscoveredTool은 더 이상 state에 저장하지 않지만,
+# 이전 버전 체크포인트를 역직렬화할 수 있도록 유지합니다.
 class FunctionSchema(BaseModel):
     """OpenAI function calling schema."""
 
@@ -50,4 +52,5 @@ class AgentState(TypedDict):
     auth_message_id: NotRequired[int | None]
     task_summary: NotRequired[str]
     pending_reflections: NotRequired[list[PendingReflection]]
-    discovered_tools: NotRequired[list[DiscoveredTool]]
+    discovered_tools: NotRequired[list[str]]  # ToolRegistry에 등록된 도구 이름
+    conversation_summary: NotRequired[str]  # compaction_node가 접어 넣은 과거 대화 요약
@@ -3,9 +3,11 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-from langchain_core.messages import AnyMessage, trim_messages
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage
 from langchain_openai import ChatOpenAI
 
+from panager.agent.schema import count_tokens, tokenizer_name
+
 if TYPE_CHECKING:
     from panager.core.config import Settings
 
@@ -15,6 +17,10 @@ WEEKDAY_KO = ["월", "화", "수", "목", "금", "토", "일"]
 
 
 def get_llm(settings: Settings) -> ChatOpenAI:
+    """요청마다 새 HTTP 클라이언트를 만드는 ChatOpenAI.
+
+    서버 실행 경로에서는 `panager.agent.llm.LLMClient`를 주입해 연결을 재사용합니다.
+    """
     return ChatOpenAI(
         model=settings.llm_model,
         base_url=settings.llm_base_url,
@@ -23,16 +29,52 @@ def get_llm(settings: Settings) -> ChatOpenAI:
     )
 
 
+# 메시지마다 붙는 role/구분 토큰 (OpenAI chat 포맷 기준)
+_MESSAGE_OVERHEAD_TOKENS = 4
+TOKEN_COUNT_KEY = "token_count"
+
+
+def message_tokens(message: AnyMessage) -> int:
+    """메시지의 토큰 수를 계산해 `response_metadata`에 캐시합니다.
+
+    response_metadata는 LLM 요청에 포함되지 않고 체크포인트와 함께 저장되므로,
+    한 번 계산한 값은 이후 턴에서도 재사용됩니다. 토크나이저가 바뀌면 다시 계산합니다.
+    """
+    tokenizer = tokenizer_name()
+    cached = message.response_metadata.get(TOKEN_COUNT_KEY)
+    if isinstance(cached, dict) and cached.get("tokenizer") == tokenizer:
+        return cached["tokens"]
+
+    tokens = _MESSAGE_OVERHEAD_TOKENS + count_tokens(message.content or "")
+    if isinstance(message, AIMessage) and message.tool_calls:
+        tokens += count_tokens(
+            [{"name": c["name"], "args": c["args"]} for c in message.tool_calls]
+        )
+    message.response_metadata[TOKEN_COUNT_KEY] = {
+        "tokenizer": tokenizer,
+        "tokens": tokens,
+    }
+    return tokens
+
+
 def trim_agent_messages(
     messages: list[AnyMessage], max_tokens: int
 ) -> list[AnyMessage]:
-    """메시지 목록을 토큰 제한에 맞춰 트리밍합니다."""
-    return trim_messages(
-        messages,
-        max_tokens=max_tokens,
-        strategy="last",
-        token_counter="approximate",
-        include_system=False,
-        allow_partial=False,
-        start_on="human",
-    )
+    """최신 메시지부터 거꾸로 토큰을 합산해 제한 안에 드는 마지막 구간을 반환합니다.
+
+    윈도우 밖의 과거 메시지는 보지 않으므로 비용은 전체 이력이 아니라 반환 구간
+    길이에 비례합니다. 구간은 HumanMessage로 시작하도록 앞쪽을 잘라냅니다.
+    """
+    start = len(messages)
+    total = 0
+    for i in range(len(messages) - 1, -1, -1):
+        total += message_tokens(messages[i])
+        if total > max_tokens:
+            break
+        start = i
+
+    window = messages[start:]
+    for offset, message in enumerate(window):
+        if isinstance(message, HumanMessage):
+            return window[offset:]
+    return []
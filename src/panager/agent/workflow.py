@@ -1,29 +1,45 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import functools
+import json
 import logging
-from typing import TYPE_CHECKING, TypedDict, NotRequired
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, TypedDict, NotRequired
 
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage, AnyMessage
+from langchain_core.messages.tool import ToolCall
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_config
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import interrupt
 
-from panager.agent.state import AgentState, DiscoveredTool, FunctionSchema
+from panager.agent.state import AgentState
 from panager.agent.agent import agent_node
+from panager.agent.circuit_breaker import CircuitBreaker, is_upstream_failure
+from panager.agent.compaction import BackgroundCompactor, compaction_node
+from panager.agent.concurrency import UserConcurrencyLimiter
+from panager.agent.prompt import format_memory_digest
 from panager.core.config import Settings
 from panager.agent.registry import ToolRegistry
+from panager.agent.utils import message_tokens
 from panager.core.exceptions import (
     GoogleAuthRequired,
     GithubAuthRequired,
     NotionAuthRequired,
 )
+from panager.services.integrations import PROVIDERS
+from panager.tools.context import tool_config
 
 if TYPE_CHECKING:
     from langgraph.checkpoint.base import BaseCheckpointSaver
     from langgraph.graph.state import CompiledStateGraph as CompiledGraph
     from panager.agent.interfaces import UserSessionProvider
+    from panager.agent.llm import LLMClient
     from panager.services.google import GoogleService
     from panager.services.github import GithubService
+    from panager.services.integrations import IntegrationService
     from panager.services.notion import NotionService
     from panager.services.memory import MemoryService
     from panager.services.scheduler import SchedulerService
@@ -57,41 +73,83 @@ def auth_interrupt_node(state: AgentState) -> AuthInterruptOutput:
     return {"auth_request_url": None}
 
 
-async def discovery_node(
-    state: AgentState, registry: ToolRegistry
-) -> dict[str, list[DiscoveredTool]]:
-    """사용자 메시지를 기반으로 관련 도구를 검색합니다."""
+def _latest_query(state: AgentState) -> str | None:
+    """마지막 사용자 메시지에서 예약어를 제거한 검색 쿼리 (없으면 None)."""
     messages = state.get("messages", [])
     if not messages:
-        return {"discovered_tools": []}
+        return None
 
     last_msg = messages[-1]
     if not isinstance(last_msg, HumanMessage) or not last_msg.content:
+        return None
+
+    return str(last_msg.content).replace("[SCHEDULED_EVENT]", "").strip()
+
+
+async def discovery_node(
+    state: AgentState,
+    registry: ToolRegistry,
+    integration_service: IntegrationService | None = None,
+) -> dict[str, list[str]]:
+    """사용자 메시지를 기반으로 관련 도구를 검색합니다.
+
+    체크포인트에는 도구 이름만 저장하고, 스키마는 agent_node가 레지스트리에서 조회합니다.
+    integration_service가 주어지면 연동하지 않은 서비스의 도구는 명시적으로
+    요청한 경우에만 바인딩합니다.
+    """
+    clean_query = _latest_query(state)
+    if clean_query is None:
         return {"discovered_tools": []}
 
-    query = str(last_msg.content)
-    clean_query = query.replace("[SCHEDULED_EVENT]", "").strip()
-
-    tools = await registry.search_tools(clean_query, limit=10)
-    discovered: list[DiscoveredTool] = []
-    for t in tools:
-        # BaseTool.args는 이미 유효한 OpenAI parameters 형태의 dict를 반환합니다.
-        schema = t.args if hasattr(t, "args") else {"type": "object", "properties": {}}
-
-        # OpenAI function calling 규격에 맞게 변환하여 strict하게 생성
-        discovered.append(
-            DiscoveredTool(
-                type="function",
-                function=FunctionSchema(
-                    name=t.name,
-                    description=t.description,
-                    parameters=schema,
-                ),
-                domain=(t.metadata.get("domain") if t.metadata else "unknown"),
-            )
+    connected = None
+    user_id = state.get("user_id")
+    if integration_service is not None and user_id is not None:
+        connected = await integration_service.connected_providers(user_id)
+
+    matches = await registry.select_tools(clean_query, connected=connected)
+    return {"discovered_tools": [m.name for m in matches]}
+
+
+async def user_context_node(
+    state: AgentState,
+    session_provider: UserSessionProvider,
+) -> dict[str, str]:
+    """사용자 타임존을 조회합니다 (체크포인트에 이미 있으면 생략)."""
+    if state.get("timezone"):
+        return {}
+    return {"timezone": await session_provider.get_user_timezone(state["user_id"])}
+
+
+async def memory_recall_node(
+    state: AgentState,
+    memory_service: MemoryService,
+    settings: Settings,
+) -> dict[str, str]:
+    """사용자 메시지와 관련된 장기 메모리를 `memory_context`에 채웁니다.
+
+    discovery_node와 같은 쿼리를 동시에 임베딩하므로 EmbeddingService가
+    인코딩 결과를 공유합니다. 조회 실패는 응답을 막지 않도록 빈 컨텍스트로
+    처리합니다.
+    """
+    query = _latest_query(state)
+    if not query or settings.memory_context_limit <= 0:
+        return {"memory_context": ""}
+
+    try:
+        memories = await memory_service.search_memories(
+            state["user_id"], query, limit=settings.memory_context_limit
+        )
+    except Exception:
+        log.warning(
+            "메모리 사전 조회 실패 (사용자 %s)", state["user_id"], exc_info=True
         )
+        return {"memory_context": ""}
 
-    return {"discovered_tools": discovered}
+    return {
+        "memory_context": format_memory_digest(
+            memories, settings.memory_context_max_chars
+        )
+    }
 
 
 class ToolExecutorOutput(TypedDict):
@@ -101,63 +159,205 @@ class ToolExecutorOutput(TypedDict):
     auth_request_url: NotRequired[str | None]
 
 
+_AuthRequired = (GoogleAuthRequired, GithubAuthRequired, NotionAuthRequired)
+
+
+def _tool_error(
+    tool_call: ToolCall, error: str, message: str, **details: Any
+) -> ToolMessage:
+    """모델이 원인을 구분할 수 있도록 구조화된 오류 ToolMessage를 만듭니다."""
+    payload = {
+        "status": "error",
+        "error": error,
+        "tool": tool_call["name"],
+        **details,
+        "message": message,
+    }
+    return ToolMessage(
+        content=json.dumps(payload, ensure_ascii=False),
+        tool_call_id=tool_call["id"],
+        status="error",
+    )
+
+
+def _tool_timeout(settings: Settings | None, domain: str | None) -> float | None:
+    if settings is None:
+        return None
+    timeout = settings.tool_domain_timeouts.get(
+        domain or "", settings.tool_timeout_seconds
+    )
+    return timeout if timeout > 0 else None
+
+
+async def _invoke_tool_call(
+    tool_call: ToolCall,
+    registry: ToolRegistry,
+    invoke_config: RunnableConfig,
+    settings: Settings | None = None,
+    breakers: Mapping[str, CircuitBreaker] | None = None,
+) -> ToolMessage:
+    """단일 도구 호출을 실행해 ToolMessage로 변환합니다 (인증 예외는 전파).
+
+    도메인 서킷 브레이커가 열려 있으면 호출하지 않고, 제한 시간 초과나 도구
+    오류는 턴 전체를 중단하지 않도록 구조화된 오류 메시지로 반환합니다.
+    """
+    tool = registry.get_tool(tool_call["name"])
+    if not tool:
+        return ToolMessage(
+            content=f"도구 '{tool_call['name']}'를 찾을 수 없습니다.",
+            tool_call_id=tool_call["id"],
+        )
+
+    metadata = tool.metadata if isinstance(tool.metadata, dict) else {}
+    domain = metadata.get("domain")
+    breaker = breakers.get(domain) if breakers and domain else None
+    if breaker is not None and not breaker.allow():
+        return _tool_error(
+            tool_call,
+            "service_unavailable",
+            f"{domain} 서비스가 일시적으로 응답하지 않아 호출을 건너뛰었습니다. "
+            "같은 서비스의 도구를 다시 호출하지 말고 사용자에게 잠시 후 다시 "
+            "시도하도록 안내하세요.",
+            domain=domain,
+            retry_after_seconds=round(breaker.retry_after()),
+        )
+
+    timeout = _tool_timeout(settings, domain)
+    try:
+        async with asyncio.timeout(timeout):
+            result = await tool.ainvoke(tool_call["args"], config=invoke_config)
+    except TimeoutError:
+        log.warning(
+            "도구 실행 시간 초과 (%s, %.1f초)", tool_call["name"], timeout or 0.0
+        )
+        if breaker is not None:
+            breaker.record_failure()
+        # to_thread로 실행 중인 작업은 취소되지 않아 뒤늦게 반영될 수 있음
+        return _tool_error(
+            tool_call,
+            "timeout",
+            "도구 응답을 제한 시간 안에 받지 못했습니다. 요청이 이미 처리되었을 수 "
+            "있으니 같은 생성/수정 요청을 반복하기 전에 결과를 먼저 확인하세요.",
+            timeout_seconds=timeout,
+        )
+    except (*_AuthRequired, asyncio.CancelledError):
+        # 인증 필요와 취소는 상위 서비스 상태와 무관
+        if breaker is not None:
+            breaker.release()
+        raise
+    except Exception as exc:
+        upstream = is_upstream_failure(exc)
+        if breaker is not None:
+            # 사용자별 오류(4xx, 잘못된 인자 등)로 모든 사용자의 서킷이 열리지 않도록
+            # 타임아웃/연결 오류/5xx만 실패로 기록
+            if upstream:
+                breaker.record_failure()
+            else:
+                breaker.release()
+        log.warning("도구 실행 실패 (%s)", tool_call["name"], exc_info=True)
+        return _tool_error(
+            tool_call,
+            "service_error" if upstream else "tool_error",
+            "서비스 오류로 도구 실행에 실패했습니다."
+            if upstream
+            else "도구 실행 중 오류가 발생했습니다. 인자를 확인하거나 사용자에게 안내하세요.",
+            detail=str(exc)[:300],
+        )
+
+    if breaker is not None:
+        breaker.record_success()
+    return ToolMessage(content=str(result), tool_call_id=tool_call["id"])
+
+
 async def tool_executor_node(
     state: AgentState,
     registry: ToolRegistry,
     google_service: GoogleService,
     github_service: GithubService,
     notion_service: NotionService,
+    limiter: UserConcurrencyLimiter | None = None,
+    settings: Settings | None = None,
+    breakers: Mapping[str, CircuitBreaker] | None = None,
 ) -> ToolExecutorOutput:
-    """도구를 직접 실행하고 결과를 반환합니다. 인증이 필요한 경우 인터럽트를 발생시킵니다."""
+    """도구를 실행하고 결과를 반환합니다. 인증이 필요한 경우 인터럽트를 발생시킵니다.
+
+    한 턴의 도구 호출들은 서로 독립적이므로 동시에 실행하고(limiter가 주어지면
+    사용자별 상한 적용), 결과는 tool_calls 순서대로 반환합니다. 어느 호출이든
+    인증 예외를 발생시키면 아직 시작하지 않은 호출은 건너뛰고, 실행 중인 호출은
+    완료를 기다려 실제 결과를 반환합니다. settings가 주어지면
+    호출마다 제한 시간을 적용해 느린 서비스가 사용자 락을 붙잡지 않게 합니다.
+    """
     user_id = state["user_id"]
     last_message = state["messages"][-1]
 
     if not isinstance(last_message, AIMessage) or not last_message.tool_calls:
         return {"messages": []}
 
-    user_tools = await registry.get_tools_for_user(
-        user_id,
-        google_service=google_service,
-        github_service=github_service,
-        notion_service=notion_service,
+    # 그래프 실행 config(콜백/태그)는 실행 컨텍스트에서 가져옴
+    try:
+        config: RunnableConfig | None = get_config()
+    except RuntimeError:
+        # 그래프 밖에서 직접 호출된 경우
+        config = None
+
+    # 도구는 시작 시 한 번 생성되어 공유되므로 사용자는 호출 config로 전달
+    # (콜백/태그가 유지되어 도구 실행도 같은 트레이스에 기록됨)
+    invoke_config = tool_config(user_id, config)
+    tool_calls = last_message.tool_calls
+
+    # 인증 예외가 나면 아직 시작하지 않은 호출(limiter 대기 중)만 건너뜀.
+    # 이미 실행 중인 호출은 취소해도 to_thread 작업이 계속 진행되어 쓰기가
+    # 반영될 수 있으므로, 제한 시간 안에서 끝까지 기다려 실제 결과를 반환
+    auth_required = asyncio.Event()
+
+    async def _run(tool_call: ToolCall) -> ToolMessage | None:
+        async with limiter.slot(user_id) if limiter else contextlib.nullcontext():
+            if auth_required.is_set():
+                return None
+            try:
+                return await _invoke_tool_call(
+                    tool_call, registry, invoke_config, settings, breakers
+                )
+            except _AuthRequired:
+                auth_required.set()
+                raise
+
+    results = await asyncio.gather(
+        *(_run(tool_call) for tool_call in tool_calls), return_exceptions=True
     )
-    tool_map = {t.name: t for t in user_tools}
+
+    auth_exc: Exception | None = None
+    for result in results:
+        if isinstance(result, _AuthRequired):
+            auth_exc = auth_exc or result
+        elif isinstance(result, BaseException):
+            # 일반 예외는 _invoke_tool_call이 오류 ToolMessage로 변환하므로 예기치 않은 경우만
+            raise result
 
     tool_messages: list[AnyMessage] = []
     auth_url: str | None = None
+    for tool_call, result in zip(tool_calls, results):
+        if isinstance(result, ToolMessage):
+            tool_messages.append(result)
+            continue
+        if result is None:
+            content = "인증이 필요한 다른 요청 때문에 실행하지 않았습니다. 인증 후 다시 시도하세요."
+        else:
+            content = (
+                "보안 인증이 필요합니다. 사용자에게 전송된 인증 링크를 확인하세요."
+            )
+        tool_messages.append(ToolMessage(content=content, tool_call_id=tool_call["id"]))
 
-    for tool_call in last_message.tool_calls:
-        try:
-            tool = tool_map.get(tool_call["name"])
-            if not tool:
-                tool_messages.append(
-                    ToolMessage(
-                        content=f"도구 '{tool_call['name']}'를 찾을 수 없습니다.",
-                        tool_call_id=tool_call["id"],
-                    )
-                )
-                continue
+    # 도메인별 서비스에서 인증 URL 획득 (tool_calls 순서상 첫 인증 예외 기준)
+    if isinstance(auth_exc, GoogleAuthRequired):
+        auth_url = google_service.get_auth_url(user_id)
+    elif isinstance(auth_exc, GithubAuthRequired):
+        auth_url = github_service.get_auth_url(user_id)
+    elif isinstance(auth_exc, NotionAuthRequired):
+        auth_url = notion_service.get_auth_url(user_id)
 
-            result = await tool.ainvoke(tool_call["args"])
-            tool_messages.append(
-                ToolMessage(content=str(result), tool_call_id=tool_call["id"])
-            )
-        except (GoogleAuthRequired, GithubAuthRequired, NotionAuthRequired) as exc:
-            # 도메인별 서비스에서 인증 URL 획득
-            if isinstance(exc, GoogleAuthRequired):
-                auth_url = google_service.get_auth_url(user_id)
-            elif isinstance(exc, GithubAuthRequired):
-                auth_url = github_service.get_auth_url(user_id)
-            elif isinstance(exc, NotionAuthRequired):
-                auth_url = notion_service.get_auth_url(user_id)
-
-            tool_messages.append(
-                ToolMessage(
-                    content="보안 인증이 필요합니다. 사용자에게 전송된 인증 링크를 확인하세요.",
-                    tool_call_id=tool_call["id"],
-                )
-            )
-            break
+    for message in tool_messages:
+        message_tokens(message)
 
     res: ToolExecutorOutput = {"messages": tool_messages, "auth_request_url": auth_url}
     return res
@@ -172,16 +372,29 @@ def build_graph(
     notion_service: NotionService,
     scheduler_service: SchedulerService,
     registry: ToolRegistry,
+    integration_service: IntegrationService | None = None,
+    llm_client: LLMClient | None = None,
 ) -> CompiledGraph:
     settings = Settings()
 
     graph = StateGraph(AgentState)
 
-    graph.add_node("discovery", functools.partial(discovery_node, registry=registry))
+    graph.add_node(
+        "discovery",
+        functools.partial(
+            discovery_node,
+            registry=registry,
+            integration_service=integration_service,
+        ),
+    )
     graph.add_node(
         "agent",
         functools.partial(
-            agent_node, settings=settings, session_provider=session_provider
+            agent_node,
+            settings=settings,
+            session_provider=session_provider,
+            registry=registry,
+            llm_client=llm_client,
         ),
     )
     graph.add_node("auth_interrupt", auth_interrupt_node)
@@ -193,21 +406,54 @@ def build_graph(
             google_service=google_service,
             github_service=github_service,
             notion_service=notion_service,
+            limiter=UserConcurrencyLimiter(settings.tool_max_concurrency),
+            settings=settings,
+            breakers={
+                domain: CircuitBreaker(
+                    domain,
+                    failure_threshold=settings.circuit_failure_threshold,
+                    reset_seconds=settings.circuit_reset_seconds,
+                )
+                for domain in PROVIDERS
+            },
+        ),
+    )
+
+    graph.add_node(
+        "compaction",
+        functools.partial(
+            compaction_node,
+            settings=settings,
+            llm_client=llm_client,
+            compactor=BackgroundCompactor(settings, llm_client),
         ),
     )
 
-    graph.add_edge(START, "discovery")
-    graph.add_edge("discovery", "agent")
+    graph.add_node(
+        "user_context",
+        functools.partial(user_context_node, session_provider=session_provider),
+    )
+    graph.add_node(
+        "memory_recall",
+        functools.partial(
+            memory_recall_node, memory_service=memory_service, settings=settings
+        ),
+    )
+
+    # 첫 LLM 호출 전의 독립적인 조회를 병렬로 실행하고 모두 끝나면 agent로 합류
+    # (TTFT가 각 조회 시간의 합이 아닌 가장 느린 조회 시간에 맞춰짐).
+    # 압축 노드는 이전 턴에 백그라운드로 준비된 요약만 반영하므로 조회를 지연시키지
+    # 않고, agent가 END로 끝나는 구조도 유지됨
+    pre_agent_nodes = ["discovery", "user_context", "memory_recall", "compaction"]
+    for node in pre_agent_nodes:
+        graph.add_edge(START, node)
+    graph.add_edge(pre_agent_nodes, "agent")
 
     def _route(state: AgentState) -> str:
         last_message = state["messages"][-1]
         if isinstance(last_message, AIMessage) and last_message.tool_calls:
             return "tool_executor"
 
-        next_worker = state.get("next_worker")
-        if next_worker == "FINISH" or not next_worker:
-            return END
-
         return END
 
     graph.add_conditional_edges("agent", _route)
@@ -6,6 +6,12 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 router = APIRouter()
 
 
+def _invalidate_integrations(bot, user_id: int) -> None:
+    """연동 직후의 도구 검색이 캐시된 미연동 상태를 보지 않도록 무효화합니다."""
+    if getattr(bot, "integration_service", None) is not None:
+        bot.integration_service.invalidate(user_id)
+
+
 @router.get("/google/login")
 async def google_login(request: Request, user_id: int):
     bot = request.app.state.bot
@@ -19,6 +25,7 @@ async def google_callback(request: Request, code: str, state: str):
         user_id = int(state)
         bot = request.app.state.bot
         await bot.google_service.exchange_code(code, user_id)
+        _invalidate_integrations(bot, user_id)
 
         pending = bot.pending_messages.get(user_id)
         await bot.auth_complete_queue.put(
@@ -52,6 +59,7 @@ async def github_callback(request: Request, code: str, state: str):
         user_id = int(user_id_str)
         bot = request.app.state.bot
         await bot.github_service.exchange_code(code, user_id)
+        _invalidate_integrations(bot, user_id)
 
         pending = bot.pending_messages.get(user_id)
         await bot.auth_complete_queue.put(
@@ -85,6 +93,7 @@ async def notion_callback(request: Request, code: str, state: str):
         user_id = int(user_id_str)
         bot = request.app.state.bot
         await bot.notion_service.exchange_code(code, user_id)
+        _invalidate_integrations(bot, user_id)
 
         pending = bot.pending_messages.get(user_id)
         await bot.auth_complete_queue.put(
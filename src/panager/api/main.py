@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 
 from panager.api.auth import router as auth_router
 from panager.api.webhooks import router as webhooks_router
 
+if TYPE_CHECKING:
+    from panager.core.readiness import ReadinessTracker
+
 
-def create_app(bot) -> FastAPI:
+def create_app(bot, readiness: ReadinessTracker | None = None) -> FastAPI:
     app = FastAPI(title="Panager API")
     app.state.bot = bot
+    app.state.readiness = readiness
     app.include_router(auth_router, prefix="/auth")
     app.include_router(webhooks_router, prefix="/webhooks")
 
@@ -16,4 +23,13 @@ def create_app(bot) -> FastAPI:
     async def health():
         return {"status": "ok"}
 
+    @app.get("/ready")
+    async def ready():
+        # 워밍업이 끝나기 전에는 503을 반환하여 healthcheck가 통과하지 않도록 함
+        if readiness is None:
+            return {"status": "ready", "components": {}}
+        return JSONResponse(
+            readiness.snapshot(), status_code=200 if readiness.is_ready else 503
+        )
+
     return app
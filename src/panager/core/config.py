@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,6 +11,57 @@ class Settings(BaseSettings):
     llm_base_url: str
     llm_api_key: str
     llm_model: str = "minimax-m2.5-free"
+    llm_http2: bool = True  # h2 패키지가 설치된 경우에만 적용
+    llm_timeout_seconds: float = 120.0  # 응답(스트리밍 청크 간) 대기 시간
+    llm_connect_timeout_seconds: float = 10.0
+    llm_max_connections: int = 20
+    llm_max_keepalive_connections: int = 10
+    llm_keepalive_seconds: float = 120.0  # 유휴 연결 유지 시간
+    llm_stream_usage: bool = True  # 스트리밍 응답에 usage 요청 (캐시 적중 토큰 기록용)
+
+    # Embedding
+    embedding_model_name: str = "paraphrase-multilingual-mpnet-base-v2"
+    embedding_backend: Literal["torch", "onnx"] = "torch"
+    embedding_onnx_dir: str = ""  # 비어 있으면 $HF_HOME/onnx/{model}-int8
+    embedding_onnx_threads: int = 0  # onnxruntime/torch 스레드 수 (0이면 자동)
+    embedding_workers: int = 0  # 임베딩 전용 워커 프로세스 수 (0이면 인프로세스)
+    embedding_max_concurrency: int = (
+        0  # 동시에 실행할 encode 호출 수 (0이면 워커 수, 인프로세스는 1)
+    )
+    embedding_batch_window_ms: float = 5.0  # 배치로 모을 최대 대기 시간
+    embedding_max_batch_size: int = 32  # 윈도우 만료 전 즉시 처리할 배치 크기
+    embedding_cache_size: int = 2048  # 프로세스 내 LRU 캐시 항목 수 (0이면 비활성)
+    embedding_cache_persistent: bool = True  # Postgres 캐시 계층 사용 여부
+    embedding_cache_ttl_days: int = (
+        30  # 이 기간 동안 쓰이지 않은 Postgres 캐시 항목 삭제
+    )
+    embedding_cache_max_rows: int = (
+        100_000  # Postgres 캐시 최대 행 수 (최근 사용 순 유지)
+    )
+    embedding_cache_prune_hours: float = 24.0  # Postgres 캐시 정리 주기
+
+    # Vector storage (alembic 리비전 e3b8a1d05c47이 같은 값으로 스키마 전환)
+    vector_storage: Literal["vector", "halfvec"] = "vector"
+    vector_dimensions: int = 768  # 앞쪽 N차원만 저장 (768 이하)
+
+    # Warm-up (`/ready`가 200을 반환하기 전까지 healthcheck 실패)
+    warmup_retry_seconds: float = 5.0  # 실패한 워밍업 재시도 초기 간격
+
+    # Tool retrieval (임베딩 + 어휘 검색 결과를 RRF로 결합)
+    tool_search_limit: int = 5  # 에이전트에 바인딩할 최대 도구 수
+    tool_search_rrf_k: int = 60  # RRF 상수 (클수록 순위 간 점수 차이가 완만해짐)
+    tool_min_score: float = 0.25  # 1위 이후 후보의 최소 코사인 유사도
+    tool_score_gap: float = 0.15  # 직전 도구 대비 유사도가 이만큼 떨어지면 중단
+    tool_domain_min_scores: dict[str, float] = {}  # 도메인별 최소 유사도 (JSON)
+    tool_unlinked_min_score: float = 0.5  # 미연동 서비스 도구를 1위로 허용할 유사도
+    integration_cache_seconds: float = 300.0  # 사용자별 연동 여부 캐시 TTL
+    memory_context_limit: int = 5  # 응답 전 미리 조회할 관련 메모리 수 (0이면 비활성)
+    memory_context_max_chars: int = 800  # 시스템 프롬프트에 넣을 메모리 요약 최대 길이
+    tool_max_concurrency: int = 4  # 사용자별 동시 실행 도구 호출 수
+    tool_timeout_seconds: float = 20.0  # 도구 호출 제한 시간 (0이면 무제한)
+    tool_domain_timeouts: dict[str, float] = {}  # 도메인별 제한 시간 (JSON)
+    circuit_failure_threshold: int = 3  # 서킷 브레이커를 여는 도메인별 연속 실패 수
+    circuit_reset_seconds: float = 30.0  # 열린 서킷이 시험 호출을 허용하기까지의 시간
 
     # PostgreSQL
     postgres_user: str
@@ -41,6 +94,9 @@ class Settings(BaseSettings):
     # Checkpoint
     checkpoint_max_tokens: int = 4000  # LLM에 전달할 messages 최대 토큰 수
     checkpoint_ttl_days: int = 30  # checkpoint 보관 기간 (일)
+    compaction_trigger_tokens: int = 12000  # 이력이 이 토큰 수를 넘으면 요약으로 압축
+    compaction_keep_tokens: int = 4000  # 압축 후에도 원문으로 남길 최근 메시지 토큰 수
+    compaction_max_input_tokens: int = 16000  # 한 번의 요약 호출에 넣을 최대 토큰 수
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -0,0 +1,127 @@
+"""시작 시 워밍업과 컴포넌트별 준비 상태 추적.
+
+`/health`는 프로세스 생존 여부만, `/ready`는 등록된 모든 컴포넌트의 워밍업이
+끝났는지를 보고합니다. 컨테이너 healthcheck는 `/ready`를 사용하므로
+start-first 롤링 업데이트 시 콜드 인스턴스로 트래픽이 넘어가지 않습니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+WarmupCheck = Callable[[], Awaitable[Any]]
+
+
+class ComponentState(StrEnum):
+    PENDING = "pending"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+
+@dataclass
+class ComponentStatus:
+    state: ComponentState = ComponentState.PENDING
+    error: str | None = None
+    elapsed_ms: float | None = None
+    attempts: int = 0
+
+
+class ReadinessTracker:
+    """컴포넌트별 워밍업 상태를 보관합니다."""
+
+    def __init__(self) -> None:
+        self._components: dict[str, ComponentStatus] = {}
+
+    def register(self, name: str) -> None:
+        self._components.setdefault(name, ComponentStatus())
+
+    def set_state(
+        self,
+        name: str,
+        state: ComponentState,
+        error: str | None = None,
+        elapsed_ms: float | None = None,
+    ) -> None:
+        status = self._components.setdefault(name, ComponentStatus())
+        status.state = state
+        status.error = error
+        if elapsed_ms is not None:
+            status.elapsed_ms = elapsed_ms
+
+    @property
+    def is_ready(self) -> bool:
+        return all(s.state == ComponentState.READY for s in self._components.values())
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "status": "ready" if self.is_ready else "starting",
+            "components": {
+                name: {
+                    "state": s.state.value,
+                    "error": s.error,
+                    "elapsed_ms": s.elapsed_ms,
+                    "attempts": s.attempts,
+                }
+                for name, s in self._components.items()
+            },
+        }
+
+    async def warm_up(
+        self,
+        checks: dict[str, WarmupCheck],
+        retry_interval: float = 5.0,
+        max_retry_interval: float = 60.0,
+    ) -> None:
+        """모든 워밍업 작업을 동시에 실행합니다.
+
+        실패한 컴포넌트는 지수 백오프로 성공할 때까지 재시도하므로,
+        일시적인 장애(LLM 엔드포인트 등)로 인스턴스가 영구히 unready로 남지 않습니다.
+        """
+        for name in checks:
+            self.register(name)
+        await asyncio.gather(
+            *(
+                self._warm_component(name, check, retry_interval, max_retry_interval)
+                for name, check in checks.items()
+            )
+        )
+
+    async def _warm_component(
+        self,
+        name: str,
+        check: WarmupCheck,
+        retry_interval: float,
+        max_retry_interval: float,
+    ) -> None:
+        status = self._components[name]
+        delay = retry_interval
+        while True:
+            status.attempts += 1
+            self.set_state(name, ComponentState.WARMING)
+            started = time.monotonic()
+            try:
+                await check()
+            except Exception as exc:
+                self.set_state(
+                    name, ComponentState.FAILED, error=f"{type(exc).__name__}: {exc}"
+                )
+                log.warning(
+                    "워밍업 실패: %s (%.0f초 후 재시도)", name, delay, exc_info=True
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_retry_interval)
+                continue
+
+            elapsed_ms = (time.monotonic() - started) * 1000
+            self.set_state(name, ComponentState.READY, elapsed_ms=elapsed_ms)
+            log.info("워밍업 완료: %s (%.0fms)", name, elapsed_ms)
+            return
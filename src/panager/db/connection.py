@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import asyncpg
 
+from panager.db.vector import register_vector_codecs
+
 _pool: asyncpg.Pool | None = None
 
 
 async def init_pool(dsn: str, min_size: int = 2, max_size: int = 10) -> asyncpg.Pool:
     global _pool
-    _pool = await asyncpg.create_pool(dsn, min_size=min_size, max_size=max_size)
+    _pool = await asyncpg.create_pool(
+        dsn, min_size=min_size, max_size=max_size, init=register_vector_codecs
+    )
     return _pool
 
 
@@ -0,0 +1,188 @@
+"""pgvector 임베딩 컬럼의 저장 표현(타입/차원) 관리.
+
+`memories.embedding`과 `tool_registry.embedding`은 기본적으로 `vector(768)`이지만,
+설정(`vector_storage`, `vector_dimensions`)으로 `halfvec` 또는 앞쪽 N차원만
+저장하는 축소 표현을 선택할 수 있습니다. 스키마 전환은 alembic 리비전
+`e3b8a1d05c47`이 같은 환경변수(`VECTOR_STORAGE`, `VECTOR_DIMENSIONS`)를 읽어
+수행하므로, 설정한 상태로 `alembic upgrade head`를 실행합니다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import struct
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import asyncpg
+import numpy as np
+
+if TYPE_CHECKING:
+    from panager.core.config import Settings
+
+log = logging.getLogger(__name__)
+
+EMBEDDING_DIMENSIONS = 768
+VECTOR_TABLES = ("memories", "tool_registry", "tool_utterances")
+
+_TYPE_RE = re.compile(r"^(vector|halfvec)\((\d+)\)$")
+
+# pgvector 바이너리 포맷: int16 차원 + int16 예약(0) + big-endian float32/float16 배열
+_BINARY_HEADER = struct.Struct("!hh")
+_BINARY_DTYPES = {"vector": np.dtype(">f4"), "halfvec": np.dtype(">f2")}
+
+
+def make_binary_codec(storage: str) -> tuple[Any, Any]:
+    dtype = _BINARY_DTYPES[storage]
+
+    def encode(value: Any) -> bytes:
+        array = np.asarray(value, dtype=dtype)
+        if array.ndim != 1:
+            raise ValueError(f"{storage} 값은 1차원 배열이어야 합니다.")
+        return _BINARY_HEADER.pack(array.shape[0], 0) + array.tobytes()
+
+    def decode(data: bytes) -> np.ndarray:
+        dim, _ = _BINARY_HEADER.unpack_from(data)
+        return np.frombuffer(
+            data, dtype=dtype, count=dim, offset=_BINARY_HEADER.size
+        ).astype(np.float32)
+
+    return encode, decode
+
+
+async def register_vector_codecs(conn: asyncpg.Connection) -> None:
+    """vector/halfvec 타입에 바이너리 코덱을 등록합니다 (asyncpg pool의 init 콜백).
+
+    파라미터로 numpy 배열(또는 float 리스트)을 그대로 전달하고 결과는
+    float32 numpy 배열로 받으므로, 텍스트 직렬화/파싱 비용이 사라집니다.
+    """
+    rows = await conn.fetch(
+        """
+        SELECT t.typname, n.nspname
+        FROM pg_type t JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE t.typname = ANY($1::text[])
+        """,
+        list(_BINARY_DTYPES),
+    )
+    if not rows:
+        # 마이그레이션 전(확장 미설치) DB에서도 연결 자체는 가능해야 함
+        log.warning("pgvector 확장이 설치되지 않아 벡터 코덱을 등록하지 않습니다.")
+        return
+    for row in rows:
+        encoder, decoder = make_binary_codec(row["typname"])
+        await conn.set_type_codec(
+            row["typname"],
+            schema=row["nspname"],
+            encoder=encoder,
+            decoder=decoder,
+            format="binary",
+        )
+
+
+@dataclass(frozen=True)
+class VectorLayout:
+    """임베딩 컬럼의 pgvector 타입과 차원."""
+
+    storage: str = "vector"
+    dimensions: int = EMBEDDING_DIMENSIONS
+
+    def __post_init__(self) -> None:
+        if self.storage not in ("vector", "halfvec"):
+            raise ValueError(f"지원하지 않는 벡터 저장 타입입니다: {self.storage}")
+        if not 0 < self.dimensions <= EMBEDDING_DIMENSIONS:
+            raise ValueError(
+                f"vector_dimensions는 1~{EMBEDDING_DIMENSIONS} 범위여야 합니다."
+            )
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> VectorLayout:
+        return cls(settings.vector_storage, settings.vector_dimensions)
+
+    @classmethod
+    def from_env(cls) -> VectorLayout:
+        """Settings 전체를 요구하지 않는 alembic 환경에서 같은 설정을 읽습니다."""
+        return cls(
+            os.environ.get("VECTOR_STORAGE", "vector"),
+            int(os.environ.get("VECTOR_DIMENSIONS", EMBEDDING_DIMENSIONS)),
+        )
+
+    @classmethod
+    def parse(cls, sql_type: str) -> VectorLayout:
+        """`format_type` 결과(예: 'halfvec(384)')를 VectorLayout으로 변환합니다."""
+        match = _TYPE_RE.match(sql_type)
+        if match is None:
+            raise ValueError(f"알 수 없는 벡터 컬럼 타입입니다: {sql_type}")
+        return cls(match.group(1), int(match.group(2)))
+
+    @property
+    def sql_type(self) -> str:
+        return f"{self.storage}({self.dimensions})"
+
+    @property
+    def cosine_ops(self) -> str:
+        return f"{self.storage}_cosine_ops"
+
+    def prepare(self, embedding: list[float] | np.ndarray) -> np.ndarray:
+        """임베딩을 컬럼 차원에 맞춰 자른 float32 배열로 변환합니다.
+
+        코사인 거리는 크기에 무관하므로 앞쪽 N차원만 남겨도 재정규화가 필요 없습니다.
+        반환값은 `register_vector_codecs`가 등록된 연결에 파라미터로 전달합니다.
+        """
+        return np.asarray(embedding, dtype=np.float32)[: self.dimensions]
+
+
+async def current_layout(conn: asyncpg.Connection, table: str) -> VectorLayout:
+    """테이블의 embedding 컬럼에 실제 적용된 VectorLayout을 조회합니다."""
+    sql_type = await conn.fetchval(
+        """
+        SELECT format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = $1::regclass AND attname = 'embedding'
+        """,
+        table,
+    )
+    return VectorLayout.parse(sql_type)
+
+
+def layout_migration_sql(
+    table: str, source: VectorLayout, target: VectorLayout
+) -> list[str]:
+    """embedding 컬럼을 source에서 target 표현으로 바꾸는 SQL 목록을 생성합니다."""
+    if source == target:
+        return []
+    if target.dimensions > source.dimensions:
+        raise ValueError(
+            f"{table}: 차원을 늘리려면({source.dimensions} → {target.dimensions}) "
+            "원본 텍스트로 재임베딩이 필요합니다."
+        )
+
+    if target.dimensions < source.dimensions:
+        using = (
+            f"subvector(embedding::vector, 1, {target.dimensions})::{target.sql_type}"
+        )
+    else:
+        using = f"embedding::{target.sql_type}"
+
+    index = f"ix_{table}_embedding"
+    return [
+        f"DROP INDEX IF EXISTS {index}",
+        f"ALTER TABLE {table} ALTER COLUMN embedding TYPE {target.sql_type} "
+        f"USING {using}",
+        f"CREATE INDEX {index} ON {table} USING hnsw (embedding {target.cosine_ops})",
+    ]
+
+
+async def verify_layout(pool: asyncpg.Pool, layout: VectorLayout) -> None:
+    """DB 컬럼 표현이 설정과 일치하는지 확인합니다. 불일치 시 RuntimeError."""
+    async with pool.acquire() as conn:
+        for table in VECTOR_TABLES:
+            actual = await current_layout(conn, table)
+            if actual != layout:
+                raise RuntimeError(
+                    f"{table}.embedding 컬럼({actual.sql_type})이 설정"
+                    f"({layout.sql_type})과 다릅니다. "
+                    "같은 VECTOR_STORAGE/VECTOR_DIMENSIONS로 `alembic upgrade head`를 "
+                    "실행하세요."
+                )
@@ -0,0 +1,231 @@
+"""임베딩 저장 표현별 HNSW 인덱스 크기, 빌드 시간, recall@k 측정 도구.
+
+    python -m panager.db.vector_benchmark --layouts vector:768 halfvec:768 halfvec:384
+    python -m panager.db.vector_benchmark --codec  # DB 없이 텍스트/바이너리 코덱 비교
+
+memories/tool_registry에 저장된 벡터(또는 --synthetic N개의 무작위 벡터)를 표현별
+임시 테이블에 복사해 HNSW 인덱스를 만들고, numpy 전수 탐색(float32, 768차원)
+결과를 기준으로 recall@k와 쿼리 지연을 계산합니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import timeit
+from dataclasses import asdict, dataclass
+
+import asyncpg
+import numpy as np
+
+from panager.db.vector import (
+    EMBEDDING_DIMENSIONS,
+    VectorLayout,
+    make_binary_codec,
+    register_vector_codecs,
+)
+
+_BENCH_TABLE = "vector_benchmark_tmp"
+
+
+@dataclass
+class LayoutReport:
+    layout: str
+    rows: int
+    index_bytes: int
+    build_seconds: float
+    query_ms_mean: float
+    recall: dict[int, float]
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """전체 정밀도 코사인 유사도 기준 상위 k개 인덱스 (기준 정답)."""
+    corpus_n = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    queries_n = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = queries_n @ corpus_n.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def recall_at_k(expected: np.ndarray, actual: list[list[int]], k: int) -> float:
+    hits = [
+        len(set(exp[:k].tolist()) & set(act[:k])) / k
+        for exp, act in zip(expected, actual)
+    ]
+    return float(np.mean(hits)) if hits else 0.0
+
+
+async def load_corpus(conn: asyncpg.Connection) -> np.ndarray:
+    rows = await conn.fetch(
+        """
+        SELECT embedding::vector AS embedding FROM memories
+        UNION ALL
+        SELECT embedding::vector AS embedding FROM tool_registry
+        """
+    )
+    vectors = [r["embedding"] for r in rows]
+    # 이미 축소된 표현으로 저장된 경우 전체 정밀도 기준을 만들 수 없음
+    return np.array(
+        [v for v in vectors if len(v) == EMBEDDING_DIMENSIONS], dtype=np.float32
+    )
+
+
+async def benchmark_layout(
+    conn: asyncpg.Connection,
+    layout: VectorLayout,
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    ks: list[int],
+    ef_search: int,
+) -> LayoutReport:
+    await conn.execute(f"DROP TABLE IF EXISTS {_BENCH_TABLE}")
+    await conn.execute(
+        f"CREATE TEMP TABLE {_BENCH_TABLE} "
+        f"(id integer PRIMARY KEY, embedding {layout.sql_type} NOT NULL)"
+    )
+    await conn.executemany(
+        f"INSERT INTO {_BENCH_TABLE} (id, embedding) VALUES ($1, $2::{layout.sql_type})",
+        [(i, layout.prepare(v)) for i, v in enumerate(corpus)],
+    )
+
+    started = time.perf_counter()
+    await conn.execute(
+        f"CREATE INDEX {_BENCH_TABLE}_idx ON {_BENCH_TABLE} "
+        f"USING hnsw (embedding {layout.cosine_ops})"
+    )
+    build_seconds = time.perf_counter() - started
+    index_bytes = await conn.fetchval(
+        "SELECT pg_relation_size($1::regclass)", f"{_BENCH_TABLE}_idx"
+    )
+
+    await conn.execute(f"SET hnsw.ef_search = {int(ef_search)}")
+    k_max = max(ks)
+    results: list[list[int]] = []
+    started = time.perf_counter()
+    for query in queries:
+        rows = await conn.fetch(
+            f"SELECT id FROM {_BENCH_TABLE} "
+            f"ORDER BY embedding <=> $1::{layout.sql_type} LIMIT $2",
+            layout.prepare(query),
+            k_max,
+        )
+        results.append([r["id"] for r in rows])
+    query_ms_mean = (time.perf_counter() - started) * 1000 / max(1, len(queries))
+
+    expected = exact_top_k(corpus, queries, k_max)
+    await conn.execute(f"DROP TABLE {_BENCH_TABLE}")
+    return LayoutReport(
+        layout=layout.sql_type,
+        rows=len(corpus),
+        index_bytes=index_bytes,
+        build_seconds=build_seconds,
+        query_ms_mean=query_ms_mean,
+        recall={k: recall_at_k(expected, results, k) for k in ks},
+    )
+
+
+def codec_overhead(
+    dimensions: int = EMBEDDING_DIMENSIONS, number: int = 2000
+) -> dict[str, float]:
+    """쿼리 1건당 클라이언트 측 벡터 직렬화/역직렬화 CPU 시간(us)을 비교합니다.
+
+    text는 기존 `str(list)` 파라미터와 `::text` 결과 파싱, binary는
+    `register_vector_codecs`가 등록하는 코덱 경로입니다. 서버 측 float 파싱/포매팅
+    비용도 text 경로에서만 발생하지만 여기서는 측정하지 않습니다.
+    """
+    embedding = np.random.default_rng(0).standard_normal(dimensions).tolist()
+    text = str(embedding)
+    encode, decode = make_binary_codec("vector")
+    payload = encode(embedding)
+
+    def _us(stmt) -> float:
+        return timeit.timeit(stmt, number=number) / number * 1e6
+
+    return {
+        "text_encode_us": _us(lambda: str(list(embedding))),
+        "text_decode_us": _us(lambda: json.loads(text)),
+        "binary_encode_us": _us(lambda: encode(embedding)),
+        "binary_decode_us": _us(lambda: decode(payload)),
+    }
+
+
+def _parse_layout(value: str) -> VectorLayout:
+    storage, _, dims = value.partition(":")
+    return VectorLayout(storage, int(dims or EMBEDDING_DIMENSIONS))
+
+
+async def _run(args: argparse.Namespace) -> list[LayoutReport]:
+    from panager.core.config import Settings
+
+    settings = Settings()  # type: ignore
+    rng = np.random.default_rng(args.seed)
+    conn = await asyncpg.connect(settings.postgres_dsn_asyncpg)
+    try:
+        await register_vector_codecs(conn)
+        if args.synthetic:
+            corpus = rng.standard_normal(
+                (args.synthetic, EMBEDDING_DIMENSIONS), dtype=np.float32
+            )
+        else:
+            corpus = await load_corpus(conn)
+        if len(corpus) == 0:
+            raise SystemExit("측정할 벡터가 없습니다. --synthetic N을 사용하세요.")
+
+        # 저장된 벡터에 작은 잡음을 더해 자기 자신과 완전히 같지 않은 쿼리 생성
+        picked = rng.choice(len(corpus), size=min(args.queries, len(corpus)))
+        noise = rng.standard_normal((len(picked), EMBEDDING_DIMENSIONS))
+        queries = (corpus[picked] + 0.05 * noise * corpus.std()).astype(np.float32)
+
+        return [
+            await benchmark_layout(
+                conn, layout, corpus, queries, args.k, args.ef_search
+            )
+            for layout in args.layouts
+        ]
+    finally:
+        await conn.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="벡터 저장 표현 벤치마크")
+    parser.add_argument(
+        "--layouts",
+        nargs="+",
+        type=_parse_layout,
+        default=[
+            VectorLayout("vector", 768),
+            VectorLayout("halfvec", 768),
+            VectorLayout("halfvec", 384),
+            VectorLayout("vector", 256),
+        ],
+        help="storage:dimensions 형식 (예: halfvec:384)",
+    )
+    parser.add_argument("--k", nargs="+", type=int, default=[1, 5, 10])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--ef-search", type=int, default=40)
+    parser.add_argument("--synthetic", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--codec", action="store_true", help="코덱 CPU 비용만 측정")
+    args = parser.parse_args(argv)
+
+    if args.codec:
+        print(json.dumps(codec_overhead()))
+        return
+
+    reports = asyncio.run(_run(args))
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], ensure_ascii=False))
+        return
+
+    for r in reports:
+        recall = " ".join(f"recall@{k}={v:.3f}" for k, v in r.recall.items())
+        print(
+            f"{r.layout:<14} rows={r.rows} index={r.index_bytes / 1024:.0f}KiB "
+            f"build={r.build_seconds:.2f}s query={r.query_ms_mean:.2f}ms {recall}"
+        )
+
+
+if __name__ == "__main__":
+    main()
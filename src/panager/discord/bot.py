@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Dict, Any
 
 import discord
 from langchain_core.messages import HumanMessage
+from langgraph.types import Command
 
 from panager.agent.state import PendingReflection
 from panager.discord.handlers import _stream_agent_response, handle_dm
@@ -15,6 +16,7 @@ if TYPE_CHECKING:
     from panager.agent.registry import ToolRegistry
     from panager.services.google import GoogleService
     from panager.services.github import GithubService
+    from panager.services.integrations import IntegrationService
     from panager.services.notion import NotionService
     from panager.services.memory import MemoryService
     from panager.services.scheduler import SchedulerService
@@ -36,6 +38,7 @@ class PanagerBot(discord.Client):
         notion_service: NotionService,
         scheduler_service: SchedulerService,
         registry: ToolRegistry,
+        integration_service: IntegrationService | None = None,
     ) -> None:
         super().__init__(intents=discord.Intents.default())
         self.memory_service = memory_service
@@ -44,6 +47,7 @@ class PanagerBot(discord.Client):
         self.notion_service = notion_service
         self.scheduler_service = scheduler_service
         self.registry = registry
+        self.integration_service = integration_service
 
         # 스케줄러 서비스에 알림 발송용 프로바이더로 자신을 등록
         self.scheduler_service.set_notification_provider(self)
@@ -144,11 +148,16 @@ class PanagerBot(discord.Client):
                     except Exception:
                         log.debug("이전 인증 메시지를 찾을 수 없음 (새로 생성)")
 
-                # Resume 모드로 실행 (state=None)
-                # 이 시점에서 graph는 인터럽트 지점(툴 실행 후)에서 대기 중임
+                # Resume 모드로 실행: 이 시점에서 graph는 auth_interrupt 노드의
+                # interrupt()에서 대기 중이며, 입력 없이(None) 실행하면 인터럽트가
+                # 다시 발생하므로 resume 값을 전달해야 함
                 async with self._get_user_lock(user_id):
                     await _stream_agent_response(
-                        self.graph, None, config, dm, initial_msg=initial_msg
+                        self.graph,
+                        Command(resume="auth_success"),
+                        config,
+                        dm,
+                        initial_msg=initial_msg,
                     )
 
                 # 작업 완료 후 보류 메시지 제거
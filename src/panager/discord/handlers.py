@@ -6,6 +6,7 @@ from typing import Any, Dict
 
 import discord
 from langchain_core.messages import AIMessageChunk, HumanMessage
+from langgraph.types import Command
 
 from panager.db.connection import get_pool
 
@@ -35,9 +36,12 @@ class ResponseManager:
         """실행 단계에 따른 상태 문구를 업데이트합니다."""
         status_map = {
             "discovery": "의도를 파악하고 있습니다...",
+            "user_context": "의도를 파악하고 있습니다...",
+            "memory_recall": "관련 기억을 찾는 중입니다...",
             "agent": "관련 도구를 검색하고 계획을 세우는 중입니다...",
             "tool_executor": "도구 실행 중",
             "auth_interrupt": "보안 인증이 필요합니다.",
+            "compaction": "대화 기록을 정리하는 중입니다...",
         }
 
         new_status = status_map.get(node_name, "작업 중...")
@@ -116,7 +120,7 @@ class ResponseManager:
 
 async def _stream_agent_response(
     graph: Any,
-    state: Dict[str, Any] | None,
+    state: Dict[str, Any] | Command | None,
     config: Dict[str, Any],
     channel: discord.abc.Messageable,
     initial_msg: discord.Message | None = None,
@@ -125,7 +129,7 @@ async def _stream_agent_response(
     ui = ResponseManager(channel, initial_msg)
 
     try:
-        # state가 None이면 중단된 지점부터 재개(Resume)
+        # state가 Command(resume=...)이면 중단된 지점부터 재개(Resume)
         # updates 모드를 사용하여 노드 전환 감지, messages 모드를 사용하여 텍스트 스트리밍
         async for event_type, chunk in graph.astream(
             state, config=config, stream_mode=["updates", "messages"]
@@ -179,14 +183,14 @@ async def _stream_agent_response(
         if not state_snapshot.next:
             auth_url = None
 
-        # 인증이 필요한 경우, 현재 메시지 ID를 상태에 저장 (나중에 Resume 시 사용)
+        # 인증이 필요한 경우, 현재 메시지 ID를 상태에 저장 (나중에 Resume 시 사용).
+        # 중단된 노드(auth_interrupt)로 기록해야 다음 노드가 유지됨: agent로 기록하면
+        # 마지막 메시지(ToolMessage) 기준 라우팅이 END가 되어 재개할 작업이 사라짐.
+        # 인증이 끝난 뒤에는 agent_node가 메시지 ID를 초기화함
         if auth_url and ui.main_msg:
-            await graph.update_state(
-                config, {"auth_message_id": ui.main_msg.id}, as_node="agent"
+            await graph.aupdate_state(
+                config, {"auth_message_id": ui.main_msg.id}, as_node="auth_interrupt"
             )
-        elif not auth_url:
-            # 인증이 더 이상 필요 없으면 메시지 ID 정보도 클리어
-            await graph.update_state(config, {"auth_message_id": None}, as_node="agent")
     except Exception:
         log.warning("상태 스냅샷 조회 또는 업데이트 실패", exc_info=True)
 
@@ -0,0 +1,225 @@
+"""별도 프로세스에서 임베딩을 계산하는 워커 풀.
+
+토크나이징과 모델 추론을 자식 프로세스에서 수행하여 Discord 게이트웨이와
+uvicorn이 도는 이벤트 루프 프로세스의 GIL과 경쟁하지 않도록 합니다.
+
+RPC 프레임 (stdin/stdout 파이프):
+    요청: `!I` 길이 + UTF-8 JSON `{"texts": [...]}`
+    응답: `!B` 상태 코드 후
+        - 성공(0): `!II` (rows, dim) + rows*dim개의 little-endian float32
+        - 실패(1): `!I` 길이 + UTF-8 오류 메시지
+워커는 모델 로딩을 마치면 rows=dim=0인 성공 응답을 한 번 보내 준비 완료를 알립니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import struct
+import sys
+from typing import BinaryIO
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+_LENGTH = struct.Struct("!I")
+_STATUS = struct.Struct("!B")
+_SHAPE = struct.Struct("!II")
+_STATUS_OK = 0
+_STATUS_ERROR = 1
+
+
+def _encode_ok(vectors: np.ndarray) -> bytes:
+    vectors = np.ascontiguousarray(vectors, dtype="<f4")
+    rows, dim = vectors.shape if vectors.ndim == 2 else (0, 0)
+    return _STATUS.pack(_STATUS_OK) + _SHAPE.pack(rows, dim) + vectors.tobytes()
+
+
+def _encode_error(message: str) -> bytes:
+    payload = message.encode()
+    return _STATUS.pack(_STATUS_ERROR) + _LENGTH.pack(len(payload)) + payload
+
+
+class _WorkerProcess:
+    """하나의 임베딩 워커 자식 프로세스와 그 파이프."""
+
+    def __init__(self, args: list[str]) -> None:
+        self._args = args
+        self._proc: asyncio.subprocess.Process | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    async def start(self) -> None:
+        self._proc = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "panager.integrations.embedding_worker",
+            *self._args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        # 준비 완료 프레임 대기 (모델 로딩 실패 시 예외)
+        await self._read_response()
+
+    async def encode(self, texts: list[str]) -> np.ndarray:
+        assert self._proc is not None and self._proc.stdin is not None
+        payload = json.dumps({"texts": texts}, ensure_ascii=False).encode()
+        self._proc.stdin.write(_LENGTH.pack(len(payload)) + payload)
+        await self._proc.stdin.drain()
+        return await self._read_response()
+
+    async def _read_response(self) -> np.ndarray:
+        assert self._proc is not None and self._proc.stdout is not None
+        stdout = self._proc.stdout
+        (status,) = _STATUS.unpack(await stdout.readexactly(_STATUS.size))
+        if status != _STATUS_OK:
+            (length,) = _LENGTH.unpack(await stdout.readexactly(_LENGTH.size))
+            message = (await stdout.readexactly(length)).decode()
+            raise RuntimeError(f"임베딩 워커 오류: {message}")
+
+        rows, dim = _SHAPE.unpack(await stdout.readexactly(_SHAPE.size))
+        body = await stdout.readexactly(rows * dim * 4)
+        return np.frombuffer(body, dtype="<f4").reshape(rows, dim)
+
+    def kill(self) -> None:
+        if self.alive:
+            assert self._proc is not None
+            self._proc.kill()
+
+    async def stop(self) -> None:
+        if not self.alive:
+            return
+        assert self._proc is not None
+        if self._proc.stdin is not None:
+            self._proc.stdin.close()
+        try:
+            await asyncio.wait_for(self._proc.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            self._proc.kill()
+            await self._proc.wait()
+
+
+class EmbeddingWorkerPool:
+    """자식 프로세스 풀에 임베딩 요청을 분배하는 비동기 백엔드.
+
+    EmbeddingService는 이 백엔드의 load/encode를 스레드 없이 직접 await합니다.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        backend: str,
+        model_name: str,
+        onnx_dir: str = "",
+        threads: int = 0,
+    ) -> None:
+        self.name = "onnx-int8" if backend == "onnx" else "torch"
+        self._size = max(1, size)
+        self._args = [
+            "--backend",
+            backend,
+            "--model-name",
+            model_name,
+            "--onnx-dir",
+            onnx_dir,
+            "--threads",
+            str(threads),
+        ]
+        self._workers: list[_WorkerProcess] = []
+        self._idle: asyncio.Queue[_WorkerProcess] = asyncio.Queue()
+
+    async def load(self) -> None:
+        self._workers = [_WorkerProcess(self._args) for _ in range(self._size)]
+        await asyncio.gather(*(w.start() for w in self._workers))
+        for worker in self._workers:
+            self._idle.put_nowait(worker)
+        log.info("임베딩 워커 프로세스 %d개 시작 완료", self._size)
+
+    async def encode(self, texts: list[str]) -> np.ndarray:
+        worker = await self._idle.get()
+        try:
+            if not worker.alive:
+                # 이전 요청에서 종료된 워커는 사용 시점에 재시작
+                await worker.start()
+            return await worker.encode(texts)
+        except (
+            asyncio.IncompleteReadError,
+            BrokenPipeError,
+            ConnectionResetError,
+        ) as exc:
+            log.exception("임베딩 워커 프로세스가 비정상 종료되었습니다.")
+            await worker.stop()
+            raise RuntimeError("임베딩 워커 프로세스가 비정상 종료되었습니다.") from exc
+        except asyncio.CancelledError:
+            # 응답을 읽지 못한 채 취소되면 파이프 상태를 신뢰할 수 없으므로 폐기
+            worker.kill()
+            raise
+        finally:
+            self._idle.put_nowait(worker)
+
+    async def close(self) -> None:
+        await asyncio.gather(*(w.stop() for w in self._workers))
+        self._workers = []
+
+
+def _serve(backend_name: str, model_name: str, onnx_dir: str, threads: int) -> None:
+    """워커 프로세스 메인 루프."""
+    # 프로토콜 채널을 분리하고, 라이브러리의 print 출력은 stderr로 우회
+    channel: BinaryIO = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    stdin = sys.stdin.buffer
+
+    if backend_name == "onnx":
+        from panager.integrations.onnx_embedding import OnnxEmbeddingBackend
+
+        backend = OnnxEmbeddingBackend(onnx_dir, intra_op_threads=threads)
+    else:
+        from panager.services.embedding import SentenceTransformerBackend
+
+        if threads > 0:
+            import torch
+
+            torch.set_num_threads(threads)
+        backend = SentenceTransformerBackend(model_name)
+
+    try:
+        backend.load()
+    except Exception as exc:
+        channel.write(_encode_error(f"{type(exc).__name__}: {exc}"))
+        channel.flush()
+        raise
+    channel.write(_encode_ok(np.empty((0, 0), dtype=np.float32)))
+    channel.flush()
+
+    while True:
+        header = stdin.read(_LENGTH.size)
+        if len(header) < _LENGTH.size:
+            return  # 부모가 파이프를 닫음
+        (length,) = _LENGTH.unpack(header)
+        request = json.loads(stdin.read(length))
+        try:
+            response = _encode_ok(backend.encode(request["texts"]))
+        except Exception as exc:
+            response = _encode_error(f"{type(exc).__name__}: {exc}")
+        channel.write(response)
+        channel.flush()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="panager 임베딩 워커 프로세스")
+    parser.add_argument("--backend", choices=["torch", "onnx"], default="torch")
+    parser.add_argument("--model-name", required=True)
+    parser.add_argument("--onnx-dir", default="")
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args(argv)
+    _serve(args.backend, args.model_name, args.onnx_dir, args.threads)
+
+
+if __name__ == "__main__":
+    main()
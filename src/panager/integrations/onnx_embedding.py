@@ -0,0 +1,232 @@
+"""ONNX Runtime 기반 문장 임베딩 백엔드와 모델 export/parity 도구.
+
+Dockerfile.model 빌드 단계에서 단독 스크립트로도 실행되므로 panager 패키지를
+import하지 않습니다.
+
+    python onnx_embedding.py export --output DIR
+    python onnx_embedding.py parity --model-dir DIR
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Any
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+ONNX_MODEL_FILE = "model_quantized.onnx"
+ONNX_CONFIG_FILE = "panager_onnx.json"
+DEFAULT_MAX_SEQ_LENGTH = 128
+DEFAULT_PARITY_THRESHOLD = 0.99
+
+# 실제 사용 패턴(짧은 한국어 요청, 예약 명령)을 반영한 parity 검증 문장
+PARITY_SAMPLE_TEXTS = [
+    "오늘 일정 알려줘",
+    "할 일 목록 보여줘",
+    "내일 오전 9시에 팀 회의 일정 추가해줘",
+    "다음 주 금요일 치과 예약 취소해줘",
+    "노션에서 회의록 데이터베이스 찾아줘",
+    "깃허브 저장소 목록 보여줘",
+    "매일 아침 8시에 날씨 알려주는 알림 예약해줘",
+    "내가 좋아하는 음식 기억해둬: 김치찌개",
+    "manage_google_calendar: Google Calendar의 이벤트를 관리(조회, 추가, 삭제)합니다.",
+    "Set up a webhook for push events on my repository",
+]
+
+
+def mean_pool(token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """attention mask를 고려한 mean pooling (sentence-transformers Pooling과 동일)."""
+    mask = attention_mask[..., np.newaxis].astype(np.float32)
+    summed = (token_embeddings * mask).sum(axis=1)
+    counts = np.clip(mask.sum(axis=1), 1e-9, None)
+    return (summed / counts).astype(np.float32)
+
+
+class OnnxEmbeddingBackend:
+    """int8 양자화된 ONNX 모델을 onnxruntime으로 실행하는 임베딩 백엔드.
+
+    torch와 sentence-transformers를 로딩하지 않으므로 CPU 배포에서
+    인코딩 속도와 RSS가 모두 개선됩니다.
+    """
+
+    name = "onnx-int8"
+
+    def __init__(self, model_dir: str, intra_op_threads: int = 0) -> None:
+        self.model_dir = model_dir
+        self._intra_op_threads = intra_op_threads
+        self._session: Any = None
+        self._tokenizer: Any = None
+        self._input_names: list[str] = []
+        self._max_seq_length = DEFAULT_MAX_SEQ_LENGTH
+
+    def load(self) -> None:
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = os.path.join(self.model_dir, ONNX_MODEL_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"ONNX 임베딩 모델을 찾을 수 없습니다: {model_path} "
+                "(onnx_embedding.py export로 먼저 생성하세요)"
+            )
+
+        config_path = os.path.join(self.model_dir, ONNX_CONFIG_FILE)
+        if os.path.exists(config_path):
+            with open(config_path, encoding="utf-8") as f:
+                self._max_seq_length = json.load(f).get(
+                    "max_seq_length", DEFAULT_MAX_SEQ_LENGTH
+                )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self._intra_op_threads > 0:
+            options.intra_op_num_threads = self._intra_op_threads
+
+        self._session = ort.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = [i.name for i in self._session.get_inputs()]
+        self._tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        if self._session is None:
+            raise RuntimeError("OnnxEmbeddingBackend.load()가 호출되지 않았습니다.")
+
+        encoded = self._tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self._max_seq_length,
+            return_tensors="np",
+        )
+        feed = {
+            name: encoded[name].astype(np.int64)
+            for name in self._input_names
+            if name in encoded
+        }
+        token_embeddings = self._session.run(None, feed)[0]
+        return mean_pool(token_embeddings, encoded["attention_mask"])
+
+
+def export_quantized(model_name: str, output_dir: str, opset: int = 17) -> str:
+    """sentence-transformers 모델을 ONNX로 export한 뒤 int8 동적 양자화합니다.
+
+    export에는 torch, sentence-transformers, onnx가 필요하지만 런타임에는
+    onnxruntime과 tokenizer만 있으면 됩니다. 생성된 모델 경로를 반환합니다.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(output_dir, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    class _LastHiddenState(torch.nn.Module):
+        def __init__(self, model: torch.nn.Module) -> None:
+            super().__init__()
+            self.model = model
+
+        def forward(
+            self, input_ids: torch.Tensor, attention_mask: torch.Tensor
+        ) -> torch.Tensor:
+            return self.model(input_ids=input_ids, attention_mask=attention_mask)[0]
+
+    dummy = tokenizer(["임베딩 export용 문장"], return_tensors="pt")
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    torch.onnx.export(
+        _LastHiddenState(transformer),
+        (dummy["input_ids"], dummy["attention_mask"]),
+        fp32_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["last_hidden_state"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "last_hidden_state": {0: "batch", 1: "sequence"},
+        },
+        opset_version=opset,
+        dynamo=False,
+    )
+
+    quantized_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+    quantize_dynamic(fp32_path, quantized_path, weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+
+    tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, ONNX_CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "model_name": model_name,
+                "max_seq_length": st_model.max_seq_length,
+                "quantization": "dynamic-int8",
+            },
+            f,
+        )
+    return quantized_path
+
+
+def check_parity(
+    model_name: str,
+    model_dir: str,
+    texts: list[str] | None = None,
+    threshold: float = DEFAULT_PARITY_THRESHOLD,
+) -> dict[str, Any]:
+    """torch(sentence-transformers) 출력과 ONNX 출력의 코사인 유사도를 비교합니다."""
+    from sentence_transformers import SentenceTransformer
+
+    texts = texts or PARITY_SAMPLE_TEXTS
+    reference = SentenceTransformer(model_name, device="cpu").encode(texts)
+
+    backend = OnnxEmbeddingBackend(model_dir)
+    backend.load()
+    candidate = backend.encode(texts)
+
+    similarities = (reference * candidate).sum(axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    )
+    min_similarity = float(similarities.min())
+    return {
+        "texts": len(texts),
+        "min_cosine": min_similarity,
+        "mean_cosine": float(similarities.mean()),
+        "threshold": threshold,
+        "passed": min_similarity >= threshold,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="ONNX 임베딩 모델 export/parity 도구")
+    parser.add_argument("--model-name", default="paraphrase-multilingual-mpnet-base-v2")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = sub.add_parser("export", help="int8 양자화 ONNX 모델 생성")
+    export_parser.add_argument("--output", required=True)
+    export_parser.add_argument("--opset", type=int, default=17)
+
+    parity_parser = sub.add_parser("parity", help="torch 대비 코사인 유사도 검증")
+    parity_parser.add_argument("--model-dir", required=True)
+    parity_parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_PARITY_THRESHOLD
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        path = export_quantized(args.model_name, args.output, args.opset)
+        print(f"exported: {path}")
+        return 0
+
+    report = check_parity(args.model_name, args.model_dir, threshold=args.threshold)
+    print(json.dumps(report, ensure_ascii=False))
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
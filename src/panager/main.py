@@ -11,14 +11,20 @@ from psycopg.rows import dict_row
 import uvicorn
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 
+from panager.agent.llm import LLMClient
 from panager.agent.workflow import build_graph
 from panager.api.main import create_app
 from panager.core.config import Settings
 from panager.core.logging import configure_logging
+from panager.core.readiness import ReadinessTracker
 from panager.db.connection import close_pool, init_pool
+from panager.db.vector import VectorLayout, verify_layout
 from panager.discord.bot import PanagerBot
 from panager.services.google import GoogleService
 from panager.services.github import GithubService
+from panager.services.embedding import EmbeddingService
+from panager.services.embedding_cache import EmbeddingCache
+from panager.services.integrations import IntegrationService
 from panager.services.notion import NotionService
 from panager.services.memory import MemoryService
 from panager.services.scheduler import SchedulerService
@@ -99,46 +105,81 @@ async def main() -> None:
     except Exception:
         log.warning("checkpoint 정리 실패 (애플리케이션은 계속 시작)", exc_info=True)
 
+    # 3.5 임베딩 컬럼 표현(vector/halfvec, 차원)이 설정과 일치하는지 확인
+    vector_layout = VectorLayout.from_settings(settings)
+    await verify_layout(pool, vector_layout)
+
     # 4. 서비스 레이어 초기화
-    memory_service = MemoryService(pool)
+    # 임베딩 엔진은 MemoryService와 ToolRegistry가 공유 (모델 가중치 1회 적재)
+    embedding_cache = EmbeddingCache(
+        settings.embedding_cache_size,
+        pool if settings.embedding_cache_persistent else None,
+    )
+    embedding_service = EmbeddingService(settings, cache=embedding_cache)
+    # 시작 시와 이후 주기적으로 오래 쓰이지 않은 Postgres 캐시 항목 정리
+    cache_prune_task = asyncio.create_task(
+        embedding_cache.prune_periodically(
+            settings.embedding_cache_prune_hours * 3600,
+            settings.embedding_cache_ttl_days,
+            settings.embedding_cache_max_rows,
+        )
+    )
+    memory_service = MemoryService(pool, embedding_service, vector_layout)
     google_service = GoogleService(settings, pool)
     github_service = GithubService(settings, pool)
     notion_service = NotionService(settings, pool)
     scheduler_service = SchedulerService(pool)
+    integration_service = IntegrationService(
+        pool, ttl_seconds=settings.integration_cache_seconds
+    )
+    # 애플리케이션 수명 동안 공유하는 LLM 클라이언트 (keep-alive 연결 풀)
+    llm_client = LLMClient(settings)
+
+    # 4.1 백그라운드 워밍업 (첫 사용자 요청이 모델 로딩/연결 수립을 기다리지 않도록)
+    readiness = ReadinessTracker()
+    warmup_task = asyncio.create_task(
+        readiness.warm_up(
+            {
+                "database": lambda: asyncio.gather(
+                    *(pool.fetchval("SELECT 1") for _ in range(pool.get_min_size())),
+                    pg_conn.execute("SELECT 1"),
+                ),
+                "embedding": lambda: embedding_service.embed_many(["워밍업"]),
+                "llm": llm_client.warm_up,
+            },
+            retry_interval=settings.warmup_retry_seconds,
+        )
+    )
 
     # 4.5 도구 레지스트리 초기화 및 인덱싱
     from panager.agent.registry import ToolRegistry
 
-    registry = ToolRegistry(pool, settings)
+    registry = ToolRegistry(pool, settings, embedding_service, vector_layout)
 
-    # 프로토타입 생성 (인덱싱용, user_id=0은 실제 사용되지 않음)
-    # 실제 도구 로직은 await 서비스 호출 시 에러가 날 수 있으나, 인덱싱은 name/description만 필요
-    from panager.tools.google import (
-        make_manage_google_calendar,
-        make_manage_google_tasks,
+    # 도구는 시작 시 한 번만 생성하고, 사용자는 호출 시점의 config로 전달
+    registry.register_service_tools(
+        google_service=google_service,
+        github_service=github_service,
+        notion_service=notion_service,
+        memory_service=memory_service,
+        scheduler_service=scheduler_service,
     )
-    from panager.tools.github import make_github_tools
-    from panager.tools.notion import make_notion_tools
-    from panager.tools.memory import make_memory_tools
-    from panager.tools.scheduler import make_scheduler_tools
-
-    prototypes = [
-        make_manage_google_calendar(0, google_service),
-        make_manage_google_tasks(0, google_service),
-    ]
-
-    prototypes.extend(make_github_tools(0, github_service))
-    prototypes.extend(make_notion_tools(0, notion_service))
-    prototypes.extend(make_memory_tools())
-    prototypes.extend(make_scheduler_tools())
-
-    # 메모리 레지스트리에 프로토타입 등록 (메모리상에서는 필터링용으로 사용)
-    # 실제 워타임에는 user_id에 맞게 재생성됨
-    registry.register_tools(prototypes)
 
     # DB와 동기화 (임베딩 생성 및 저장)
     await registry.sync_to_db()
 
+    schema_reports = await asyncio.to_thread(registry.schema_token_report)
+    for report in schema_reports:
+        log.debug(
+            "도구 스키마 토큰: %s %d -> %d", report.name, report.before, report.after
+        )
+    log.info(
+        "도구 스키마 압축: %d -> %d 토큰 (도구 %d개)",
+        sum(r.before for r in schema_reports),
+        sum(r.after for r in schema_reports),
+        len(schema_reports),
+    )
+
     # 5. Discord 봇 초기화 (UserSessionProvider 구현체)
     bot = PanagerBot(
         memory_service=memory_service,
@@ -147,6 +188,7 @@ async def main() -> None:
         notion_service=notion_service,
         scheduler_service=scheduler_service,
         registry=registry,
+        integration_service=integration_service,
     )
 
     # 6. 에이전트 워크플로우(LangGraph) 빌드 및 주입
@@ -159,11 +201,13 @@ async def main() -> None:
         notion_service=notion_service,
         scheduler_service=scheduler_service,
         registry=registry,
+        integration_service=integration_service,
+        llm_client=llm_client,
     )
     bot.graph = graph
 
     # 7. FastAPI API 서버 시작 (백그라운드)
-    app = create_app(bot)
+    app = create_app(bot, readiness)
     api_config = uvicorn.Config(app, host="0.0.0.0", port=8000, log_level="warning")
     api_server = uvicorn.Server(api_config)
     api_task = asyncio.create_task(api_server.serve())
@@ -185,6 +229,12 @@ async def main() -> None:
             await api_task
         except asyncio.CancelledError:
             pass
+        warmup_task.cancel()
+        cache_prune_task.cancel()
+
+        # 임베딩 워커, LLM 연결 풀 등 리소스 정리
+        await embedding_service.close()
+        await llm_client.aclose()
 
         # DB 연결 종료
         await pg_conn.close()
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Protocol
+
+from panager.services.embedding_cache import cache_key, normalize_text
+
+if TYPE_CHECKING:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+
+    from panager.core.config import Settings
+    from panager.services.embedding_cache import EmbeddingCache
+
+log = logging.getLogger(__name__)
+
+# 큐 대기 시간 백분위 계산에 사용할 최근 요청 수
+_STATS_WINDOW = 1024
+
+
+class EmbeddingBackend(Protocol):
+    """임베딩 모델 실행 백엔드.
+
+    동기 load/encode는 워커 스레드에서 호출되고, 코루틴으로 구현된 경우
+    (예: EmbeddingWorkerPool) 이벤트 루프에서 직접 await됩니다.
+    """
+
+    name: str
+
+    def load(self) -> None: ...
+
+    def encode(self, texts: list[str]) -> np.ndarray: ...
+
+
+class SentenceTransformerBackend:
+    """sentence-transformers(torch)로 모델을 실행하는 기본 백엔드."""
+
+    name = "torch"
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+        self._model: SentenceTransformer | None = None
+
+    def load(self) -> None:
+        # torch는 이 백엔드를 선택한 경우에만 import되도록 지연 로딩
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(self.model_name)
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        if self._model is None:
+            raise RuntimeError(
+                "SentenceTransformerBackend.load()가 호출되지 않았습니다."
+            )
+        return self._model.encode(texts)
+
+
+def default_onnx_dir(model_name: str) -> str:
+    """model-init 이미지가 ONNX 모델을 내려놓는 기본 경로 ($HF_HOME/onnx/...)."""
+    hf_home = os.environ.get(
+        "HF_HOME", os.path.join(os.path.expanduser("~"), ".cache", "huggingface")
+    )
+    return os.path.join(hf_home, "onnx", f"{model_name}-int8")
+
+
+def create_embedding_backend(settings: Settings) -> EmbeddingBackend:
+    """설정(`embedding_backend`, `embedding_workers`)에 맞는 임베딩 백엔드를 생성합니다."""
+    if settings.embedding_workers > 0:
+        from panager.integrations.embedding_worker import EmbeddingWorkerPool
+
+        return EmbeddingWorkerPool(
+            settings.embedding_workers,
+            backend=settings.embedding_backend,
+            model_name=settings.embedding_model_name,
+            onnx_dir=settings.embedding_onnx_dir
+            or default_onnx_dir(settings.embedding_model_name),
+            threads=settings.embedding_onnx_threads,
+        )
+    if settings.embedding_backend == "onnx":
+        from panager.integrations.onnx_embedding import OnnxEmbeddingBackend
+
+        return OnnxEmbeddingBackend(
+            settings.embedding_onnx_dir
+            or default_onnx_dir(settings.embedding_model_name),
+            intra_op_threads=settings.embedding_onnx_threads,
+        )
+    return SentenceTransformerBackend(settings.embedding_model_name)
+
+
+def encode_concurrency(settings: Settings) -> int:
+    """동시에 실행할 encode 호출 수.
+
+    `embedding_max_concurrency`가 0(기본값)이면 워커 프로세스 풀의 크기를
+    사용해 모든 워커가 각자 배치를 처리하게 합니다. 인프로세스 백엔드는
+    torch/onnxruntime이 한 번의 encode에서 이미 코어를 모두 사용하므로 1입니다.
+    """
+    if settings.embedding_max_concurrency > 0:
+        return settings.embedding_max_concurrency
+    return max(1, settings.embedding_workers)
+
+
+@dataclass
+class _PendingEmbedding:
+    """배치 처리를 기다리는 단일 임베딩 요청."""
+
+    text: str
+    future: asyncio.Future[list[float]]
+    enqueued_at: float
+
+
+@dataclass
+class EmbeddingBatchStats:
+    """마이크로 배칭 윈도우 튜닝용 배치 크기 및 큐 대기 시간 지표."""
+
+    batches: int = 0
+    requests: int = 0
+    max_batch_size: int = 0
+    _batch_sizes: deque[int] = field(
+        default_factory=lambda: deque(maxlen=_STATS_WINDOW)
+    )
+    _queue_waits: deque[float] = field(
+        default_factory=lambda: deque(maxlen=_STATS_WINDOW)
+    )
+
+    def record(self, batch_size: int, queue_waits: list[float]) -> None:
+        self.batches += 1
+        self.requests += batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self._batch_sizes.append(batch_size)
+        self._queue_waits.extend(queue_waits)
+
+    def snapshot(self) -> dict[str, Any]:
+        """누적 지표와 최근 윈도우의 p50/p99 큐 대기 시간(ms)을 반환합니다."""
+        waits = sorted(self._queue_waits)
+
+        def _percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            idx = min(len(waits) - 1, int(round(p * (len(waits) - 1))))
+            return waits[idx] * 1000
+
+        sizes = self._batch_sizes
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": (sum(sizes) / len(sizes)) if sizes else 0.0,
+            "queue_wait_p50_ms": _percentile(0.5),
+            "queue_wait_p99_ms": _percentile(0.99),
+        }
+
+
+class EmbeddingService:
+    """프로세스 전역에서 공유하는 문장 임베딩 엔진.
+
+    MemoryService와 ToolRegistry가 같은 인스턴스를 주입받아 모델 가중치를
+    한 번만 적재하고, 인코딩 동시성도 하나의 세마포어로 제한합니다.
+    동시에 들어온 `embed()` 요청은 짧은 윈도우 동안 모아 한 번의
+    `encode([...])` 호출로 처리하며, cache가 주어지면 모델 호출 전에
+    정규화된 텍스트 해시로 캐시를 먼저 조회합니다. 같은 텍스트에 대한
+    요청이 이미 진행 중이면(예: 도구 검색과 메모리 조회가 같은 사용자
+    메시지를 동시에 임베딩) 그 결과를 공유합니다.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        cache: EmbeddingCache | None = None,
+        backend: EmbeddingBackend | None = None,
+    ) -> None:
+        self.model_name = settings.embedding_model_name
+        self._cache = cache
+        self._backend = backend or create_embedding_backend(settings)
+        # 백엔드마다 수치가 미세하게 다르므로 캐시 네임스페이스를 분리
+        self._cache_namespace = f"{self.model_name}@{self._backend.name}"
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._encode_semaphore = asyncio.Semaphore(encode_concurrency(settings))
+
+        # 마이크로 배칭
+        self._batch_window = max(0.0, settings.embedding_batch_window_ms) / 1000
+        self._max_batch_size = max(1, settings.embedding_max_batch_size)
+        self._pending: list[_PendingEmbedding] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task[None]] = set()
+        self._inflight: dict[str, asyncio.Task[list[float]]] = {}
+        self._cache_writes: set[asyncio.Task[None]] = set()
+        self.stats = EmbeddingBatchStats()
+
+    async def get_backend(self) -> EmbeddingBackend:
+        """임베딩 백엔드를 비차단 방식으로 지연 로딩합니다."""
+        if not self._loaded:
+            async with self._load_lock:
+                # 더블 체크 로킹
+                if not self._loaded:
+                    log.info(
+                        "임베딩 모델 로딩 시작 (%s, backend=%s)...",
+                        self.model_name,
+                        self._backend.name,
+                    )
+                    # 모델 로딩은 CPU 및 I/O 집약적이므로 별도 스레드에서 실행
+                    if inspect.iscoroutinefunction(self._backend.load):
+                        await self._backend.load()
+                    else:
+                        await asyncio.to_thread(self._backend.load)
+                    self._loaded = True
+                    log.info("임베딩 모델 로딩 완료.")
+        return self._backend
+
+    async def embed(self, text: str) -> list[float]:
+        """텍스트 임베딩을 반환합니다. 캐시 미스인 경우 배치 큐를 거쳐 인코딩합니다."""
+        text = normalize_text(text)
+        task = self._inflight.get(text)
+        if task is None:
+            task = asyncio.create_task(self._embed(text))
+            self._inflight[text] = task
+            task.add_done_callback(functools.partial(self._inflight_done, text))
+        # 한 호출자가 취소되어도 같은 텍스트를 기다리는 다른 호출자에 영향이 없도록 보호
+        return list(await asyncio.shield(task))
+
+    def _inflight_done(self, text: str, task: asyncio.Task[list[float]]) -> None:
+        if self._inflight.get(text) is task:
+            del self._inflight[text]
+        # 모든 호출자가 취소된 경우에도 "exception was never retrieved" 경고를 남기지 않음
+        if not task.cancelled():
+            task.exception()
+
+    async def _embed(self, text: str) -> list[float]:
+        if self._cache is None:
+            return await self._enqueue(text)
+
+        key = cache_key(text, self._cache_namespace)
+        cached = await self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        embedding = await self._enqueue(text)
+        # 캐시 저장(Postgres 쓰기)은 응답 경로에서 기다리지 않음
+        task = asyncio.create_task(
+            self._cache.put(key, self._cache_namespace, embedding)
+        )
+        self._cache_writes.add(task)
+        task.add_done_callback(self._cache_write_done)
+        return embedding
+
+    def _cache_write_done(self, task: asyncio.Task[None]) -> None:
+        self._cache_writes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.warning("임베딩 캐시 저장 실패", exc_info=task.exception())
+
+    async def _enqueue(self, text: str) -> list[float]:
+        """텍스트를 배치 큐에 넣고 결과를 기다립니다."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.append(_PendingEmbedding(text, future, time.monotonic()))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._batch_window, self._flush)
+
+        return await future
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """여러 텍스트를 큐를 거치지 않고 한 번의 encode 호출로 임베딩합니다."""
+        if not texts:
+            return []
+        backend = await self.get_backend()
+        # CPU 집약적인 인코딩 작업을 별도 스레드에서 실행하되,
+        # 여러 호출자가 코어를 두고 경쟁하지 않도록 동시 실행 수를 제한
+        async with self._encode_semaphore:
+            if inspect.iscoroutinefunction(backend.encode):
+                embeddings = await backend.encode(texts)
+            else:
+                embeddings = await asyncio.to_thread(backend.encode, texts)
+        return [e.tolist() if hasattr(e, "tolist") else list(e) for e in embeddings]
+
+    async def close(self) -> None:
+        """백엔드가 보유한 리소스(워커 프로세스 등)를 정리합니다.
+
+        진행 중인 캐시 저장은 DB 풀이 닫히기 전에 끝나도록 기다립니다.
+        """
+        if self._cache_writes:
+            await asyncio.gather(*self._cache_writes, return_exceptions=True)
+        close = getattr(self._backend, "close", None)
+        if close is not None and self._loaded:
+            await close()
+
+    def _flush(self) -> None:
+        """대기 중인 요청을 하나의 배치로 묶어 처리 태스크를 시작합니다."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: list[_PendingEmbedding]) -> None:
+        started = time.monotonic()
+        try:
+            vectors = await self.embed_many([p.text for p in batch])
+        except Exception as exc:
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(exc)
+            return
+
+        for p, vector in zip(batch, vectors):
+            # 호출자가 이미 취소된 경우 결과를 버림
+            if not p.future.done():
+                p.future.set_result(vector)
+
+        queue_waits = [started - p.enqueued_at for p in batch]
+        self.stats.record(len(batch), queue_waits)
+        log.debug(
+            "임베딩 배치 처리 (batch_size=%d, max_queue_wait_ms=%.1f, encode_ms=%.1f)",
+            len(batch),
+            max(queue_waits) * 1000,
+            (time.monotonic() - started) * 1000,
+        )
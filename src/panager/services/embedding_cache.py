@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+import unicodedata
+from collections import OrderedDict
+
+import asyncpg
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키 계산 및 인코딩에 사용할 정규화된 텍스트를 반환합니다.
+
+    유니코드 NFC 정규화 후 앞뒤 공백을 제거하고 연속 공백을 하나로 합칩니다.
+    """
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(text: str, model_name: str) -> str:
+    """모델 이름과 정규화된 텍스트로 캐시 키(sha256 hex)를 생성합니다."""
+    payload = f"{model_name}\x00{normalize_text(text)}".encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """임베딩 결과 캐시.
+
+    프로세스 내 LRU 계층과, pool이 주어진 경우 재시작 후에도 유지되는
+    Postgres(`embedding_cache` 테이블) 계층으로 구성됩니다. 캐시 오류는
+    요청 처리를 막지 않도록 로그만 남기고 무시합니다. Postgres 계층은 항목을
+    사용할 때마다 `last_used_at`을 갱신하고, `prune`으로 오래 쓰이지 않은
+    항목과 행 수 상한을 넘는 항목을 정리합니다.
+    """
+
+    def __init__(self, max_entries: int, pool: asyncpg.Pool | None = None) -> None:
+        self._max_entries = max(0, max_entries)
+        self._pool = pool
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> list[float] | None:
+        """캐시된 임베딩을 반환합니다. 없으면 None."""
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector.tolist()
+
+        if self._pool is not None:
+            vector = await self._fetch_persistent(key)
+            if vector is not None:
+                self._remember(key, vector)
+                self.hits += 1
+                return vector.tolist()
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, model_name: str, embedding: list[float]) -> None:
+        """임베딩을 캐시에 저장합니다."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        self._remember(key, vector)
+        if self._pool is not None:
+            await self._store_persistent(key, model_name, vector)
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        if self._max_entries == 0:
+            return
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def _fetch_persistent(self, key: str) -> np.ndarray | None:
+        assert self._pool is not None
+        try:
+            async with self._pool.acquire() as conn:
+                # 조회와 사용 시각 갱신을 한 번의 왕복으로 처리
+                row = await conn.fetchrow(
+                    """
+                    UPDATE embedding_cache SET last_used_at = now()
+                    WHERE key = $1
+                    RETURNING embedding
+                    """,
+                    key,
+                )
+        except Exception:
+            log.warning("임베딩 캐시 조회 실패 (key=%s)", key, exc_info=True)
+            return None
+        if row is None:
+            return None
+        return np.frombuffer(row["embedding"], dtype=np.float32)
+
+    async def _store_persistent(
+        self, key: str, model_name: str, vector: np.ndarray
+    ) -> None:
+        assert self._pool is not None
+        try:
+            async with self._pool.acquire() as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO embedding_cache (key, model_name, embedding)
+                    VALUES ($1, $2, $3)
+                    ON CONFLICT (key) DO UPDATE SET last_used_at = now()
+                    """,
+                    key,
+                    model_name,
+                    vector.tobytes(),
+                )
+        except Exception:
+            log.warning("임베딩 캐시 저장 실패 (key=%s)", key, exc_info=True)
+
+    async def prune(self, ttl_days: int, max_rows: int) -> int:
+        """오래 쓰이지 않은 항목과 행 수 상한을 넘는 항목을 삭제하고 삭제 수를 반환합니다."""
+        if self._pool is None:
+            return 0
+        async with self._pool.acquire() as conn:
+            expired = await conn.execute(
+                """
+                DELETE FROM embedding_cache
+                WHERE last_used_at < now() - make_interval(days => $1)
+                """,
+                ttl_days,
+            )
+            overflow = await conn.execute(
+                """
+                DELETE FROM embedding_cache
+                WHERE key IN (
+                    SELECT key FROM embedding_cache
+                    ORDER BY last_used_at DESC
+                    OFFSET $1
+                )
+                """,
+                max_rows,
+            )
+        deleted = _deleted_rows(expired) + _deleted_rows(overflow)
+        log.info(
+            "임베딩 캐시 정리: %d개 삭제 (TTL %d일, 최대 %d행)",
+            deleted,
+            ttl_days,
+            max_rows,
+        )
+        return deleted
+
+    async def prune_periodically(
+        self, interval_seconds: float, ttl_days: int, max_rows: int
+    ) -> None:
+        """`interval_seconds`마다 `prune`을 실행합니다 (취소될 때까지)."""
+        while True:
+            try:
+                await self.prune(ttl_days, max_rows)
+            except Exception:
+                log.warning("임베딩 캐시 정리 실패", exc_info=True)
+            await asyncio.sleep(interval_seconds)
+
+
+def _deleted_rows(status: str) -> int:
+    """asyncpg `execute` 상태 문자열("DELETE n")에서 삭제된 행 수를 꺼냅니다."""
+    try:
+        return int(status.rsplit(" ", 1)[-1])
+    except (AttributeError, ValueError):
+        return 0
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import logging
+import time
+
+import asyncpg
+
+log = logging.getLogger(__name__)
+
+# OAuth 연동이 필요한 도구 도메인 (도구 metadata["domain"]과 동일)
+PROVIDERS = ("google", "github", "notion")
+
+
+class IntegrationService:
+    """사용자별 외부 서비스 연동 여부를 조회합니다.
+
+    매 요청의 도구 검색에서 호출되므로 결과를 TTL 동안 캐시하고,
+    OAuth 콜백에서 토큰이 저장되면 `invalidate`로 즉시 무효화합니다.
+    """
+
+    def __init__(self, pool: asyncpg.Pool, ttl_seconds: float = 300.0) -> None:
+        self._pool = pool
+        self._ttl = ttl_seconds
+        self._cache: dict[int, tuple[float, frozenset[str]]] = {}
+
+    async def connected_providers(self, user_id: int) -> frozenset[str]:
+        """토큰이 저장된 provider 집합을 한 번의 쿼리로 조회합니다."""
+        now = time.monotonic()
+        cached = self._cache.get(user_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        async with self._pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT
+                    EXISTS (SELECT 1 FROM google_tokens WHERE user_id = $1) AS google,
+                    EXISTS (SELECT 1 FROM github_tokens WHERE user_id = $1) AS github,
+                    EXISTS (SELECT 1 FROM notion_tokens WHERE user_id = $1) AS notion
+                """,
+                user_id,
+            )
+        providers = frozenset(p for p in PROVIDERS if row[p])
+        self._cache[user_id] = (now + self._ttl, providers)
+        log.debug("사용자 %d 연동 서비스: %s", user_id, sorted(providers))
+        return providers
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.pop(user_id, None)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-import asyncio
 import logging
+from typing import TYPE_CHECKING
 from uuid import UUID
 
 import asyncpg
-from sentence_transformers import SentenceTransformer
+
+from panager.db.vector import VectorLayout
+
+if TYPE_CHECKING:
+    from panager.services.embedding import EmbeddingService
 
 log = logging.getLogger(__name__)
 
@@ -13,45 +17,29 @@ log = logging.getLogger(__name__)
 class MemoryService:
     """장기 메모리 저장 및 검색을 담당하는 서비스."""
 
-    def __init__(self, pool: asyncpg.Pool) -> None:
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        embedding: EmbeddingService,
+        layout: VectorLayout | None = None,
+    ) -> None:
         self._pool = pool
-        self._model: SentenceTransformer | None = None
-        self._lock = asyncio.Lock()
-
-    async def _get_model(self) -> SentenceTransformer:
-        """SentenceTransformer 모델을 비차단 방식으로 지연 로딩합니다."""
-        if self._model is None:
-            async with self._lock:
-                # 더블 체크 로킹
-                if self._model is None:
-                    log.info("SentenceTransformer 모델 로딩 시작...")
-                    # 모델 로딩은 CPU 및 I/O 집약적이므로 별도 스레드에서 실행
-                    self._model = await asyncio.to_thread(
-                        SentenceTransformer, "paraphrase-multilingual-mpnet-base-v2"
-                    )
-                    log.info("SentenceTransformer 모델 로딩 완료.")
-        return self._model
-
-    async def _get_embedding(self, text: str) -> list[float]:
-        """텍스트에 대한 임베딩을 비차단 방식으로 생성합니다."""
-        model = await self._get_model()
-        # CPU 집약적인 인코딩 작업을 별도 스레드에서 실행하여 이벤트 루프 차단 방지
-        embedding = await asyncio.to_thread(model.encode, text)
-        return embedding.tolist()
+        self._embedding = embedding
+        self._layout = layout or VectorLayout()
 
     async def save_memory(self, user_id: int, content: str) -> UUID:
         """사용자의 메모리를 임베딩과 함께 저장합니다."""
-        embedding = await self._get_embedding(content)
+        embedding = await self._embedding.embed(content)
         async with self._pool.acquire() as conn:
             row = await conn.fetchrow(
-                """
+                f"""
                 INSERT INTO memories (user_id, content, embedding)
-                VALUES ($1, $2, $3::vector)
+                VALUES ($1, $2, $3::{self._layout.sql_type})
                 RETURNING id
                 """,
                 user_id,
                 content,
-                str(embedding),
+                self._layout.prepare(embedding),
             )
             if row is None:
                 raise RuntimeError("메모리 저장 실패")
@@ -61,18 +49,18 @@ class MemoryService:
         self, user_id: int, query: str, limit: int = 5
     ) -> list[str]:
         """쿼리와 유사한 사용자의 메모리를 검색합니다."""
-        embedding = await self._get_embedding(query)
+        embedding = await self._embedding.embed(query)
         async with self._pool.acquire() as conn:
             rows = await conn.fetch(
-                """
+                f"""
                 SELECT content
                 FROM memories
                 WHERE user_id = $1
-                ORDER BY embedding <=> $2::vector
+                ORDER BY embedding <=> $2::{self._layout.sql_type}
                 LIMIT $3
                 """,
                 user_id,
-                str(embedding),
+                self._layout.prepare(embedding),
                 limit,
             )
             return [row["content"] for row in rows]
@@ -0,0 +1,26 @@
+"""도구 실행 시점의 사용자 컨텍스트 전달.
+
+도구 인스턴스는 시작 시 서비스만 주입받아 한 번 생성되고, 호출한 사용자는
+`RunnableConfig["configurable"]["user_id"]`로 전달받습니다.
+"""
+
+from __future__ import annotations
+
+from langchain_core.runnables import RunnableConfig
+
+
+def tool_config(user_id: int, config: RunnableConfig | None = None) -> RunnableConfig:
+    """기존 config(콜백 등)를 유지하면서 user_id를 주입한 도구 호출용 config."""
+    config = config or {}
+    return {
+        **config,
+        "configurable": {**config.get("configurable", {}), "user_id": user_id},
+    }
+
+
+def get_user_id(config: RunnableConfig) -> int:
+    """도구 호출 config에서 user_id를 꺼냅니다."""
+    user_id = config.get("configurable", {}).get("user_id")
+    if user_id is None:
+        raise ValueError("도구 호출 config에 user_id가 없습니다.")
+    return user_id
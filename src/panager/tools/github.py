@@ -4,9 +4,12 @@ import json
 import logging
 from typing import TYPE_CHECKING
 
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
+from panager.tools.context import get_user_id
+
 if TYPE_CHECKING:
     from langchain_core.tools import BaseTool
     from panager.services.github import GithubService
@@ -27,12 +30,12 @@ class SetupWebhookInput(BaseModel):
     )
 
 
-def make_github_tools(user_id: int, github_service: GithubService) -> list[BaseTool]:
+def make_github_tools(github_service: GithubService) -> list[BaseTool]:
     @tool(args_schema=ListReposInput)
-    async def list_github_repositories() -> str:
+    async def list_github_repositories(config: RunnableConfig) -> str:
         """GitHub 사용자의 저장소 목록을 조회합니다."""
         # ...
-        async with await github_service.get_client(user_id) as client:
+        async with await github_service.get_client(get_user_id(config)) as client:
             # ... (rest of implementation)
             response = await client.get(
                 "/user/repos", params={"sort": "updated", "per_page": 20}
@@ -54,13 +57,15 @@ def make_github_tools(user_id: int, github_service: GithubService) -> list[BaseT
             )
 
     @tool(args_schema=SetupWebhookInput)
-    async def setup_github_webhook(repo_full_name: str, webhook_url: str) -> str:
+    async def setup_github_webhook(
+        repo_full_name: str, webhook_url: str, config: RunnableConfig
+    ) -> str:
         """GitHub 저장소에 Push 이벤트용 Webhook을 설정합니다.
 
         repo_full_name: 'owner/repo' 형식
         webhook_url: 이벤트를 수신할 서버의 URL
         """
-        async with await github_service.get_client(user_id) as client:
+        async with await github_service.get_client(get_user_id(config)) as client:
             payload = {
                 "name": "web",
                 "active": True,
@@ -82,6 +87,12 @@ def make_github_tools(user_id: int, github_service: GithubService) -> list[BaseT
                     {"status": "error", "message": response.text}, ensure_ascii=False
                 )
 
-    list_github_repositories.metadata = {"domain": "github"}
-    setup_github_webhook.metadata = {"domain": "github"}
+    list_github_repositories.metadata = {
+        "domain": "github",
+        "examples": ["내 레포 목록 보여줘", "깃허브 저장소 뭐 있어?"],
+    }
+    setup_github_webhook.metadata = {
+        "domain": "github",
+        "examples": ["푸시하면 알림 오게 해줘", "이 레포에 웹훅 걸어줘"],
+    }
     return [list_github_repositories, setup_github_webhook]
@@ -7,9 +7,12 @@ from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import TYPE_CHECKING, Any
 
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field, model_validator
 
+from panager.tools.context import get_user_id
+
 if TYPE_CHECKING:
     from langchain_core.tools import BaseTool
 
@@ -77,10 +80,11 @@ class CalendarToolInput(BaseModel):
         return self
 
 
-def make_manage_google_tasks(user_id: int, google_service: GoogleService) -> BaseTool:
+def make_manage_google_tasks(google_service: GoogleService) -> BaseTool:
     @tool(args_schema=TaskToolInput)
     async def manage_google_tasks(
         action: TaskAction,
+        config: RunnableConfig,
         task_id: str | None = None,
         title: str | None = None,
         status: str | None = None,
@@ -92,7 +96,7 @@ def make_manage_google_tasks(user_id: int, google_service: GoogleService) -> Bas
         - action='update_status': task_id와 status('needsAction' 또는 'completed')가 필수입니다.
         - action='delete': task_id가 필수입니다. 할 일을 삭제합니다.
         """
-        service = await google_service.get_tasks_service(user_id)
+        service = await google_service.get_tasks_service(get_user_id(config))
         # ... (rest of implementation remains same)
 
         if action == TaskAction.LIST:
@@ -136,16 +140,23 @@ def make_manage_google_tasks(user_id: int, google_service: GoogleService) -> Bas
 
         raise ValueError(f"지원하지 않는 액션입니다: {action}")
 
-    manage_google_tasks.metadata = {"domain": "google"}
+    manage_google_tasks.metadata = {
+        "domain": "google",
+        "examples": [
+            "할 일 목록 보여줘",
+            "오늘 할 일 뭐 있어?",
+            "장보기 할 일에 추가해줘",
+            "그 작업 완료로 바꿔줘",
+        ],
+    }
     return manage_google_tasks
 
 
-def make_manage_google_calendar(
-    user_id: int, google_service: GoogleService
-) -> BaseTool:
+def make_manage_google_calendar(google_service: GoogleService) -> BaseTool:
     @tool(args_schema=CalendarToolInput)
     async def manage_google_calendar(
         action: CalendarAction,
+        config: RunnableConfig,
         event_id: str | None = None,
         calendar_id: str = "primary",
         title: str | None = None,
@@ -159,7 +170,7 @@ def make_manage_google_calendar(
         - action='create': title, start_at, end_at이 필수입니다. 새 이벤트를 추가합니다.
         - action='delete': event_id가 필수입니다. 이벤트를 삭제합니다.
         """
-        service = await google_service.get_calendar_service(user_id)
+        service = await google_service.get_calendar_service(get_user_id(config))
 
         if action == CalendarAction.LIST:
             now = datetime.now(timezone.utc)
@@ -232,5 +243,13 @@ def make_manage_google_calendar(
 
         raise ValueError(f"지원하지 않는 액션입니다: {action}")
 
-    manage_google_calendar.metadata = {"domain": "google"}
+    manage_google_calendar.metadata = {
+        "domain": "google",
+        "examples": [
+            "내일 일정 알려줘",
+            "이번 주 약속 뭐 있지?",
+            "금요일 3시에 회의 잡아줘",
+            "다음 주 미팅 취소해줘",
+        ],
+    }
     return manage_google_calendar
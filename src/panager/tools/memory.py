@@ -5,9 +5,12 @@ import logging
 from enum import Enum
 from typing import TYPE_CHECKING
 
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from pydantic import BaseModel, model_validator
 
+from panager.tools.context import get_user_id
+
 if TYPE_CHECKING:
     from langchain_core.tools import BaseTool
 
@@ -36,10 +39,11 @@ class MemoryToolInput(BaseModel):
         return self
 
 
-def make_manage_user_memory(user_id: int, memory_service: MemoryService) -> BaseTool:
+def make_manage_user_memory(memory_service: MemoryService) -> BaseTool:
     @tool(args_schema=MemoryToolInput)
     async def manage_user_memory(
         action: MemoryAction,
+        config: RunnableConfig,
         content: str | None = None,
         query: str | None = None,
         limit: int = 5,
@@ -48,7 +52,10 @@ def make_manage_user_memory(user_id: int, memory_service: MemoryService) -> Base
 
         - action='save': content에 내용을 입력하여 저장합니다.
         - action='search': query에 검색어를 입력하여 관련 메모리를 찾습니다.
+          현재 메시지와 관련된 메모리는 시스템 프롬프트에 이미 제공되므로,
+          다른 주제의 기억이 필요할 때만 검색하세요.
         """
+        user_id = get_user_id(config)
         if action == MemoryAction.SAVE:
             # MemoryToolInput validation ensures content is present for SAVE
             await memory_service.save_memory(user_id, content)  # type: ignore
@@ -69,17 +76,17 @@ def make_manage_user_memory(user_id: int, memory_service: MemoryService) -> Base
             )
         raise ValueError(f"지원하지 않는 액션입니다: {action}")
 
+    manage_user_memory.metadata = {
+        "domain": "memory",
+        "examples": [
+            "나 커피 안 마시는 거 기억해줘",
+            "내가 전에 뭐라고 했었지?",
+            "내가 좋아하는 음식 기억나?",
+        ],
+    }
     return manage_user_memory
 
 
-def make_memory_tools(
-    user_id: int = 0, memory_service: MemoryService | None = None
-) -> list[BaseTool]:
+def make_memory_tools(memory_service: MemoryService) -> list[BaseTool]:
     """Memory 관련 도구 목록을 반환합니다."""
-    if memory_service is None:
-        # 인덱싱용 프로토타입 생성 시 mock 서비스 사용
-        from unittest.mock import MagicMock
-
-        memory_service = MagicMock()
-
-    return [make_manage_user_memory(user_id, memory_service)]
+    return [make_manage_user_memory(memory_service)]
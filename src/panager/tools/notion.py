@@ -4,9 +4,12 @@ import json
 import logging
 from typing import TYPE_CHECKING, Any
 
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
+from panager.tools.context import get_user_id
+
 if TYPE_CHECKING:
     from langchain_core.tools import BaseTool
     from panager.services.notion import NotionService
@@ -33,14 +36,16 @@ class SearchNotionInput(BaseModel):
     )
 
 
-def make_notion_tools(user_id: int, notion_service: NotionService) -> list[BaseTool]:
+def make_notion_tools(notion_service: NotionService) -> list[BaseTool]:
     @tool(args_schema=SearchNotionInput)
     async def search_notion(
-        query: str | None = None, filter_type: str | None = None
+        config: RunnableConfig,
+        query: str | None = None,
+        filter_type: str | None = None,
     ) -> str:
         """Notion에서 데이터베이스나 페이지를 검색합니다. database_id를 찾을 때 유용합니다."""
         # ...
-        client = await notion_service.get_client(user_id)
+        client = await notion_service.get_client(get_user_id(config))
         # ...
         params: dict[str, Any] = {}
         if query:
@@ -71,10 +76,11 @@ def make_notion_tools(user_id: int, notion_service: NotionService) -> list[BaseT
     async def create_notion_page(
         database_id: str,
         properties: dict[str, Any],
+        config: RunnableConfig,
         children: list[dict[str, Any]] | None = None,
     ) -> str:
         """Notion 데이터베이스에 새로운 페이지를 생성합니다."""
-        client = await notion_service.get_client(user_id)
+        client = await notion_service.get_client(get_user_id(config))
         params: dict[str, Any] = {
             "parent": {"database_id": database_id},
             "properties": properties,
@@ -93,6 +99,12 @@ def make_notion_tools(user_id: int, notion_service: NotionService) -> list[BaseT
             ensure_ascii=False,
         )
 
-    search_notion.metadata = {"domain": "notion"}
-    create_notion_page.metadata = {"domain": "notion"}
+    search_notion.metadata = {
+        "domain": "notion",
+        "examples": ["노션에서 회의록 찾아줘", "노션 데이터베이스 뭐 있어?"],
+    }
+    create_notion_page.metadata = {
+        "domain": "notion",
+        "examples": ["노션에 독서 기록 남겨줘", "노션 페이지 새로 만들어줘"],
+    }
     return [search_notion, create_notion_page]
@@ -6,9 +6,12 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field, model_validator
 
+from panager.tools.context import get_user_id
+
 if TYPE_CHECKING:
     from langchain_core.tools import BaseTool
 
@@ -45,12 +48,11 @@ class ScheduleToolInput(BaseModel):
         return self
 
 
-def make_manage_dm_scheduler(
-    user_id: int, scheduler_service: SchedulerService
-) -> BaseTool:
+def make_manage_dm_scheduler(scheduler_service: SchedulerService) -> BaseTool:
     @tool(args_schema=ScheduleToolInput)
     async def manage_dm_scheduler(
         action: ScheduleAction,
+        config: RunnableConfig,
         command: str | None = None,
         trigger_at: str | None = None,
         schedule_id: str | None = None,
@@ -62,6 +64,7 @@ def make_manage_dm_scheduler(
         - action='create': command, trigger_at이 필수입니다. type은 'notification' 또는 'command'입니다.
         - action='cancel': schedule_id가 필수입니다.
         """
+        user_id = get_user_id(config)
         if action == ScheduleAction.CREATE:
             # ScheduleToolInput validation ensures command and trigger_at are present for CREATE
             trigger_dt = datetime.fromisoformat(trigger_at)  # type: ignore
@@ -95,17 +98,17 @@ def make_manage_dm_scheduler(
             )
         raise ValueError(f"지원하지 않는 액션입니다: {action}")
 
+    manage_dm_scheduler.metadata = {
+        "domain": "scheduler",
+        "examples": [
+            "30분 뒤에 알려줘",
+            "내일 아침 9시에 브리핑 보내줘",
+            "그 알림 취소해줘",
+        ],
+    }
     return manage_dm_scheduler
 
 
-def make_scheduler_tools(
-    user_id: int = 0, scheduler_service: SchedulerService | None = None
-) -> list[BaseTool]:
+def make_scheduler_tools(scheduler_service: SchedulerService) -> list[BaseTool]:
     """Scheduler 관련 도구 목록을 반환합니다."""
-    if scheduler_service is None:
-        # 인덱싱용 프로토타입 생성 시 mock 서비스 사용
-        from unittest.mock import MagicMock
-
-        scheduler_service = MagicMock()
-
-    return [make_manage_dm_scheduler(user_id, scheduler_service)]
+    return [make_manage_dm_scheduler(scheduler_service)]
@@ -9,6 +9,7 @@ from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
 from panager.agent.state import AgentState, PendingReflection, CommitInfo
 from panager.agent.agent import agent_node
+from panager.agent.prompt import PromptCacheStats
 
 
 @pytest.fixture
@@ -84,9 +85,9 @@ async def test_agent_node_handling_system_trigger(mock_settings, mock_session_pr
     with patch("panager.agent.agent.get_llm", return_value=mock_llm):
         await agent_node(state, mock_settings, mock_session_provider)
 
-    system_msg = next(m for m in captured_messages if isinstance(m, SystemMessage))
-    assert "시스템 자동 트리거" in system_msg.content
-    assert "자연스럽게 처리하세요" in system_msg.content
+    context_msg = captured_messages[-1]
+    assert "시스템 자동 트리거" in context_msg.content
+    assert "자연스럽게 처리하세요" in context_msg.content
 
 
 @pytest.mark.asyncio
@@ -127,9 +128,9 @@ async def test_agent_node_handling_pending_reflections(
     with patch("panager.agent.agent.get_llm", return_value=mock_llm):
         await agent_node(state, mock_settings, mock_session_provider)
 
-    system_msg = next(m for m in captured_messages if isinstance(m, SystemMessage))
-    assert "보류 중인 회고" in system_msg.content
-    assert "owner/repo" in system_msg.content
+    context_msg = captured_messages[-1]
+    assert "보류 중인 회고" in context_msg.content
+    assert "owner/repo" in context_msg.content
 
 
 @pytest.mark.asyncio
@@ -243,5 +244,68 @@ async def test_agent_node_with_task_summary(mock_settings, mock_session_provider
     assert any(
         "최근 도구 실행 요약: Previous work done" in m.content
         for m in captured_messages
-        if isinstance(m, SystemMessage)
+        if isinstance(m, HumanMessage)
     )
+
+
+@pytest.mark.asyncio
+async def test_agent_node_binds_precomputed_schemas(
+    mock_settings, mock_session_provider
+):
+    """discovered_tools의 이름으로 레지스트리의 미리 계산된 스키마를 바인딩합니다."""
+    schema = {"type": "function", "function": {"name": "found_tool"}}
+    registry = MagicMock()
+    registry.get_tool_schemas.return_value = [schema]
+
+    mock_llm = MagicMock()
+    bound_llm = MagicMock()
+    bound_llm.ainvoke = AsyncMock(return_value=AIMessage(content="완료"))
+    mock_llm.bind_tools.return_value = bound_llm
+
+    state = cast(
+        AgentState,
+        {
+            "user_id": 123,
+            "username": "testuser",
+            "messages": [HumanMessage(content="도구 찾아줘")],
+            "memory_context": "",
+            "timezone": "Asia/Seoul",
+            "discovered_tools": ["found_tool"],
+        },
+    )
+
+    with patch("panager.agent.agent.get_llm", return_value=mock_llm):
+        await agent_node(state, mock_settings, mock_session_provider, registry)
+
+    registry.get_tool_schemas.assert_called_once_with(["found_tool"])
+    assert mock_llm.bind_tools.call_args.args[0][0] is schema
+
+
+@pytest.mark.asyncio
+async def test_agent_node_uses_injected_llm_client(
+    mock_settings, mock_session_provider
+):
+    """공유 LLM 클라이언트가 주입되면 호출마다 새 클라이언트를 만들지 않음."""
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(return_value=AIMessage(content="안녕하세요"))
+    llm_client = MagicMock()
+    llm_client.chat = mock_llm
+    llm_client.cache_stats = PromptCacheStats()
+
+    state = cast(
+        AgentState,
+        {
+            "user_id": 123,
+            "messages": [HumanMessage(content="안녕")],
+            "timezone": "Asia/Seoul",
+        },
+    )
+
+    with patch("panager.agent.agent.get_llm") as mock_get_llm:
+        res = await agent_node(
+            state, mock_settings, mock_session_provider, llm_client=llm_client
+        )
+
+    mock_get_llm.assert_not_called()
+    mock_llm.ainvoke.assert_awaited_once()
+    assert res["messages"][0].content == "안녕하세요"
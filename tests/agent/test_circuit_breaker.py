@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from panager.agent.circuit_breaker import CircuitBreaker, CircuitState
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(
+        "google", failure_threshold=2, reset_seconds=10, clock=_Clock()
+    )
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == 10
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("google", failure_threshold=2, clock=_Clock())
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_half_open_allows_single_probe():
+    clock = _Clock()
+    breaker = CircuitBreaker(
+        "notion", failure_threshold=1, reset_seconds=5, clock=clock
+    )
+    breaker.record_failure()
+
+    clock.now = 5
+    assert breaker.allow()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens():
+    clock = _Clock()
+    breaker = CircuitBreaker(
+        "github", failure_threshold=3, reset_seconds=5, clock=clock
+    )
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 6
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow()
+
+
+def test_released_probe_allows_another_probe():
+    clock = _Clock()
+    breaker = CircuitBreaker(
+        "google", failure_threshold=1, reset_seconds=5, clock=clock
+    )
+    breaker.record_failure()
+
+    clock.now = 5
+    assert breaker.allow()
+    breaker.release()
+
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_is_upstream_failure_classifies_errors():
+    import httpx
+
+    from panager.agent.circuit_breaker import is_upstream_failure
+
+    request = httpx.Request("GET", "https://api.github.com")
+
+    def status_error(code: int) -> httpx.HTTPStatusError:
+        response = httpx.Response(code, request=request)
+        return httpx.HTTPStatusError("err", request=request, response=response)
+
+    class _NotionError(Exception):
+        status = 503
+
+    assert is_upstream_failure(TimeoutError())
+    assert is_upstream_failure(httpx.ConnectError("refused", request=request))
+    assert is_upstream_failure(status_error(502))
+    assert is_upstream_failure(_NotionError())
+    assert not is_upstream_failure(status_error(404))
+    assert not is_upstream_failure(ValueError("bad args"))
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
+from langgraph.constants import TAG_NOSTREAM
+from langgraph.graph.message import add_messages
+
+from panager.agent.compaction import (
+    BackgroundCompactor,
+    compaction_node,
+    select_messages_to_fold,
+)
+
+
+def _fixed_tokens(value):
+    """테스트용 토크나이저: 문자 수 = 토큰 수."""
+    return len(value) if isinstance(value, str) else len(str(value))
+
+
+@pytest.fixture(autouse=True)
+def _char_tokenizer():
+    with patch("panager.agent.utils.count_tokens", side_effect=_fixed_tokens):
+        yield
+
+
+@pytest.fixture
+def settings():
+    s = MagicMock()
+    s.compaction_trigger_tokens = 100
+    s.compaction_keep_tokens = 40
+    s.compaction_max_input_tokens = 1000
+    return s
+
+
+def _history(turns: int) -> list:
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"질문{i}" + "x" * 10, id=f"h{i}"))
+        messages.append(AIMessage(content=f"답변{i}" + "y" * 10, id=f"a{i}"))
+    return messages
+
+
+async def _drain() -> None:
+    """백그라운드 요약 작업과 완료 콜백이 실행되도록 이벤트 루프를 양보."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def _llm_client(summary: str = "- 요약") -> MagicMock:
+    client = MagicMock()
+    client.chat.ainvoke = AsyncMock(return_value=AIMessage(content=summary))
+    return client
+
+
+def test_select_messages_keeps_recent_turn():
+    messages = _history(5)  # 메시지당 20 토큰
+
+    fold = select_messages_to_fold(messages, keep_tokens=40, max_input_tokens=1000)
+
+    assert [m.id for m in fold] == ["h0", "a0", "h1", "a1", "h2", "a2", "h3", "a3"]
+
+
+def test_select_messages_respects_max_input():
+    messages = _history(5)
+
+    fold = select_messages_to_fold(messages, keep_tokens=40, max_input_tokens=45)
+
+    assert [m.id for m in fold] == ["h0", "a0"]
+
+
+def test_select_messages_keeps_oversized_last_turn():
+    messages = _history(2) + [
+        ToolMessage(content="z" * 200, tool_call_id="1", id="t"),
+    ]
+
+    fold = select_messages_to_fold(messages, keep_tokens=40, max_input_tokens=1000)
+
+    assert [m.id for m in fold] == ["h0", "a0"]
+
+
+@pytest.mark.asyncio
+async def test_compaction_skips_below_threshold(settings):
+    client = _llm_client()
+
+    result = await compaction_node(
+        {"user_id": 1, "messages": _history(2)}, settings, llm_client=client
+    )
+
+    assert result == {}
+    client.chat.ainvoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_compaction_folds_old_messages(settings):
+    messages = _history(5)
+    client = _llm_client("- 사용자는 회의 일정을 물었음")
+    state = {"user_id": 1, "messages": messages, "conversation_summary": "- 이전"}
+
+    result = await compaction_node(state, settings, llm_client=client)
+
+    assert result["conversation_summary"] == "- 사용자는 회의 일정을 물었음"
+    assert all(isinstance(m, RemoveMessage) for m in result["messages"])
+
+    remaining = add_messages(messages, result["messages"])
+    assert [m.id for m in remaining] == ["h4", "a4"]
+
+    args, kwargs = client.chat.ainvoke.call_args
+    prompt = args[0][1].content
+    assert "- 이전" in prompt and "질문0" in prompt and "질문4" not in prompt
+    assert TAG_NOSTREAM in kwargs["config"]["tags"]
+
+
+@pytest.mark.asyncio
+async def test_compaction_keeps_history_on_llm_failure(settings):
+    client = MagicMock()
+    client.chat.ainvoke = AsyncMock(side_effect=RuntimeError("boom"))
+
+    result = await compaction_node(
+        {"user_id": 1, "messages": _history(5)}, settings, llm_client=client
+    )
+
+    assert result == {}
+
+
+@pytest.mark.asyncio
+async def test_background_compaction_applies_on_next_turn(settings):
+    messages = _history(5)
+    client = _llm_client("- 요약")
+    compactor = BackgroundCompactor(settings, client)
+    state = {"user_id": 1, "messages": messages}
+
+    # 첫 호출은 요약을 기다리지 않고 백그라운드로 준비만 시작
+    assert await compaction_node(state, settings, client, compactor) == {}
+    await _drain()
+    client.chat.ainvoke.assert_awaited_once()
+
+    result = await compaction_node(state, settings, client, compactor)
+
+    assert result["conversation_summary"] == "- 요약"
+    remaining = add_messages(messages, result["messages"])
+    assert [m.id for m in remaining] == ["h4", "a4"]
+
+
+@pytest.mark.asyncio
+async def test_background_compaction_drops_stale_summary(settings):
+    messages = _history(5)
+    client = _llm_client()
+    compactor = BackgroundCompactor(settings, client)
+
+    await compaction_node(
+        {"user_id": 1, "messages": messages}, settings, client, compactor
+    )
+    await _drain()
+
+    # 그사이 다른 경로로 요약이 바뀌었으면 준비된 결과를 버리고 다시 준비
+    changed = {
+        "user_id": 1,
+        "messages": messages,
+        "conversation_summary": "- 다른 요약",
+    }
+    assert await compaction_node(changed, settings, client, compactor) == {}
+    await _drain()
+    assert client.chat.ainvoke.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_background_compaction_failure_is_retried(settings, caplog):
+    client = MagicMock()
+    client.chat.ainvoke = AsyncMock(
+        side_effect=[RuntimeError("boom"), AIMessage(content="- 요약")]
+    )
+    compactor = BackgroundCompactor(settings, client)
+    state = {"user_id": 1, "messages": _history(5)}
+
+    assert await compaction_node(state, settings, client, compactor) == {}
+    await _drain()
+    assert "대화 요약 실패" in caplog.text
+
+    assert await compaction_node(state, settings, client, compactor) == {}
+    await _drain()
+    result = await compaction_node(state, settings, client, compactor)
+    assert result["conversation_summary"] == "- 요약"
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from panager.agent.concurrency import UserConcurrencyLimiter
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_per_user_and_releases():
+    limiter = UserConcurrencyLimiter(2)
+    running = {1: 0, 2: 0}
+    peak = {1: 0, 2: 0}
+
+    async def work(user_id: int) -> None:
+        async with limiter.slot(user_id):
+            running[user_id] += 1
+            peak[user_id] = max(peak[user_id], running[user_id])
+            await asyncio.sleep(0.01)
+            running[user_id] -= 1
+
+    await asyncio.gather(*(work(1) for _ in range(5)), *(work(2) for _ in range(2)))
+
+    assert peak == {1: 2, 2: 2}
+    assert limiter.active_users() == 0
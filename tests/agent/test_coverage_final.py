@@ -8,22 +8,25 @@ from panager.agent.workflow import build_graph, START, END
 from langgraph.checkpoint.memory import MemorySaver
 
 
-@pytest.mark.asyncio
-async def test_registry_get_tools_combinations():
-    """get_tools_for_user의 모든 서비스 조합을 호출하여 커버리지 확보."""
-    registry = ToolRegistry(MagicMock(), MagicMock())
-    user_id = 1
+def test_registry_register_service_tools_combinations():
+    """register_service_tools의 모든 서비스 조합을 호출하여 커버리지 확보."""
+    registry = ToolRegistry(MagicMock(), MagicMock(), MagicMock())
 
     # 모든 서비스가 None일 때
-    tools = await registry.get_tools_for_user(user_id)
+    tools = registry.register_service_tools()
     assert len(tools) == 0
 
     # 개별 서비스 하나씩 주입
-    await registry.get_tools_for_user(user_id, google_service=MagicMock())
-    await registry.get_tools_for_user(user_id, github_service=MagicMock())
-    await registry.get_tools_for_user(user_id, notion_service=MagicMock())
-    await registry.get_tools_for_user(user_id, memory_service=MagicMock())
-    await registry.get_tools_for_user(user_id, scheduler_service=MagicMock())
+    registry.register_service_tools(google_service=MagicMock())
+    registry.register_service_tools(github_service=MagicMock())
+    registry.register_service_tools(notion_service=MagicMock())
+    registry.register_service_tools(memory_service=MagicMock())
+    registry.register_service_tools(scheduler_service=MagicMock())
+
+    # 등록된 도구는 이름으로 바로 조회 가능
+    assert registry.get_tool("manage_user_memory") is not None
+    assert registry.get_tool("manage_dm_scheduler") is not None
+    assert len(registry.get_all_tools()) == 8
 
 
 def test_workflow_internal_routers():
@@ -61,7 +64,7 @@ def test_workflow_internal_routers():
 @pytest.mark.asyncio
 async def test_registry_sync_to_db_calls_internal():
     """sync_to_db가 내부 sync_tools_by_prototypes를 호출하는지 검증."""
-    registry = ToolRegistry(MagicMock(), MagicMock())
+    registry = ToolRegistry(MagicMock(), MagicMock(), MagicMock())
     registry.sync_tools_by_prototypes = AsyncMock()
 
     await registry.sync_to_db()
@@ -3,6 +3,7 @@ import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from panager.tools.github import make_github_tools
+from panager.tools.context import tool_config
 
 
 @pytest.fixture
@@ -39,10 +40,10 @@ async def test_list_github_repositories_success(
     mock_response.raise_for_status = MagicMock()
     mock_github_client.get.return_value = mock_response
 
-    tools = make_github_tools(user_id, mock_github_service)
+    tools = make_github_tools(mock_github_service)
     list_repos = next(t for t in tools if t.name == "list_github_repositories")
 
-    result_str = await list_repos.ainvoke({})
+    result_str = await list_repos.ainvoke({}, config=tool_config(user_id))
     result = json.loads(result_str)
 
     assert result["status"] == "success"
@@ -55,11 +56,11 @@ async def test_list_github_repositories_error(mock_github_service, mock_github_c
     user_id = 123
     mock_github_client.get.side_effect = Exception("GitHub API error")
 
-    tools = make_github_tools(user_id, mock_github_service)
+    tools = make_github_tools(mock_github_service)
     list_repos = next(t for t in tools if t.name == "list_github_repositories")
 
     with pytest.raises(Exception, match="GitHub API error"):
-        await list_repos.ainvoke({})
+        await list_repos.ainvoke({}, config=tool_config(user_id))
 
 
 @pytest.mark.asyncio
@@ -69,11 +70,12 @@ async def test_setup_github_webhook_success(mock_github_service, mock_github_cli
     mock_response.status_code = 201
     mock_github_client.post.return_value = mock_response
 
-    tools = make_github_tools(user_id, mock_github_service)
+    tools = make_github_tools(mock_github_service)
     setup_webhook = next(t for t in tools if t.name == "setup_github_webhook")
 
     result_str = await setup_webhook.ainvoke(
-        {"repo_full_name": "owner/repo1", "webhook_url": "https://example.com/webhook"}
+        {"repo_full_name": "owner/repo1", "webhook_url": "https://example.com/webhook"},
+        config=tool_config(user_id),
     )
     result = json.loads(result_str)
 
@@ -90,11 +92,12 @@ async def test_setup_github_webhook_error(mock_github_service, mock_github_clien
     mock_response.text = "Bad Request"
     mock_github_client.post.return_value = mock_response
 
-    tools = make_github_tools(user_id, mock_github_service)
+    tools = make_github_tools(mock_github_service)
     setup_webhook = next(t for t in tools if t.name == "setup_github_webhook")
 
     result_str = await setup_webhook.ainvoke(
-        {"repo_full_name": "owner/repo1", "webhook_url": "https://example.com/webhook"}
+        {"repo_full_name": "owner/repo1", "webhook_url": "https://example.com/webhook"},
+        config=tool_config(user_id),
     )
     result = json.loads(result_str)
 
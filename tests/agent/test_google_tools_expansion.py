@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 from pydantic import ValidationError
 
+from panager.tools.context import tool_config
 from panager.tools.google import (
     CalendarAction,
     TaskAction,
@@ -32,8 +33,10 @@ async def test_manage_google_tasks_pagination(mock_google_service):
     ]
     mock_google_service.get_tasks_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_tasks(user_id, mock_google_service)
-    result = json.loads(await tool.ainvoke({"action": TaskAction.LIST}))
+    tool = make_manage_google_tasks(mock_google_service)
+    result = json.loads(
+        await tool.ainvoke({"action": TaskAction.LIST}, config=tool_config(user_id))
+    )
 
     assert len(result["tasks"]) == 2
     assert mock_tasks.list.call_count == 2
@@ -45,17 +48,20 @@ async def test_manage_google_tasks_pagination(mock_google_service):
 async def test_manage_google_tasks_validation():
     user_id = 123
     mock_service = MagicMock()
-    tool = make_manage_google_tasks(user_id, mock_service)
+    tool = make_manage_google_tasks(mock_service)
 
     with pytest.raises(ValidationError):
         # action='create' requires 'title'
-        await tool.ainvoke({"action": TaskAction.CREATE})
+        await tool.ainvoke({"action": TaskAction.CREATE}, config=tool_config(user_id))
     with pytest.raises(ValidationError):
         # action='update_status' requires 'task_id'
-        await tool.ainvoke({"action": TaskAction.UPDATE_STATUS, "status": "completed"})
+        await tool.ainvoke(
+            {"action": TaskAction.UPDATE_STATUS, "status": "completed"},
+            config=tool_config(user_id),
+        )
     with pytest.raises(ValidationError):
         # action='delete' requires 'task_id'
-        await tool.ainvoke({"action": TaskAction.DELETE})
+        await tool.ainvoke({"action": TaskAction.DELETE}, config=tool_config(user_id))
 
 
 @pytest.mark.asyncio
@@ -75,8 +81,10 @@ async def test_manage_google_calendar_pagination_and_multi_cal(mock_google_servi
     ]
     mock_google_service.get_calendar_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_calendar(user_id, mock_google_service)
-    result = json.loads(await tool.ainvoke({"action": CalendarAction.LIST}))
+    tool = make_manage_google_calendar(mock_google_service)
+    result = json.loads(
+        await tool.ainvoke({"action": CalendarAction.LIST}, config=tool_config(user_id))
+    )
 
     assert len(result["events"]) == 3
     assert mock_events.list.call_count == 3
@@ -86,26 +94,31 @@ async def test_manage_google_calendar_pagination_and_multi_cal(mock_google_servi
 async def test_manage_google_calendar_validation():
     user_id = 123
     mock_service = MagicMock()
-    tool = make_manage_google_calendar(user_id, mock_service)
+    tool = make_manage_google_calendar(mock_service)
 
     with pytest.raises(ValidationError):
         # action='create' misses title
         await tool.ainvoke(
-            {"action": CalendarAction.CREATE, "start_at": "S", "end_at": "E"}
+            {"action": CalendarAction.CREATE, "start_at": "S", "end_at": "E"},
+            config=tool_config(user_id),
         )
     with pytest.raises(ValidationError):
         # action='create' misses start_at
         await tool.ainvoke(
-            {"action": CalendarAction.CREATE, "title": "T", "end_at": "E"}
+            {"action": CalendarAction.CREATE, "title": "T", "end_at": "E"},
+            config=tool_config(user_id),
         )
     with pytest.raises(ValidationError):
         # action='create' misses end_at
         await tool.ainvoke(
-            {"action": CalendarAction.CREATE, "title": "T", "start_at": "S"}
+            {"action": CalendarAction.CREATE, "title": "T", "start_at": "S"},
+            config=tool_config(user_id),
         )
     with pytest.raises(ValidationError):
         # action='delete' requires event_id
-        await tool.ainvoke({"action": CalendarAction.DELETE})
+        await tool.ainvoke(
+            {"action": CalendarAction.DELETE}, config=tool_config(user_id)
+        )
 
 
 @pytest.mark.asyncio
@@ -116,7 +129,7 @@ async def test_manage_google_calendar_create(mock_google_service):
     mock_events.insert.return_value.execute.return_value = {"id": "e_new"}
     mock_google_service.get_calendar_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_calendar(user_id, mock_google_service)
+    tool = make_manage_google_calendar(mock_google_service)
     result = json.loads(
         await tool.ainvoke(
             {
@@ -124,7 +137,8 @@ async def test_manage_google_calendar_create(mock_google_service):
                 "title": "New Event",
                 "start_at": "2026-02-27T09:00:00Z",
                 "end_at": "2026-02-27T10:00:00Z",
-            }
+            },
+            config=tool_config(user_id),
         )
     )
 
@@ -140,9 +154,12 @@ async def test_manage_google_calendar_delete(mock_google_service):
     mock_events.delete.return_value.execute.return_value = {}
     mock_google_service.get_calendar_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_calendar(user_id, mock_google_service)
+    tool = make_manage_google_calendar(mock_google_service)
     result = json.loads(
-        await tool.ainvoke({"action": CalendarAction.DELETE, "event_id": "e1"})
+        await tool.ainvoke(
+            {"action": CalendarAction.DELETE, "event_id": "e1"},
+            config=tool_config(user_id),
+        )
     )
 
     assert result["status"] == "success"
@@ -157,9 +174,12 @@ async def test_manage_google_tasks_create(mock_google_service):
     mock_tasks.insert.return_value.execute.return_value = {"id": "t_new"}
     mock_google_service.get_tasks_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_tasks(user_id, mock_google_service)
+    tool = make_manage_google_tasks(mock_google_service)
     result = json.loads(
-        await tool.ainvoke({"action": TaskAction.CREATE, "title": "New Task"})
+        await tool.ainvoke(
+            {"action": TaskAction.CREATE, "title": "New Task"},
+            config=tool_config(user_id),
+        )
     )
     assert result["status"] == "success"
     assert result["task"]["id"] == "t_new"
@@ -176,10 +196,15 @@ async def test_manage_google_tasks_update_status(mock_google_service):
     }
     mock_google_service.get_tasks_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_tasks(user_id, mock_google_service)
+    tool = make_manage_google_tasks(mock_google_service)
     result = json.loads(
         await tool.ainvoke(
-            {"action": TaskAction.UPDATE_STATUS, "task_id": "t1", "status": "completed"}
+            {
+                "action": TaskAction.UPDATE_STATUS,
+                "task_id": "t1",
+                "status": "completed",
+            },
+            config=tool_config(user_id),
         )
     )
     assert result["status"] == "success"
@@ -194,9 +219,11 @@ async def test_manage_google_tasks_delete(mock_google_service):
     mock_tasks.delete.return_value.execute.return_value = {}
     mock_google_service.get_tasks_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_tasks(user_id, mock_google_service)
+    tool = make_manage_google_tasks(mock_google_service)
     result = json.loads(
-        await tool.ainvoke({"action": TaskAction.DELETE, "task_id": "t1"})
+        await tool.ainvoke(
+            {"action": TaskAction.DELETE, "task_id": "t1"}, config=tool_config(user_id)
+        )
     )
     assert result["status"] == "success"
     assert result["task_id"] == "t1"
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from panager.agent.llm import LLMClient, build_http_client
+
+
+@pytest.fixture
+def settings():
+    settings = MagicMock()
+    settings.llm_model = "test-model"
+    settings.llm_base_url = "http://llm.test/v1/"
+    settings.llm_api_key = "test-key"
+    settings.llm_http2 = True
+    settings.llm_timeout_seconds = 30.0
+    settings.llm_connect_timeout_seconds = 3.0
+    settings.llm_max_connections = 7
+    settings.llm_max_keepalive_connections = 5
+    settings.llm_keepalive_seconds = 60.0
+    settings.llm_stream_usage = True
+    return settings
+
+
+@pytest.mark.asyncio
+async def test_build_http_client_applies_timeouts_and_limits(settings):
+    client = build_http_client(settings)
+    try:
+        assert client.timeout.read == 30.0
+        assert client.timeout.connect == 3.0
+        pool = client._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 5
+        assert pool._keepalive_expiry == 60.0
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_build_http_client_falls_back_without_h2(settings):
+    with (
+        patch("panager.agent.llm.http2_available", return_value=False),
+        patch("panager.agent.llm.httpx.AsyncClient") as mock_client_cls,
+    ):
+        build_http_client(settings)
+    assert mock_client_cls.call_args.kwargs["http2"] is False
+
+
+@pytest.mark.asyncio
+async def test_llm_client_shares_http_client(settings):
+    llm_client = LLMClient(settings)
+    try:
+        assert llm_client.chat.http_async_client is llm_client.http_client
+        # 도구 바인딩은 새 Runnable을 만들 뿐 공유 인스턴스를 바꾸지 않음
+        llm_client.chat.bind_tools([])
+        assert llm_client.chat.http_async_client is llm_client.http_client
+    finally:
+        await llm_client.aclose()
+    assert llm_client.http_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_warm_up_uses_shared_client(settings):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"data": []})
+
+    llm_client = LLMClient(settings)
+    llm_client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    await llm_client.warm_up()
+
+    assert str(requests[0].url) == "http://llm.test/v1/models"
+    assert requests[0].headers["Authorization"] == "Bearer test-key"
+
+
+@pytest.mark.asyncio
+async def test_warm_up_raises_on_server_error(settings):
+    llm_client = LLMClient(settings)
+    llm_client.http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(503))
+    )
+
+    with pytest.raises(RuntimeError):
+        await llm_client.warm_up()
+
+
+@pytest.mark.asyncio
+async def test_benchmark_measure_reports_ttft():
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage
+
+    from panager.agent.llm_benchmark import measure
+
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="네")] * 3))
+    report = await measure("shared", lambda: model, calls=3, gap=0, prompt="hi")
+
+    assert report.mode == "shared"
+    assert report.calls == 3
+    assert report.first_ms >= 0
+    assert report.median_ms <= report.p95_ms
@@ -1,9 +1,10 @@
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from panager.agent.registry import ToolRegistry
 from panager.core.config import Settings
 from langchain_core.tools import tool
-from panager.agent.state import DiscoveredTool
 
 
 @pytest.fixture
@@ -16,12 +17,18 @@ def mock_pool():
 @pytest.fixture
 def settings():
     settings = MagicMock(spec=Settings)
+    settings.tool_search_limit = 5
+    settings.tool_search_rrf_k = 60
     return settings
 
 
 @pytest.mark.asyncio
 async def test_tool_registry_indexing_and_searching(mock_pool, settings):
-    registry = ToolRegistry(mock_pool, settings)
+    embedding = MagicMock()
+    embedding.model_name = "test-model"
+    embedding.embed = AsyncMock(return_value=[0.1] * 768)
+    embedding.embed_many = AsyncMock(return_value=[[0.1] * 768])
+    registry = ToolRegistry(mock_pool, settings, embedding)
 
     @tool
     def my_test_tool(arg1: str):
@@ -33,23 +40,22 @@ async def test_tool_registry_indexing_and_searching(mock_pool, settings):
 
     registry.register_tools([my_test_tool])
 
-    # Mock embedding generation
-    with MagicMock() as mock_model:
-        mock_model.encode.return_value = [0.1] * 768
-        registry._model = mock_model
-
-        # Mock DB response for search
-        conn = mock_pool.acquire.return_value.__aenter__.return_value
-        conn.fetch.return_value = [{"name": "my_test_tool"}]
+    # Mock DB response for search
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    conn.transaction = MagicMock()
+    conn.fetch.side_effect = [
+        [],
+        [{"name": "my_test_tool", "embedding": [0.1] * 768}],
+    ]
 
-        # Test sync (check if SQL is executed)
-        await registry.sync_to_db()
-        assert conn.execute.called
+    # Test sync (check if SQL is executed)
+    await registry.sync_to_db()
+    assert conn.executemany.called
 
-        # Test search
-        results = await registry.search_tools("testing tool")
-        assert len(results) == 1
-        assert results[0].name == "my_test_tool"
+    # Test search
+    results = await registry.search_tools("testing tool")
+    assert len(results) == 1
+    assert results[0].name == "my_test_tool"
 
 
 @pytest.mark.asyncio
@@ -57,26 +63,18 @@ async def test_discovery_node_updates_state(mock_pool, settings):
     from panager.agent.workflow import discovery_node
     from langchain_core.messages import HumanMessage
 
-    registry = MagicMock(spec=ToolRegistry)
-
-    @tool
-    def found_tool():
-        """Found tool description."""
-        pass
-
-    found_tool.metadata = {"domain": "test"}
+    from panager.agent.retrieval import ToolMatch
 
-    registry.search_tools = AsyncMock(return_value=[found_tool])
+    registry = MagicMock(spec=ToolRegistry)
+    registry.select_tools = AsyncMock(
+        return_value=[ToolMatch("found_tool", "test", 0.8, 1.0, 0.03)]
+    )
 
     state = {"messages": [HumanMessage(content="find my tool")]}
 
     result = await discovery_node(state, registry)
 
-    assert "discovered_tools" in result
-    tool_info = result["discovered_tools"][0]
-    assert isinstance(tool_info, DiscoveredTool)
-    assert tool_info.function.name == "found_tool"
-    assert tool_info.domain == "test"
+    assert result == {"discovered_tools": ["found_tool"]}
 
 
 @pytest.mark.asyncio
@@ -94,7 +92,7 @@ async def test_tool_executor_handles_auth_interrupt(mock_pool, settings):
     mock_tool.metadata = {"domain": "google"}
     mock_tool.ainvoke.side_effect = GoogleAuthRequired()
 
-    registry.get_tools_for_user = AsyncMock(return_value=[mock_tool])
+    registry.get_tool.return_value = mock_tool
 
     state = {
         "user_id": 123,
@@ -110,5 +108,372 @@ async def test_tool_executor_handles_auth_interrupt(mock_pool, settings):
     )
 
     assert result["auth_request_url"] == "http://google-auth"
+    # 공유 도구 인스턴스에는 호출 config로 user_id가 전달됨
+    assert (
+        mock_tool.ainvoke.call_args.kwargs["config"]["configurable"]["user_id"] == 123
+    )
     assert result["messages"][0].tool_call_id == "1"
     assert "보안 인증이 필요합니다" in result["messages"][0].content
+
+
+@pytest.mark.asyncio
+async def test_discovery_node_passes_connected_providers():
+    from panager.agent.workflow import discovery_node
+    from langchain_core.messages import HumanMessage
+
+    registry = MagicMock(spec=ToolRegistry)
+    registry.select_tools = AsyncMock(return_value=[])
+    integration_service = MagicMock()
+    integration_service.connected_providers = AsyncMock(
+        return_value=frozenset({"google"})
+    )
+
+    state = {"user_id": 42, "messages": [HumanMessage(content="일정 보여줘")]}
+    await discovery_node(state, registry, integration_service)
+
+    integration_service.connected_providers.assert_awaited_once_with(42)
+    registry.select_tools.assert_awaited_once_with(
+        "일정 보여줘", connected=frozenset({"google"})
+    )
+
+
+@pytest.mark.asyncio
+async def test_memory_recall_node_ignores_search_failure():
+    from langchain_core.messages import HumanMessage
+
+    from panager.agent.workflow import memory_recall_node
+
+    memory_service = MagicMock()
+    memory_service.search_memories = AsyncMock(side_effect=RuntimeError("db down"))
+    settings = MagicMock(memory_context_limit=5)
+    state = {"user_id": 1, "messages": [HumanMessage(content="내 취향 기억나?")]}
+
+    result = await memory_recall_node(state, memory_service, settings)
+
+    assert result == {"memory_context": ""}
+
+
+@pytest.mark.asyncio
+async def test_user_context_node_skips_known_timezone():
+    from panager.agent.workflow import user_context_node
+
+    session_provider = MagicMock()
+    session_provider.get_user_timezone = AsyncMock(return_value="UTC")
+
+    assert (
+        await user_context_node(
+            {"user_id": 1, "timezone": "Asia/Seoul"}, session_provider
+        )
+        == {}
+    )
+    assert await user_context_node({"user_id": 1}, session_provider) == {
+        "timezone": "UTC"
+    }
+
+
+def _slow_tool(name: str, delay: float, result=None, exc=None):
+    tool = MagicMock()
+    tool.name = name
+
+    async def ainvoke(args, config=None):
+        await asyncio.sleep(delay)
+        if exc is not None:
+            raise exc
+        return result
+
+    tool.ainvoke = AsyncMock(side_effect=ainvoke)
+    return tool
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_runs_calls_concurrently_in_order():
+    import time
+
+    from langchain_core.messages import AIMessage
+
+    from panager.agent.concurrency import UserConcurrencyLimiter
+    from panager.agent.workflow import tool_executor_node
+
+    tools = {
+        "calendar": _slow_tool("calendar", 0.2, "events"),
+        "tasks": _slow_tool("tasks", 0.1, "tasks"),
+        "notion": _slow_tool("notion", 0.15, "pages"),
+    }
+    registry = MagicMock(spec=ToolRegistry)
+    registry.get_tool.side_effect = tools.get
+    state = {
+        "user_id": 1,
+        "messages": [
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": name, "args": {}, "id": str(i)}
+                    for i, name in enumerate(tools)
+                ],
+            )
+        ],
+    }
+
+    started = time.perf_counter()
+    result = await tool_executor_node(
+        state,
+        registry,
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        limiter=UserConcurrencyLimiter(3),
+    )
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35
+    assert [m.tool_call_id for m in result["messages"]] == ["0", "1", "2"]
+    assert [m.content for m in result["messages"]] == ["events", "tasks", "pages"]
+    assert result["auth_request_url"] is None
+
+
+def _tool_calls_state(names) -> dict:
+    from langchain_core.messages import AIMessage
+
+    return {
+        "user_id": 1,
+        "messages": [
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": name, "args": {}, "id": str(i)}
+                    for i, name in enumerate(names)
+                ],
+            )
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_auth_keeps_in_flight_side_effects():
+    """인증 예외가 나도 실행 중인 쓰기 호출은 끝까지 기다려 실제 결과를 반환하는지 검증."""
+    from panager.agent.workflow import tool_executor_node
+    from panager.core.exceptions import NotionAuthRequired
+
+    created = []
+
+    async def create_event(args, config=None):
+        await asyncio.sleep(0.05)
+        created.append("event")
+        return "created"
+
+    calendar = MagicMock()
+    calendar.ainvoke = AsyncMock(side_effect=create_event)
+    tools = {
+        "calendar_create": calendar,
+        "notion": _slow_tool("notion", 0.0, exc=NotionAuthRequired()),
+    }
+    registry = MagicMock(spec=ToolRegistry)
+    registry.get_tool.side_effect = tools.get
+    notion_service = MagicMock()
+    notion_service.get_auth_url.return_value = "http://notion-auth"
+
+    result = await tool_executor_node(
+        _tool_calls_state(tools), registry, MagicMock(), MagicMock(), notion_service
+    )
+
+    assert created == ["event"]
+    assert result["auth_request_url"] == "http://notion-auth"
+    contents = [m.content for m in result["messages"]]
+    assert contents[0] == "created"
+    assert "보안 인증이 필요합니다" in contents[1]
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_auth_skips_calls_not_started():
+    """limiter 슬롯을 기다리던 호출은 인증 예외 후 실행하지 않는지 검증."""
+    from panager.agent.concurrency import UserConcurrencyLimiter
+    from panager.agent.workflow import tool_executor_node
+    from panager.core.exceptions import NotionAuthRequired
+
+    tools = {
+        "notion": _slow_tool("notion", 0.0, exc=NotionAuthRequired()),
+        "calendar": _slow_tool("calendar", 0.0, "events"),
+    }
+    registry = MagicMock(spec=ToolRegistry)
+    registry.get_tool.side_effect = tools.get
+
+    result = await tool_executor_node(
+        _tool_calls_state(tools),
+        registry,
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        limiter=UserConcurrencyLimiter(1),
+    )
+
+    tools["calendar"].ainvoke.assert_not_called()
+    contents = [m.content for m in result["messages"]]
+    assert "보안 인증이 필요합니다" in contents[0]
+    assert "실행하지 않았습니다" in contents[1]
+    assert [m.tool_call_id for m in result["messages"]] == ["0", "1"]
+
+
+def _single_call_state(name: str) -> dict:
+    from langchain_core.messages import AIMessage
+
+    return {
+        "user_id": 1,
+        "messages": [
+            AIMessage(content="", tool_calls=[{"name": name, "args": {}, "id": "1"}])
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_times_out_slow_tool():
+    import json
+
+    from panager.agent.circuit_breaker import CircuitBreaker
+    from panager.agent.workflow import tool_executor_node
+
+    slow = _slow_tool("calendar", 5.0, "events")
+    slow.metadata = {"domain": "google"}
+    registry = MagicMock(spec=ToolRegistry)
+    registry.get_tool.return_value = slow
+    settings = MagicMock(tool_timeout_seconds=0.05, tool_domain_timeouts={})
+    breakers = {"google": CircuitBreaker("google", failure_threshold=1)}
+
+    result = await asyncio.wait_for(
+        tool_executor_node(
+            _single_call_state("calendar"),
+            registry,
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            settings=settings,
+            breakers=breakers,
+        ),
+        timeout=1,
+    )
+
+    message = result["messages"][0]
+    assert message.status == "error"
+    payload = json.loads(message.content)
+    assert payload["error"] == "timeout"
+    assert payload["timeout_seconds"] == 0.05
+    assert not breakers["google"].allow()
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_skips_tool_when_circuit_open():
+    import json
+
+    from panager.agent.circuit_breaker import CircuitBreaker
+    from panager.agent.workflow import tool_executor_node
+
+    tool = _slow_tool("notion_search", 0.0, "pages")
+    tool.metadata = {"domain": "notion"}
+    registry = MagicMock(spec=ToolRegistry)
+    registry.get_tool.return_value = tool
+    breaker = CircuitBreaker("notion", failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+
+    result = await tool_executor_node(
+        _single_call_state("notion_search"),
+        registry,
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        breakers={"notion": breaker},
+    )
+
+    payload = json.loads(result["messages"][0].content)
+    assert payload["error"] == "service_unavailable"
+    assert payload["domain"] == "notion"
+    tool.ainvoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_auth_error_does_not_trip_circuit():
+    from panager.agent.circuit_breaker import CircuitBreaker, CircuitState
+    from panager.agent.workflow import tool_executor_node
+    from panager.core.exceptions import GoogleAuthRequired
+
+    tool = _slow_tool("calendar", 0.0, exc=GoogleAuthRequired())
+    tool.metadata = {"domain": "google"}
+    registry = MagicMock(spec=ToolRegistry)
+    registry.get_tool.return_value = tool
+    google_service = MagicMock()
+    google_service.get_auth_url.return_value = "http://google-auth"
+    breaker = CircuitBreaker("google", failure_threshold=1)
+
+    result = await tool_executor_node(
+        _single_call_state("calendar"),
+        registry,
+        google_service,
+        MagicMock(),
+        MagicMock(),
+        breakers={"google": breaker},
+    )
+
+    assert result["auth_request_url"] == "http://google-auth"
+    assert breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_user_error_does_not_trip_circuit():
+    """4xx 등 사용자별 오류는 공유 브레이커에 반영하지 않고 오류 메시지로 반환."""
+    import json
+
+    import httpx
+
+    from panager.agent.circuit_breaker import CircuitBreaker, CircuitState
+    from panager.agent.workflow import tool_executor_node
+
+    request = httpx.Request("GET", "https://api.github.com/repos/x")
+    not_found = httpx.HTTPStatusError(
+        "not found", request=request, response=httpx.Response(404, request=request)
+    )
+    tool = _slow_tool("github_repo", 0.0, exc=not_found)
+    tool.metadata = {"domain": "github"}
+    registry = MagicMock(spec=ToolRegistry)
+    registry.get_tool.return_value = tool
+    breaker = CircuitBreaker("github", failure_threshold=1)
+
+    result = await tool_executor_node(
+        _single_call_state("github_repo"),
+        registry,
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        breakers={"github": breaker},
+    )
+
+    payload = json.loads(result["messages"][0].content)
+    assert payload["error"] == "tool_error"
+    assert result["messages"][0].status == "error"
+    assert breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_server_error_trips_circuit():
+    import json
+
+    from panager.agent.circuit_breaker import CircuitBreaker, CircuitState
+    from panager.agent.workflow import tool_executor_node
+
+    class _APIResponseError(Exception):
+        status = 503
+
+    tool = _slow_tool("notion_search", 0.0, exc=_APIResponseError("unavailable"))
+    tool.metadata = {"domain": "notion"}
+    registry = MagicMock(spec=ToolRegistry)
+    registry.get_tool.return_value = tool
+    breaker = CircuitBreaker("notion", failure_threshold=1)
+
+    result = await tool_executor_node(
+        _single_call_state("notion_search"),
+        registry,
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        breakers={"notion": breaker},
+    )
+
+    assert json.loads(result["messages"][0].content)["error"] == "service_error"
+    assert breaker.state is CircuitState.OPEN
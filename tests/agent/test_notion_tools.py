@@ -3,6 +3,7 @@ import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from panager.tools.notion import make_notion_tools
+from panager.tools.context import tool_config
 
 
 @pytest.fixture
@@ -46,11 +47,11 @@ async def test_search_notion_success(mock_notion_service, mock_notion_client):
         ]
     }
 
-    tools = make_notion_tools(user_id, mock_notion_service)
+    tools = make_notion_tools(mock_notion_service)
     search_notion = next(t for t in tools if t.name == "search_notion")
 
     result_str = await search_notion.ainvoke(
-        {"query": "test", "filter_type": "database"}
+        {"query": "test", "filter_type": "database"}, config=tool_config(user_id)
     )
     result = json.loads(result_str)
 
@@ -70,11 +71,11 @@ async def test_search_notion_error(mock_notion_service, mock_notion_client):
     user_id = 123
     mock_notion_client.search.side_effect = Exception("Notion search failed")
 
-    tools = make_notion_tools(user_id, mock_notion_service)
+    tools = make_notion_tools(mock_notion_service)
     search_notion = next(t for t in tools if t.name == "search_notion")
 
     with pytest.raises(Exception, match="Notion search failed"):
-        await search_notion.ainvoke({"query": "test"})
+        await search_notion.ainvoke({"query": "test"}, config=tool_config(user_id))
 
 
 @pytest.mark.asyncio
@@ -85,7 +86,7 @@ async def test_create_notion_page_success(mock_notion_service, mock_notion_clien
         "url": "https://notion.so/new_pg_1",
     }
 
-    tools = make_notion_tools(user_id, mock_notion_service)
+    tools = make_notion_tools(mock_notion_service)
     create_notion_page = next(t for t in tools if t.name == "create_notion_page")
 
     properties = {"Name": {"title": [{"text": {"content": "New Page"}}]}}
@@ -93,7 +94,8 @@ async def test_create_notion_page_success(mock_notion_service, mock_notion_clien
         {"object": "block", "type": "paragraph", "paragraph": {"rich_text": []}}
     ]
     result_str = await create_notion_page.ainvoke(
-        {"database_id": "db_1", "properties": properties, "children": children}
+        {"database_id": "db_1", "properties": properties, "children": children},
+        config=tool_config(user_id),
     )
     result = json.loads(result_str)
 
@@ -109,10 +111,11 @@ async def test_create_notion_page_error(mock_notion_service, mock_notion_client)
     user_id = 123
     mock_notion_client.pages.create.side_effect = Exception("Page creation failed")
 
-    tools = make_notion_tools(user_id, mock_notion_service)
+    tools = make_notion_tools(mock_notion_service)
     create_notion_page = next(t for t in tools if t.name == "create_notion_page")
 
     with pytest.raises(Exception, match="Page creation failed"):
         await create_notion_page.ainvoke(
-            {"database_id": "db_1", "properties": {"Name": {"title": []}}}
+            {"database_id": "db_1", "properties": {"Name": {"title": []}}},
+            config=tool_config(user_id),
         )
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from panager.agent.prompt import (
+    STABLE_SYSTEM_PROMPT,
+    PromptCacheStats,
+    build_context_prompt,
+    build_system_prompt,
+    format_memory_digest,
+    with_turn_context,
+    cached_prompt_tokens,
+)
+from panager.agent.state import PendingReflection
+
+
+def test_system_prompt_keeps_stable_prefix():
+    """시각/작업 요약 등 호출별 컨텍스트는 시스템 프롬프트에 들어가지 않음."""
+    assert build_system_prompt() == STABLE_SYSTEM_PROMPT
+    assert build_system_prompt(None) == STABLE_SYSTEM_PROMPT
+
+    context = build_context_prompt(
+        "2026년 10월 18일 (일) 23:59:59",
+        "America/New_York",
+        is_system_trigger=True,
+        task_summary="캘린더 조회 완료",
+    )
+    assert "America/New_York" in context
+    assert "시스템 자동 트리거" in context
+    assert "최근 도구 실행 요약: 캘린더 조회 완료" in context
+    assert STABLE_SYSTEM_PROMPT not in context
+
+
+def test_context_prompt_includes_pending_reflections():
+    reflection = PendingReflection(repository="owner/repo", ref="main", commits=[])
+    prompt = build_context_prompt("now", "UTC", pending_reflections=[reflection])
+    assert "보류 중인 회고" in prompt
+    assert "owner/repo" in prompt
+
+
+def test_cached_prompt_tokens_from_usage_metadata():
+    message = AIMessage(
+        content="",
+        usage_metadata={
+            "input_tokens": 1200,
+            "output_tokens": 10,
+            "total_tokens": 1210,
+            "input_token_details": {"cache_read": 1024},
+        },
+    )
+    assert cached_prompt_tokens(message) == 1024
+
+
+def test_cached_prompt_tokens_from_raw_token_usage():
+    message = AIMessage(
+        content="",
+        response_metadata={
+            "token_usage": {"prompt_tokens_details": {"cached_tokens": 512}}
+        },
+    )
+    assert cached_prompt_tokens(message) == 512
+    assert cached_prompt_tokens(AIMessage(content="")) is None
+
+
+def test_prompt_cache_stats_accumulates_reported_calls():
+    stats = PromptCacheStats()
+    hit = AIMessage(
+        content="",
+        usage_metadata={
+            "input_tokens": 1000,
+            "output_tokens": 1,
+            "total_tokens": 1001,
+            "input_token_details": {"cache_read": 800},
+        },
+    )
+
+    assert stats.record(hit) == (1000, 800)
+    assert stats.record(AIMessage(content="")) is None
+
+    snapshot = stats.snapshot()
+    assert snapshot["calls"] == 2
+    assert snapshot["reported_calls"] == 1
+    assert snapshot["hit_rate"] == 0.8
+
+
+def test_system_prompt_includes_conversation_summary():
+    prompt = build_system_prompt("- 사용자는 매주 월요일 회의가 있음")
+    assert prompt.startswith(STABLE_SYSTEM_PROMPT)
+    assert "이전 대화 요약:\n- 사용자는 매주 월요일 회의가 있음" in prompt
+
+
+def test_memory_digest_dedupes_and_respects_budget():
+    digest = format_memory_digest(
+        ["커피는 라떼를 좋아함", "커피는  라떼를 좋아함", "매주 월요일 " + "회의" * 50],
+        max_chars=40,
+    )
+
+    lines = digest.split("\n")
+    assert lines[0] == "- 커피는 라떼를 좋아함"
+    assert len(lines) == 2 and lines[1].endswith("…")
+    assert len(digest) <= 40
+
+
+def test_context_prompt_includes_memory_context():
+    prompt = build_context_prompt(
+        "2024년 01월 01일 (월) 09:00:00",
+        "Asia/Seoul",
+        memory_context="- 커피는 라떼를 좋아함",
+    )
+    assert prompt.startswith("현재 시각: 2024년 01월 01일 (월) 09:00:00 (Asia/Seoul)")
+    assert prompt.endswith("- 커피는 라떼를 좋아함")
+
+
+def test_turn_context_copies_latest_human_message():
+    """컨텍스트는 마지막 사용자 메시지의 사본에만 붙고 원본과 이후 메시지는 유지."""
+    messages = [
+        HumanMessage(content="이전 질문", id="h1"),
+        AIMessage(content="이전 답변", id="a1"),
+        HumanMessage(content="일정 알려줘", id="h2"),
+        AIMessage(
+            content="", tool_calls=[{"name": "t", "args": {}, "id": "c"}], id="a2"
+        ),
+        ToolMessage(content="결과", tool_call_id="c", id="t1"),
+    ]
+
+    result = with_turn_context(messages, "현재 시각: now (UTC)")
+
+    assert result[:2] == messages[:2]
+    assert result[3:] == messages[3:]
+    assert result[2].id == "h2"
+    assert result[2].content.startswith("[현재 컨텍스트]\n현재 시각: now (UTC)")
+    assert result[2].content.endswith("일정 알려줘")
+    assert messages[2].content == "일정 알려줘"
+
+
+def test_turn_context_prepends_text_part_to_multimodal_content():
+    image = {"type": "image_url", "image_url": {"url": "http://x"}}
+    result = with_turn_context([HumanMessage(content=[image])], "ctx")
+
+    assert result[0].content[0]["type"] == "text"
+    assert "ctx" in result[0].content[0]["text"]
+    assert result[0].content[1] == image
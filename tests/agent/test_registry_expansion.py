@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import asyncio
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from panager.agent.registry import ToolRegistry
@@ -10,57 +10,39 @@ from langchain_core.tools import tool
 @pytest.fixture
 def mock_pool():
     pool = MagicMock()
-    pool.acquire.return_value.__aenter__.return_value = AsyncMock()
+    conn = AsyncMock()
+    conn.transaction = MagicMock()
+    conn.fetch.return_value = []
+    pool.acquire.return_value.__aenter__.return_value = conn
     return pool
 
 
 @pytest.fixture
 def settings():
     settings = MagicMock()
+    settings.tool_search_limit = 5
+    settings.tool_search_rrf_k = 60
+    settings.tool_min_score = 0.25
+    settings.tool_score_gap = 0.15
+    settings.tool_domain_min_scores = {}
     return settings
 
 
-@pytest.mark.asyncio
-async def test_registry_model_loading_concurrency(mock_pool, settings):
-    """모델 로딩 시 Lock이 작동하여 한 번만 로딩되는지 검증."""
-    registry = ToolRegistry(mock_pool, settings)
-
-    with patch("panager.agent.registry.SentenceTransformer") as mock_st:
-        mock_instance = MagicMock()
-        mock_st.return_value = mock_instance
-
-        # 동시에 여러 번 호출
-        results = await asyncio.gather(
-            registry._get_model(), registry._get_model(), registry._get_model()
-        )
-
-        # SentenceTransformer는 한 번만 호출되어야 함
-        mock_st.assert_called_once()
-        assert all(r is mock_instance for r in results)
-
-
-@pytest.mark.asyncio
-async def test_registry_get_embedding_list_conversion(mock_pool, settings):
-    """임베딩 결과가 numpy array 형태여도 list로 올바르게 변환되는지 검증."""
-    registry = ToolRegistry(mock_pool, settings)
-
-    with patch("panager.agent.registry.SentenceTransformer") as mock_st:
-        mock_model = MagicMock()
-        # tolist() 메서드를 가진 numpy-like object 시뮬레이션
-        mock_embedding = MagicMock()
-        mock_embedding.tolist.return_value = [0.1, 0.2, 0.3]
-        mock_model.encode.return_value = mock_embedding
-        registry._model = mock_model
-
-        result = await registry._get_embedding("hello")
-        assert result == [0.1, 0.2, 0.3]
-        mock_embedding.tolist.assert_called_once()
+@pytest.fixture
+def embedding():
+    embedding = MagicMock()
+    embedding.model_name = "test-model"
+    embedding.embed = AsyncMock(return_value=[0.1] * 768)
+    embedding.embed_many = AsyncMock(
+        side_effect=lambda texts: [[0.1] * 768 for _ in texts]
+    )
+    return embedding
 
 
 @pytest.mark.asyncio
-async def test_sync_tools_by_prototypes_no_schema(mock_pool, settings):
+async def test_sync_tools_by_prototypes_no_schema(mock_pool, settings, embedding):
     """schema가 없는 도구도 정상적으로 동기화되는지 검증."""
-    registry = ToolRegistry(mock_pool, settings)
+    registry = ToolRegistry(mock_pool, settings, embedding)
 
     @tool
     def simple_tool():
@@ -71,38 +53,353 @@ async def test_sync_tools_by_prototypes_no_schema(mock_pool, settings):
     if hasattr(simple_tool, "args_schema"):
         delattr(simple_tool, "args_schema")
 
-    with patch.object(registry, "_get_embedding", return_value=[0.1] * 768):
-        conn = mock_pool.acquire.return_value.__aenter__.return_value
-        await registry.sync_tools_by_prototypes([simple_tool])
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    await registry.sync_tools_by_prototypes([simple_tool])
 
-        # execute 호출 확인 (schema는 '{}'로 들어가야 함)
-        args = conn.execute.call_args[0]
-        assert args[4] == "{}"
+    # executemany 호출 확인 (schema는 '{}'로 들어가야 함)
+    rows = conn.executemany.call_args[0][1]
+    assert rows[0][3] == "{}"
 
 
 @pytest.mark.asyncio
-async def test_search_tools_missing_in_memory(mock_pool, settings):
-    """DB에는 있지만 메모리 레지스트리에는 없는 도구에 대한 처리 검증."""
-    registry = ToolRegistry(mock_pool, settings)
-
-    with (
-        patch.object(registry, "_get_embedding", return_value=[0.1] * 768),
-        patch("panager.agent.registry.log") as mock_log,
-    ):
+async def test_load_index_skips_tools_missing_in_memory(mock_pool, settings, embedding):
+    """DB에는 있지만 메모리 레지스트리에는 없는 도구는 인덱스에서 제외."""
+    registry = ToolRegistry(mock_pool, settings, embedding)
+
+    with patch("panager.agent.registry.log") as mock_log:
         conn = mock_pool.acquire.return_value.__aenter__.return_value
-        conn.fetch.return_value = [{"name": "unknown_tool"}]
+        conn.fetch.side_effect = [
+            [{"name": "unknown_tool", "fingerprint": "x"}],
+            [{"name": "unknown_tool", "embedding": np.ones(768, dtype=np.float32)}],
+        ]
 
+        await registry.sync_tools_by_prototypes([])
         results = await registry.search_tools("query")
 
         assert len(results) == 0
-        mock_log.warning.assert_called_once_with(
+        mock_log.warning.assert_any_call(
             "Tool found in DB but not in memory registry: %s", "unknown_tool"
         )
 
 
-def test_registry_getters(mock_pool, settings):
+@pytest.mark.asyncio
+async def test_search_tools_ranks_by_cosine_in_memory(mock_pool, settings, embedding):
+    """인메모리 인덱스가 코사인 유사도 순으로 상위 k개를 반환하는지 검증."""
+    registry = ToolRegistry(mock_pool, settings, embedding)
+
+    @tool
+    def tool_a():
+        """A"""
+
+    @tool
+    def tool_b():
+        """B"""
+
+    @tool
+    def tool_c():
+        """C"""
+
+    registry.register_tools([tool_a, tool_b, tool_c])
+
+    def _vec(*head):
+        v = np.zeros(768, dtype=np.float32)
+        v[: len(head)] = head
+        return v
+
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    conn.fetch.side_effect = [
+        [],
+        [
+            {"name": "tool_a", "embedding": _vec(0.0, 1.0)},
+            {"name": "tool_b", "embedding": _vec(10.0, 1.0)},
+            {"name": "tool_c", "embedding": _vec(1.0, 1.0)},
+        ],
+    ]
+    await registry.sync_to_db()
+    conn.fetch.reset_mock()
+
+    embedding.embed.return_value = _vec(1.0, 0.0).tolist()
+    results = await registry.search_tools("query", limit=2)
+
+    assert [t.name for t in results] == ["tool_b", "tool_c"]
+    # 검색 경로에서는 DB를 조회하지 않음
+    conn.fetch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_tools_fuses_lexical_and_vector_rankings(
+    mock_pool, settings, embedding
+):
+    """임베딩 순위가 낮아도 도메인 키워드가 일치하는 도구가 상위로 올라오는지 검증."""
+    registry = ToolRegistry(mock_pool, settings, embedding)
+
+    @tool
+    def manage_calendar():
+        """Manage events."""
+
+    @tool
+    def search_pages():
+        """Search pages."""
+
+    @tool
+    def list_repos():
+        """List repositories."""
+
+    manage_calendar.metadata = {"domain": "google"}
+    search_pages.metadata = {"domain": "notion"}
+    list_repos.metadata = {"domain": "github"}
+    registry.register_tools([manage_calendar, search_pages, list_repos])
+
+    def _vec(*head):
+        v = np.zeros(768, dtype=np.float32)
+        v[: len(head)] = head
+        return v
+
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    conn.fetch.side_effect = [
+        [],
+        [
+            {"name": "manage_calendar", "embedding": _vec(0.0, 1.0)},
+            {"name": "search_pages", "embedding": _vec(1.0, 0.0)},
+            {"name": "list_repos", "embedding": _vec(1.0, 0.5)},
+        ],
+    ]
+    await registry.sync_to_db()
+
+    # 임베딩만으로는 search_pages > list_repos > manage_calendar
+    embedding.embed.return_value = _vec(1.0, 0.0).tolist()
+    results = await registry.search_tools("내일 회의 일정을 캘린더에 추가해줘", limit=1)
+    assert [t.name for t in results] == ["manage_calendar"]
+
+    # 어휘 일치가 없으면 임베딩 순위를 그대로 따름
+    results = await registry.search_tools("xyz", limit=2)
+    assert [t.name for t in results] == ["search_pages", "list_repos"]
+
+    # limit을 생략하면 설정값 사용
+    settings.tool_search_limit = 2
+    assert len(await registry.search_tools("xyz")) == 2
+
+
+@pytest.mark.asyncio
+async def test_select_tools_cuts_off_low_confidence_candidates(
+    mock_pool, settings, embedding
+):
+    """명확한 쿼리는 확신도가 높은 도구만 선택하고 점수를 기록."""
+    registry = ToolRegistry(mock_pool, settings, embedding)
+
+    @tool
+    def list_tasks():
+        """List tasks."""
+
+    @tool
+    def add_task():
+        """Add task."""
+
+    @tool
+    def search_pages():
+        """Search pages."""
+
+    registry.register_tools([list_tasks, add_task, search_pages])
+
+    def _vec(*head):
+        v = np.zeros(768, dtype=np.float32)
+        v[: len(head)] = head
+        return v
+
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    conn.fetch.side_effect = [
+        [],
+        [
+            {"name": "list_tasks", "embedding": _vec(0.9, 0.1)},
+            {"name": "add_task", "embedding": _vec(0.9, 0.3)},
+            {"name": "search_pages", "embedding": _vec(0.1, 1.0)},
+        ],
+    ]
+    await registry.sync_to_db()
+
+    embedding.embed.return_value = _vec(1.0, 0.0).tolist()
+    with patch("panager.agent.registry.log") as mock_log:
+        matches = await registry.select_tools("zzz")
+
+    # add_task(0.95)는 간격 0.15 이내, search_pages(0.1)는 임계값 미만
+    assert [m.name for m in matches] == ["list_tasks", "add_task"]
+    assert matches[0].score == pytest.approx(0.9 / np.hypot(0.9, 0.1), rel=1e-5)
+    mock_log.info.assert_called_once()
+    assert mock_log.info.call_args[0][1:3] == (2, 3)
+
+    # 임계값을 올리면 1위만 남음
+    settings.tool_min_score = 0.96
+    assert [m.name for m in await registry.select_tools("zzz")] == ["list_tasks"]
+
+
+@pytest.mark.asyncio
+async def test_search_tools_without_index_returns_empty(mock_pool, settings, embedding):
+    registry = ToolRegistry(mock_pool, settings, embedding)
+    assert await registry.search_tools("query") == []
+    embedding.embed.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_sync_skips_unchanged_tools_and_deletes_orphans(
+    mock_pool, settings, embedding
+):
+    """지문이 같은 도구는 재임베딩하지 않고, 사라진 도구는 삭제."""
+    registry = ToolRegistry(mock_pool, settings, embedding)
+
+    @tool
+    def kept_tool():
+        """Kept"""
+
+    @tool
+    def new_tool():
+        """New"""
+
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    await registry.sync_tools_by_prototypes([kept_tool])
+    kept_fingerprint = conn.executemany.call_args[0][1][0][5]
+    conn.executemany.reset_mock()
+    embedding.embed_many.reset_mock()
+
+    conn.fetch.side_effect = [
+        [
+            {"name": "kept_tool", "fingerprint": kept_fingerprint},
+            {"name": "removed_tool", "fingerprint": "old"},
+        ],
+        [],
+    ]
+    await registry.sync_tools_by_prototypes([kept_tool, new_tool])
+
+    embedding.embed_many.assert_awaited_once_with(["new_tool: New"])
+    rows = conn.executemany.call_args[0][1]
+    assert [r[0] for r in rows] == ["new_tool"]
+    conn.execute.assert_any_await(
+        "DELETE FROM tool_registry WHERE name = ANY($1::text[])", ["removed_tool"]
+    )
+    # 변경된 도구의 예시 발화만 교체
+    conn.execute.assert_any_await(
+        "DELETE FROM tool_utterances WHERE tool_name = ANY($1::text[])", ["new_tool"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_embeds_example_utterances(mock_pool, settings, embedding):
+    """metadata의 예시 발화를 도구 설명과 같은 배치로 임베딩해 저장."""
+    registry = ToolRegistry(mock_pool, settings, embedding)
+
+    @tool
+    def list_tasks():
+        """List tasks."""
+
+    list_tasks.metadata = {
+        "domain": "google",
+        "examples": ["할 일 보여줘", "오늘 할 일"],
+    }
+
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    await registry.sync_tools_by_prototypes([list_tasks])
+
+    embedding.embed_many.assert_awaited_once_with(
+        ["list_tasks: List tasks.", "할 일 보여줘", "오늘 할 일"]
+    )
+    rows = conn.executemany.call_args[0][1]
+    assert [(r[0], r[1]) for r in rows] == [
+        ("list_tasks", "할 일 보여줘"),
+        ("list_tasks", "오늘 할 일"),
+    ]
+    fingerprint = conn.executemany.call_args_list[0][0][1][0][5]
+
+    # 예시 발화가 바뀌면 지문도 바뀜
+    list_tasks.metadata = {"domain": "google", "examples": ["할 일 보여줘"]}
+    await registry.sync_tools_by_prototypes([list_tasks])
+    assert conn.executemany.call_args_list[2][0][1][0][5] != fingerprint
+
+
+@pytest.mark.asyncio
+async def test_search_tools_uses_max_sim_over_utterances(
+    mock_pool, settings, embedding
+):
+    """설명 벡터가 멀어도 예시 발화 벡터가 가까우면 상위로 검색."""
+    registry = ToolRegistry(mock_pool, settings, embedding)
+
+    @tool
+    def tool_a():
+        """A"""
+
+    @tool
+    def tool_b():
+        """B"""
+
+    registry.register_tools([tool_a, tool_b])
+
+    def _vec(*head):
+        v = np.zeros(768, dtype=np.float32)
+        v[: len(head)] = head
+        return v
+
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    conn.fetch.side_effect = [
+        [],
+        [
+            {"name": "tool_a", "embedding": _vec(0.0, 1.0)},
+            {"name": "tool_b", "embedding": _vec(0.6, 0.8)},
+            {"name": "tool_a", "embedding": _vec(1.0, 0.1)},
+            {"name": "tool_a", "embedding": _vec(0.0, 0.0, 1.0)},
+        ],
+    ]
+    await registry.sync_to_db()
+
+    embedding.embed.return_value = _vec(1.0, 0.0).tolist()
+    matches = await registry.match_tools("query", limit=2)
+
+    assert [m.name for m in matches] == ["tool_a", "tool_b"]
+    assert matches[0].score == pytest.approx(1.0 / np.hypot(1.0, 0.1), rel=1e-5)
+    assert matches[1].score == pytest.approx(0.6, rel=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_sync_fingerprint_changes_with_model(mock_pool, settings, embedding):
+    """임베딩 모델이 바뀌면 모든 도구를 재임베딩."""
+    registry = ToolRegistry(mock_pool, settings, embedding)
+
+    @tool
+    def some_tool():
+        """Some"""
+
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    await registry.sync_tools_by_prototypes([some_tool])
+    fingerprint = conn.executemany.call_args[0][1][0][5]
+
+    embedding.model_name = "other-model"
+    conn.fetch.side_effect = [[{"name": "some_tool", "fingerprint": fingerprint}], []]
+    await registry.sync_tools_by_prototypes([some_tool])
+    assert conn.executemany.call_args[0][1][0][5] != fingerprint
+
+
+def test_registry_precomputes_openai_schemas(mock_pool, settings, embedding):
+    """등록 시 OpenAI function 스키마를 한 번 계산하고 같은 인스턴스를 재사용."""
+    registry = ToolRegistry(mock_pool, settings, embedding)
+
+    @tool
+    def tool_with_args(query: str, limit: int = 5):
+        """Search something."""
+
+    registry.register_tools([tool_with_args])
+
+    first = registry.get_tool_schemas(["tool_with_args", "missing"])
+    second = registry.get_tool_schemas(["tool_with_args"])
+
+    assert len(first) == 1
+    assert first[0] is second[0]
+    function = first[0]["function"]
+    assert first[0]["type"] == "function"
+    assert function["name"] == "tool_with_args"
+    assert function["parameters"]["type"] == "object"
+    assert function["parameters"]["required"] == ["query"]
+
+
+def test_registry_getters(mock_pool, settings, embedding):
     """get_tool 및 get_all_tools 기본 동작 검증."""
-    registry = ToolRegistry(mock_pool, settings)
+    registry = ToolRegistry(mock_pool, settings, embedding)
 
     @tool
     def tool_a():
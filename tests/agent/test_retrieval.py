@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import pytest
+
+from panager.agent.retrieval import (
+    LexicalIndex,
+    ToolMatch,
+    adaptive_cutoff,
+    filter_unlinked,
+    mentions_provider,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+
+
+def test_tokenize_matches_korean_words_with_particles():
+    """조사가 붙은 단어도 n-gram 토큰을 공유해야 함."""
+    assert "일정" in tokenize("일정을 알려줘")
+    assert "일정" in tokenize("일정")
+    assert set(tokenize("manage_google_calendar")) >= {"manage", "google", "calendar"}
+
+
+def test_tokenize_normalizes_case():
+    assert tokenize("GitHub") == tokenize("github")
+
+
+def test_lexical_index_scores_matching_documents():
+    index = LexicalIndex(
+        [
+            "구글 캘린더 일정 관리",
+            "노션 페이지 검색",
+            "깃허브 저장소 목록",
+        ]
+    )
+
+    scores = index.scores("다음주 일정을 확인해줘")
+    assert scores.argmax() == 0
+    assert scores[1] == 0 and scores[2] == 0
+
+
+def test_lexical_index_empty():
+    assert LexicalIndex([]).scores("query").size == 0
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([[0, 1, 2], [1, 2]], k=60)
+
+    assert [doc for doc, _ in fused] == [1, 2, 0]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+
+
+def _match(name: str, score: float, domain: str = "d") -> ToolMatch:
+    return ToolMatch(name, domain, score, 0.0, 0.0)
+
+
+def test_adaptive_cutoff_keeps_top_even_below_threshold():
+    selected = adaptive_cutoff(
+        [_match("a", 0.1), _match("b", 0.05)], min_score=0.3, max_gap=0.2
+    )
+    assert [m.name for m in selected] == ["a"]
+
+
+def test_adaptive_cutoff_stops_at_score_gap():
+    matches = [_match("a", 0.8), _match("b", 0.75), _match("c", 0.5), _match("d", 0.49)]
+    selected = adaptive_cutoff(matches, min_score=0.3, max_gap=0.15)
+    assert [m.name for m in selected] == ["a", "b"]
+
+
+def test_adaptive_cutoff_measures_gap_on_cosine_not_rrf_order():
+    """RRF 순서와 코사인 순서가 다를 때 간격은 코사인 유사도 순으로 계산."""
+    # d는 어휘 일치로 RRF 2위지만 코사인은 낮음, c는 코사인이 b와 비슷함
+    matches = [_match("b", 0.8), _match("d", 0.45), _match("c", 0.78)]
+    selected = adaptive_cutoff(matches, min_score=0.3, max_gap=0.15)
+    assert [m.name for m in selected] == ["b", "c"]
+
+
+def test_adaptive_cutoff_keeps_lexical_top_and_cosine_cluster():
+    # RRF 1위(어휘 일치)는 min_k로 유지되고, 코사인 상위 묶음도 함께 선택됨
+    matches = [_match("a", 0.35), _match("b", 0.8), _match("c", 0.76)]
+    selected = adaptive_cutoff(matches, min_score=0.3, max_gap=0.15)
+    assert [m.name for m in selected] == ["a", "b", "c"]
+
+
+def test_adaptive_cutoff_uses_domain_minimum():
+    matches = [
+        _match("a", 0.6, "google"),
+        _match("b", 0.55, "memory"),
+        _match("c", 0.5, "google"),
+    ]
+    selected = adaptive_cutoff(
+        matches, min_score=0.3, max_gap=0.2, domain_min_scores={"memory": 0.7}
+    )
+    assert [m.name for m in selected] == ["a", "c"]
+
+
+def test_mentions_provider():
+    assert mentions_provider("노션에 정리해줘", "notion")
+    assert mentions_provider("GitHub 레포 보여줘", "github")
+    assert not mentions_provider("오늘 뭐 하지", "notion")
+    assert mentions_provider("깃허브에서 이슈 찾아줘", "github")
+    assert mentions_provider("my repo please", "github")
+
+
+def test_mentions_provider_ignores_aliases_inside_other_words():
+    """ "레포트"(report)나 "report"는 GitHub 별칭 "레포"/"repo"가 아님."""
+    assert not mentions_provider("주간 레포트 써줘", "github")
+    assert not mentions_provider("weekly report 정리", "github")
+    assert not mentions_provider("레포트를 노트에 남겨줘", "github")
+
+    matches = [_match("repos", 0.3, "github"), _match("memory", 0.2, "memory")]
+    kept = filter_unlinked(matches, "주간 레포트 써줘", frozenset(), min_score=0.5)
+    assert [m.name for m in kept] == ["memory"]
+
+
+def test_filter_unlinked_drops_tools_of_unlinked_providers():
+    matches = [
+        _match("calendar", 0.4, "google"),
+        _match("search_notion", 0.35, "notion"),
+        _match("memory", 0.3, "memory"),
+    ]
+    kept = filter_unlinked(matches, "회의 준비", frozenset({"google"}), min_score=0.5)
+    assert [m.name for m in kept] == ["calendar", "memory"]
+
+
+def test_filter_unlinked_keeps_explicit_or_confident_requests():
+    matches = [_match("search_notion", 0.3, "notion"), _match("repos", 0.2, "github")]
+
+    kept = filter_unlinked(matches, "노션에서 찾아줘", frozenset(), min_score=0.5)
+    assert [m.name for m in kept] == ["search_notion"]
+
+    confident = [_match("repos", 0.7, "github"), _match("search_notion", 0.6, "notion")]
+    kept = filter_unlinked(confident, "코드 저장소", frozenset(), min_score=0.5)
+    assert [m.name for m in kept] == ["repos"]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from langchain_core.tools import tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, Field
+
+from panager.agent.schema import (
+    compact_description,
+    count_tokens,
+    minify_tool_schema,
+    report_tokens,
+)
+
+
+class _Input(BaseModel):
+    action: str
+    query: str | None = Field(None, description="검색어   입니다.")
+    payload: dict | None = None
+    limit: int = 5
+
+
+@tool(args_schema=_Input)
+async def sample_tool(
+    action: str, query: str | None = None, payload: dict | None = None, limit: int = 5
+) -> str:
+    """샘플 도구입니다.
+
+    - action='search': query가 필수입니다.
+    """
+    return ""
+
+
+def test_compact_description_removes_indentation():
+    text = "첫 줄.\n\n        - a\n        - b  c"
+    assert compact_description(text) == "첫 줄.\n- a\n- b c"
+
+
+def test_minify_tool_schema_collapses_optional_null():
+    original = convert_to_openai_tool(sample_tool)
+    minified = minify_tool_schema(original)
+
+    function = minified["function"]
+    props = function["parameters"]["properties"]
+    assert props["query"] == {"type": "string", "description": "검색어 입니다."}
+    assert props["payload"] == {"type": "object"}
+    assert props["limit"] == {"default": 5, "type": "integer"}
+    assert function["parameters"]["required"] == ["action"]
+    assert "\n    " not in function["description"]
+    # 원본은 변경되지 않음
+    assert "anyOf" in original["function"]["parameters"]["properties"]["query"]
+
+
+def test_minify_keeps_required_nullable_fields():
+    schema = {
+        "type": "function",
+        "function": {
+            "name": "t",
+            "parameters": {
+                "type": "object",
+                "title": "T",
+                "properties": {
+                    "x": {"anyOf": [{"type": "string"}, {"type": "null"}]},
+                },
+                "required": ["x"],
+            },
+        },
+    }
+    params = minify_tool_schema(schema)["function"]["parameters"]
+    assert "title" not in params
+    assert params["properties"]["x"] == {
+        "anyOf": [{"type": "string"}, {"type": "null"}]
+    }
+
+
+def test_report_tokens_shrinks():
+    original = convert_to_openai_tool(sample_tool)
+    report = report_tokens("sample_tool", original, minify_tool_schema(original))
+    assert report.after < report.before
+    assert report.saved == report.before - report.after
+    assert count_tokens("") == 0
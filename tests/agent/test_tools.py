@@ -9,6 +9,7 @@ from panager.tools.google import (
 )
 from panager.tools.memory import MemoryAction, make_manage_user_memory
 from panager.tools.scheduler import ScheduleAction, make_manage_dm_scheduler
+from panager.tools.context import get_user_id, tool_config
 
 
 @pytest.fixture
@@ -31,9 +32,10 @@ async def test_manage_user_memory_save(mock_memory_service):
     user_id = 123
     mock_memory_service.save_memory = AsyncMock()
 
-    tool = make_manage_user_memory(user_id, mock_memory_service)
+    tool = make_manage_user_memory(mock_memory_service)
     result_str = await tool.ainvoke(
-        {"action": MemoryAction.SAVE, "content": "테스트 메모리"}
+        {"action": MemoryAction.SAVE, "content": "테스트 메모리"},
+        config=tool_config(user_id),
     )
     result = json.loads(result_str)
 
@@ -50,9 +52,10 @@ async def test_manage_user_memory_search(mock_memory_service):
         return_value=["메모리 1", "메모리 2"]
     )
 
-    tool = make_manage_user_memory(user_id, mock_memory_service)
+    tool = make_manage_user_memory(mock_memory_service)
     result_str = await tool.ainvoke(
-        {"action": MemoryAction.SEARCH, "query": "검색어", "limit": 2}
+        {"action": MemoryAction.SEARCH, "query": "검색어", "limit": 2},
+        config=tool_config(user_id),
     )
     result = json.loads(result_str)
 
@@ -68,13 +71,14 @@ async def test_manage_dm_scheduler_create(mock_scheduler_service):
     user_id = 123
     mock_scheduler_service.add_schedule = AsyncMock(return_value="job_123")
 
-    tool = make_manage_dm_scheduler(user_id, mock_scheduler_service)
+    tool = make_manage_dm_scheduler(mock_scheduler_service)
     result_str = await tool.ainvoke(
         {
             "action": ScheduleAction.CREATE,
             "command": "알람",
             "trigger_at": "2026-02-22T12:00:00+09:00",
-        }
+        },
+        config=tool_config(user_id),
     )
     result = json.loads(result_str)
 
@@ -89,9 +93,10 @@ async def test_manage_dm_scheduler_cancel(mock_scheduler_service):
     user_id = 123
     mock_scheduler_service.cancel_schedule = AsyncMock(return_value=True)
 
-    tool = make_manage_dm_scheduler(user_id, mock_scheduler_service)
+    tool = make_manage_dm_scheduler(mock_scheduler_service)
     result_str = await tool.ainvoke(
-        {"action": ScheduleAction.CANCEL, "schedule_id": "job_123"}
+        {"action": ScheduleAction.CANCEL, "schedule_id": "job_123"},
+        config=tool_config(user_id),
     )
     result = json.loads(result_str)
 
@@ -111,8 +116,10 @@ async def test_manage_google_tasks_list(mock_google_service):
     }
     mock_google_service.get_tasks_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_tasks(user_id, mock_google_service)
-    result_str = await tool.ainvoke({"action": TaskAction.LIST})
+    tool = make_manage_google_tasks(mock_google_service)
+    result_str = await tool.ainvoke(
+        {"action": TaskAction.LIST}, config=tool_config(user_id)
+    )
     result = json.loads(result_str)
 
     assert result["status"] == "success"
@@ -131,8 +138,10 @@ async def test_manage_google_tasks_create(mock_google_service):
     }
     mock_google_service.get_tasks_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_tasks(user_id, mock_google_service)
-    result_str = await tool.ainvoke({"action": TaskAction.CREATE, "title": "새 할일"})
+    tool = make_manage_google_tasks(mock_google_service)
+    result_str = await tool.ainvoke(
+        {"action": TaskAction.CREATE, "title": "새 할일"}, config=tool_config(user_id)
+    )
     result = json.loads(result_str)
 
     assert result["status"] == "success"
@@ -153,9 +162,10 @@ async def test_manage_google_tasks_update_status(mock_google_service):
     }
     mock_google_service.get_tasks_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_tasks(user_id, mock_google_service)
+    tool = make_manage_google_tasks(mock_google_service)
     result_str = await tool.ainvoke(
-        {"action": TaskAction.UPDATE_STATUS, "task_id": "t1", "status": "completed"}
+        {"action": TaskAction.UPDATE_STATUS, "task_id": "t1", "status": "completed"},
+        config=tool_config(user_id),
     )
     result = json.loads(result_str)
 
@@ -174,8 +184,10 @@ async def test_manage_google_tasks_delete(mock_google_service):
     mock_tasks.delete.return_value.execute.return_value = {}
     mock_google_service.get_tasks_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_tasks(user_id, mock_google_service)
-    result_str = await tool.ainvoke({"action": TaskAction.DELETE, "task_id": "t1"})
+    tool = make_manage_google_tasks(mock_google_service)
+    result_str = await tool.ainvoke(
+        {"action": TaskAction.DELETE, "task_id": "t1"}, config=tool_config(user_id)
+    )
     result = json.loads(result_str)
 
     assert result["status"] == "success"
@@ -202,8 +214,10 @@ async def test_manage_google_calendar_list(mock_google_service):
     }
     mock_google_service.get_calendar_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_calendar(user_id, mock_google_service)
-    result_str = await tool.ainvoke({"action": CalendarAction.LIST, "days_ahead": 7})
+    tool = make_manage_google_calendar(mock_google_service)
+    result_str = await tool.ainvoke(
+        {"action": CalendarAction.LIST, "days_ahead": 7}, config=tool_config(user_id)
+    )
     result = json.loads(result_str)
 
     assert result["status"] == "success"
@@ -222,14 +236,15 @@ async def test_manage_google_calendar_create(mock_google_service):
     }
     mock_google_service.get_calendar_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_calendar(user_id, mock_google_service)
+    tool = make_manage_google_calendar(mock_google_service)
     result_str = await tool.ainvoke(
         {
             "action": CalendarAction.CREATE,
             "title": "새 일정",
             "start_at": "2026-02-22T10:00:00+09:00",
             "end_at": "2026-02-22T11:00:00+09:00",
-        }
+        },
+        config=tool_config(user_id),
     )
     result = json.loads(result_str)
 
@@ -253,12 +268,27 @@ async def test_manage_google_calendar_delete(mock_google_service):
     mock_events.delete.return_value.execute.return_value = {}
     mock_google_service.get_calendar_service = AsyncMock(return_value=mock_service)
 
-    tool = make_manage_google_calendar(user_id, mock_google_service)
+    tool = make_manage_google_calendar(mock_google_service)
     result_str = await tool.ainvoke(
-        {"action": CalendarAction.DELETE, "event_id": "e1", "calendar_id": "primary"}
+        {"action": CalendarAction.DELETE, "event_id": "e1", "calendar_id": "primary"},
+        config=tool_config(user_id),
     )
     result = json.loads(result_str)
 
     assert result["status"] == "success"
     assert result["event_id"] == "e1"
     mock_events.delete.assert_called_once_with(calendarId="primary", eventId="e1")
+
+
+def test_tool_config_preserves_existing_config():
+    config = tool_config(7, {"callbacks": [], "configurable": {"thread_id": "7"}})
+    assert config["configurable"] == {"thread_id": "7", "user_id": 7}
+    assert config["callbacks"] == []
+    assert get_user_id(config) == 7
+
+
+@pytest.mark.asyncio
+async def test_tool_requires_user_id_in_config(mock_memory_service):
+    tool = make_manage_user_memory(mock_memory_service)
+    with pytest.raises(ValueError, match="user_id"):
+        await tool.ainvoke({"action": MemoryAction.SEARCH, "query": "q"})
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from panager.agent.utils import TOKEN_COUNT_KEY, message_tokens, trim_agent_messages
+
+
+def _fixed_tokens(value):
+    """테스트용 토크나이저: 문자 수 = 토큰 수."""
+    return len(value) if isinstance(value, str) else len(str(value))
+
+
+def test_message_tokens_cached_on_metadata():
+    message = HumanMessage(content="안녕하세요")
+
+    with patch("panager.agent.utils.count_tokens", side_effect=_fixed_tokens) as count:
+        first = message_tokens(message)
+        second = message_tokens(message)
+
+    assert first == second == 5 + 4
+    count.assert_called_once()
+    assert message.response_metadata[TOKEN_COUNT_KEY]["tokens"] == first
+
+
+def test_message_tokens_recounts_when_tokenizer_changes():
+    message = HumanMessage(content="hello")
+    message.response_metadata[TOKEN_COUNT_KEY] = {"tokenizer": "other", "tokens": 1}
+
+    with patch("panager.agent.utils.count_tokens", side_effect=_fixed_tokens):
+        assert message_tokens(message) == 9
+
+
+def test_message_tokens_includes_tool_calls():
+    plain = AIMessage(content="")
+    with_call = AIMessage(
+        content="", tool_calls=[{"name": "t", "args": {"q": "x"}, "id": "1"}]
+    )
+    assert message_tokens(with_call) > message_tokens(plain)
+
+
+def test_trim_walks_from_tail_within_budget():
+    old = [HumanMessage(content="x" * 96) for _ in range(50)]
+    recent = [
+        HumanMessage(content="a" * 6),
+        AIMessage(content="b" * 6),
+        HumanMessage(content="c" * 6),
+    ]
+
+    with patch("panager.agent.utils.count_tokens", side_effect=_fixed_tokens):
+        trimmed = trim_agent_messages(old + recent, max_tokens=30)
+
+    assert trimmed == recent
+    # 윈도우 밖 과거 메시지는 첫 번째 초과 메시지 하나만 계산
+    counted = [m for m in old if TOKEN_COUNT_KEY in m.response_metadata]
+    assert counted == [old[-1]]
+
+
+def test_trim_starts_on_human_message():
+    messages = [
+        HumanMessage(content="a" * 50),
+        AIMessage(content="", tool_calls=[{"name": "t", "args": {}, "id": "1"}]),
+        ToolMessage(content="result", tool_call_id="1"),
+        HumanMessage(content="next"),
+        AIMessage(content="done"),
+    ]
+
+    with patch("panager.agent.utils.count_tokens", side_effect=_fixed_tokens):
+        trimmed = trim_agent_messages(messages, max_tokens=40)
+
+    assert trimmed == messages[3:]
+
+
+def test_trim_returns_empty_when_last_message_exceeds_budget():
+    with patch("panager.agent.utils.count_tokens", side_effect=_fixed_tokens):
+        assert trim_agent_messages([HumanMessage(content="x" * 100)], 10) == []
@@ -12,6 +12,9 @@ def mock_settings():
     settings.llm_base_url = "http://test"
     settings.llm_api_key = "test-key"
     settings.checkpoint_max_tokens = 4000
+    settings.tool_max_concurrency = 4
+    settings.circuit_failure_threshold = 3
+    settings.circuit_reset_seconds = 30.0
     return settings
 
 
@@ -118,15 +121,15 @@ async def test_agent_node_system_prompt_contains_date_and_timezone(
         )
 
     assert len(captured_messages) >= 1
-    system_msg = captured_messages[0]
-    assert isinstance(system_msg, SystemMessage)
+    context_msg = captured_messages[-1]
+    assert isinstance(context_msg, HumanMessage)
 
     now_kst = datetime.now(zoneinfo.ZoneInfo("Asia/Seoul"))
     current_year = str(now_kst.year)
-    assert current_year in system_msg.content, (
-        f"system prompt에 현재 연도 {current_year}가 없음: {system_msg.content[:200]}"
+    assert current_year in context_msg.content, (
+        f"system prompt에 현재 연도 {current_year}가 없음: {context_msg.content[:200]}"
     )
-    assert "Asia/Seoul" in system_msg.content
+    assert "Asia/Seoul" in context_msg.content
 
 
 @pytest.mark.asyncio
@@ -170,10 +173,10 @@ async def test_agent_node_invalid_timezone_falls_back_to_seoul(
         )
 
     assert len(captured_messages) >= 1
-    system_msg = captured_messages[0]
-    assert isinstance(system_msg, SystemMessage)
+    context_msg = captured_messages[-1]
+    assert isinstance(context_msg, HumanMessage)
     # Falls back to Asia/Seoul
-    assert "Asia/Seoul" in system_msg.content
+    assert "Asia/Seoul" in context_msg.content
 
 
 def test_trim_messages_drops_old_messages_when_over_limit():
@@ -309,9 +312,61 @@ async def test_agent_node_system_trigger_adds_instruction(mock_services, mock_se
         )
 
     assert len(captured_messages) >= 1
-    system_msg = captured_messages[0]
-    assert isinstance(system_msg, SystemMessage)
-    assert "시스템 자동 트리거" in system_msg.content
+    context_msg = captured_messages[-1]
+    assert isinstance(context_msg, HumanMessage)
+    assert "시스템 자동 트리거" in context_msg.content
+
+
+@pytest.mark.asyncio
+async def test_agent_node_keeps_history_in_cacheable_prefix(
+    mock_settings, mock_services
+):
+    """호출별 컨텍스트가 달라도 시스템 프롬프트 + 대화 이력 프리픽스는 동일."""
+    from panager.agent.agent import agent_node
+    from panager.agent.prompt import STABLE_SYSTEM_PROMPT
+    from panager.agent.state import AgentState
+
+    calls = []
+
+    async def fake_ainvoke(messages):
+        calls.append(list(messages))
+        return AIMessage(content="응답")
+
+    history = [
+        HumanMessage(content="첫 질문", id="h1"),
+        AIMessage(content="첫 답변", id="a1"),
+        HumanMessage(content="두 번째 질문", id="h2"),
+    ]
+    with patch("panager.agent.agent.get_llm") as mock_get_llm:
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = fake_ainvoke
+        mock_get_llm.return_value = mock_llm
+
+        for memory, summary in (("- 라떼", None), ("- 아메리카노", "도구 실행")):
+            state = cast(
+                AgentState,
+                {
+                    "user_id": 1,
+                    "username": "u",
+                    "messages": list(history),
+                    "memory_context": memory,
+                    "task_summary": summary,
+                    "timezone": "Asia/Seoul",
+                },
+            )
+            await agent_node(state, mock_settings, mock_services["session_provider"])
+
+    first, second = calls
+    assert [m.content for m in first[:-1]] == [m.content for m in second[:-1]]
+    assert first[0].content == STABLE_SYSTEM_PROMPT
+    assert [type(m) for m in first].count(SystemMessage) == 1
+    assert [m.content for m in first[1:-1]] == ["첫 질문", "첫 답변"]
+    # 호출별 컨텍스트는 최신 사용자 메시지의 사본에만 붙고 상태는 그대로
+    assert isinstance(first[-1], HumanMessage) and "- 라떼" in first[-1].content
+    assert first[-1].content.endswith("두 번째 질문")
+    assert "- 아메리카노" in second[-1].content
+    assert "도구 실행" in second[-1].content
+    assert history[-1].content == "두 번째 질문"
 
 
 @pytest.mark.asyncio
@@ -349,3 +404,203 @@ async def test_agent_node_strips_scheduled_event_prefix(mock_services, mock_sett
 
     # state["messages"][-1] should be cleaned
     assert state["messages"][-1].content == "내일 일정 알려줘"
+
+
+@pytest.mark.asyncio
+async def test_pre_agent_nodes_run_concurrently(mock_services, mock_settings):
+    """discovery/user_context/memory_recall이 병렬로 실행된 뒤 agent로 합류하는지 검증."""
+    import asyncio
+    import time
+
+    from panager.agent.workflow import build_graph
+
+    delay = 0.2
+
+    def slow(value):
+        async def _call(*args, **kwargs):
+            await asyncio.sleep(delay)
+            return value
+
+        return _call
+
+    mock_settings.memory_context_limit = 3
+    mock_settings.memory_context_max_chars = 800
+    mock_settings.compaction_trigger_tokens = 100_000
+    mock_services["registry"].select_tools = AsyncMock(side_effect=slow([]))
+    mock_services["session_provider"].get_user_timezone = AsyncMock(
+        side_effect=slow("Asia/Seoul")
+    )
+    mock_services["memory_service"].search_memories = AsyncMock(
+        side_effect=slow(["커피는 라떼를 좋아함"])
+    )
+
+    captured = []
+    mock_llm = MagicMock()
+
+    async def fake_ainvoke(messages):
+        captured.extend(messages)
+        return AIMessage(content="안녕하세요!")
+
+    mock_llm.ainvoke = fake_ainvoke
+
+    with (
+        patch("panager.agent.agent.get_llm", return_value=mock_llm),
+        patch("panager.agent.workflow.Settings", return_value=mock_settings),
+    ):
+        graph = build_graph(MemorySaver(), **mock_services)
+        started = time.perf_counter()
+        result = await graph.ainvoke(
+            {"user_id": 1, "username": "u", "messages": [HumanMessage(content="안녕")]},
+            config={"configurable": {"thread_id": "1"}},
+        )
+        elapsed = time.perf_counter() - started
+
+    assert elapsed < delay * 2
+    assert result["timezone"] == "Asia/Seoul"
+    assert result["memory_context"] == "- 커피는 라떼를 좋아함"
+    mock_services["memory_service"].search_memories.assert_awaited_once_with(
+        1, "안녕", limit=3
+    )
+    assert "Asia/Seoul" in captured[-1].content
+    assert "- 커피는 라떼를 좋아함" in captured[-1].content
+
+
+@pytest.mark.asyncio
+async def test_tool_executor_receives_graph_config(mock_services, mock_settings):
+    """그래프 실행 config의 태그/콜백이 도구 호출까지 전달되는지 검증."""
+    import warnings
+
+    from langchain_core.callbacks import AsyncCallbackHandler
+
+    from panager.agent.workflow import build_graph
+
+    class _Recorder(AsyncCallbackHandler):
+        pass
+
+    recorder = _Recorder()
+    mock_settings.memory_context_limit = 0
+    mock_settings.compaction_trigger_tokens = 100_000
+    mock_settings.tool_timeout_seconds = 0
+    mock_settings.tool_domain_timeouts = {}
+    mock_services["registry"].select_tools = AsyncMock(return_value=[])
+    mock_services["session_provider"].get_user_timezone = AsyncMock(
+        return_value="Asia/Seoul"
+    )
+
+    tool = MagicMock()
+    tool.metadata = {"domain": "scheduler"}
+    tool.ainvoke = AsyncMock(return_value="ok")
+    mock_services["registry"].get_tool.return_value = tool
+
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(
+        side_effect=[
+            AIMessage(
+                content="", tool_calls=[{"name": "t", "args": {}, "id": "call-1"}]
+            ),
+            AIMessage(content="완료"),
+        ]
+    )
+
+    with (
+        patch("panager.agent.agent.get_llm", return_value=mock_llm),
+        patch("panager.agent.workflow.Settings", return_value=mock_settings),
+    ):
+        with warnings.catch_warnings():
+            # 노드 시그니처의 config 인자 경고(주입되지 않는 파라미터)가 없어야 함
+            warnings.simplefilter("error", UserWarning)
+            graph = build_graph(MemorySaver(), **mock_services)
+        await graph.ainvoke(
+            {"user_id": 7, "username": "u", "messages": [HumanMessage(content="hi")]},
+            config={
+                "configurable": {"thread_id": "7"},
+                "tags": ["trace-me"],
+                "callbacks": [recorder],
+            },
+        )
+
+    tool_config = tool.ainvoke.call_args.kwargs["config"]
+    assert tool_config["configurable"]["user_id"] == 7
+    assert "trace-me" in tool_config["tags"]
+    callbacks = tool_config["callbacks"]
+    handlers = getattr(callbacks, "handlers", callbacks)
+    assert recorder in handlers
+
+
+@pytest.mark.asyncio
+async def test_compaction_summarizes_in_background_and_applies_next_turn(
+    mock_services, mock_settings
+):
+    """요약 호출은 응답을 기다리게 하지 않고, 준비된 요약은 다음 턴 시작에 반영."""
+    import asyncio
+
+    from panager.agent.workflow import build_graph
+
+    mock_settings.memory_context_limit = 0
+    mock_settings.compaction_trigger_tokens = 100_000
+    mock_settings.compaction_keep_tokens = 1
+    mock_settings.compaction_max_input_tokens = 100_000
+    mock_services["registry"].select_tools = AsyncMock(return_value=[])
+    mock_services["session_provider"].get_user_timezone = AsyncMock(
+        return_value="Asia/Seoul"
+    )
+
+    captured = []
+    summary_started = asyncio.Event()
+    release_summary = asyncio.Event()
+
+    async def fake_ainvoke(messages, config=None):
+        if config and "nostream" in config.get("tags", []):
+            summary_started.set()
+            await release_summary.wait()
+            return AIMessage(content="- 요약된 이전 대화")
+        captured.append(messages)
+        return AIMessage(content="답변")
+
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = fake_ainvoke
+    config = {"configurable": {"thread_id": "9"}}
+    state = {"user_id": 9, "username": "u"}
+
+    with (
+        patch("panager.agent.agent.get_llm", return_value=mock_llm),
+        patch("panager.agent.compaction.get_llm", return_value=mock_llm),
+        patch("panager.agent.workflow.Settings", return_value=mock_settings),
+    ):
+        graph = build_graph(MemorySaver(), **mock_services)
+        await graph.ainvoke(
+            {**state, "messages": [HumanMessage(content="첫 질문")]}, config=config
+        )
+
+        # 임계값을 넘긴 턴: 요약이 끝나지 않아도 응답이 완료되고 다음 노드가 남지 않음
+        mock_settings.compaction_trigger_tokens = 1
+        result = await graph.ainvoke(
+            {**state, "messages": [HumanMessage(content="두 번째 질문")]},
+            config=config,
+        )
+        assert summary_started.is_set()
+        assert "conversation_summary" not in result
+        assert (await graph.aget_state(config)).next == ()
+
+        release_summary.set()
+        await asyncio.sleep(0)
+
+        result = await graph.ainvoke(
+            {**state, "messages": [HumanMessage(content="세 번째 질문")]},
+            config=config,
+        )
+
+    assert result["conversation_summary"] == "- 요약된 이전 대화"
+    # 요약은 두 번째 턴 시작 시점의 이력(첫 질문/답변)을 접은 것
+    assert [m.content for m in result["messages"]] == [
+        "두 번째 질문",
+        "답변",
+        "세 번째 질문",
+        "답변",
+    ]
+    assert (await graph.aget_state(config)).next == ()
+    # 세 번째 턴의 agent 호출은 이미 압축된 이력과 요약을 받음
+    last_call = captured[-1]
+    assert "- 요약된 이전 대화" in last_call[0].content
+    assert [m.content for m in last_call[1:-1]] == ["두 번째 질문", "답변"]
+    assert last_call[-1].content.endswith("세 번째 질문")
@@ -57,7 +57,7 @@ async def test_discovery_node_empty_cases():
 async def test_tool_executor_node_tool_not_found():
     """도구를 찾을 수 없는 경우 ToolMessage 응답 검증."""
     registry = MagicMock()
-    registry.get_tools_for_user = AsyncMock(return_value=[])  # 도구 없음
+    registry.get_tool.return_value = None  # 도구 없음
 
     state = {
         "user_id": 1,
@@ -118,9 +118,8 @@ async def test_tool_executor_node_auth_flow():
     tool_notion.name = "n"
     tool_notion.metadata = {"domain": "notion"}
 
-    registry.get_tools_for_user = AsyncMock(
-        return_value=[tool_google, tool_github, tool_notion]
-    )
+    tools = {t.name: t for t in (tool_google, tool_github, tool_notion)}
+    registry.get_tool.side_effect = tools.get
 
     google_svc = MagicMock()
     google_svc.get_auth_url.return_value = "google_url"
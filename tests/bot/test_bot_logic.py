@@ -3,6 +3,7 @@ import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 from discord import DMChannel, User, Message
 from langchain_core.messages import HumanMessage
+from langgraph.types import Command
 from panager.discord.bot import PanagerBot
 
 
@@ -137,8 +138,9 @@ async def test_process_auth_queue(bot):
         mock_stream.assert_awaited_once()
         args = mock_stream.call_args[0]
         state = args[1]
-        # Now state is None to trigger Resume
-        assert state is None
+        # 인터럽트 지점에서 재개하도록 resume 값을 전달
+        assert isinstance(state, Command)
+        assert state.resume == "auth_success"
         assert user_id not in bot._pending_messages
 
 
@@ -139,3 +139,90 @@ async def test_handle_dm_registers_user_and_calls_stream():
         mock_conn.execute.assert_awaited()
         # 스트리밍 함수 호출 확인
         mock_stream.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_auth_interrupt_update_and_resume_with_real_checkpointer():
+    """인증 인터럽트 → 메시지 ID 저장 → 재개가 실제 체크포인터에서 원래 요청을 마치는지 검증."""
+    from langchain_core.messages import AIMessage, HumanMessage
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.types import Command
+
+    from panager.core.exceptions import GoogleAuthRequired
+    from panager.discord.handlers import _stream_agent_response
+    from panager.agent.workflow import build_graph
+
+    settings = MagicMock()
+    settings.checkpoint_max_tokens = 4000
+    settings.tool_max_concurrency = 4
+    settings.circuit_failure_threshold = 3
+    settings.circuit_reset_seconds = 30.0
+    settings.memory_context_limit = 0
+    settings.compaction_trigger_tokens = 100_000
+    settings.tool_timeout_seconds = 0
+    settings.tool_domain_timeouts = {}
+
+    services = {
+        name: MagicMock()
+        for name in (
+            "session_provider",
+            "memory_service",
+            "google_service",
+            "github_service",
+            "notion_service",
+            "scheduler_service",
+            "registry",
+        )
+    }
+    services["registry"].select_tools = AsyncMock(return_value=[])
+    services["session_provider"].get_user_timezone = AsyncMock(
+        return_value="Asia/Seoul"
+    )
+    services["google_service"].get_auth_url.return_value = "http://google-auth"
+
+    tool = MagicMock()
+    tool.metadata = {"domain": "google"}
+    tool.ainvoke = AsyncMock(side_effect=[GoogleAuthRequired(), "일정 3건"])
+    services["registry"].get_tool.return_value = tool
+
+    call = {"name": "list_events", "args": {}, "id": "call-1"}
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(
+        side_effect=[
+            AIMessage(content="", tool_calls=[call]),
+            AIMessage(content="", tool_calls=[{**call, "id": "call-2"}]),
+            AIMessage(content="오늘 일정은 3건입니다."),
+        ]
+    )
+
+    channel = MagicMock()
+    auth_msg = AsyncMock()
+    auth_msg.id = 555
+    channel.send = AsyncMock(return_value=auth_msg)
+    config = {"configurable": {"thread_id": "1"}}
+
+    with (
+        patch("panager.agent.agent.get_llm", return_value=mock_llm),
+        patch("panager.agent.workflow.Settings", return_value=settings),
+    ):
+        graph = build_graph(MemorySaver(), **services)
+        await _stream_agent_response(
+            graph,
+            {"user_id": 1, "username": "u", "messages": [HumanMessage(content="일정")]},
+            config,
+            channel,
+        )
+
+        interrupted = await graph.aget_state(config)
+        assert interrupted.next == ("auth_interrupt",)
+        assert interrupted.values["auth_message_id"] == 555
+
+        await _stream_agent_response(
+            graph, Command(resume="auth_success"), config, channel, auth_msg
+        )
+
+    final = await graph.aget_state(config)
+    assert final.next == ()
+    assert final.values["messages"][-1].content == "오늘 일정은 3건입니다."
+    assert final.values["auth_message_id"] is None
+    assert tool.ainvoke.await_count == 2
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from panager.integrations.embedding_worker import (
+    EmbeddingWorkerPool,
+    _encode_error,
+    _encode_ok,
+    _WorkerProcess,
+)
+
+
+def _worker_with_stdout(data: bytes) -> _WorkerProcess:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    worker = _WorkerProcess([])
+    worker._proc = MagicMock(stdout=reader, returncode=None)
+    return worker
+
+
+@pytest.mark.asyncio
+async def test_binary_frame_roundtrip():
+    """float32 응답 프레임이 손실 없이 복원되는지 검증."""
+    vectors = np.array([[0.5, -1.25, 3.0], [1.0, 2.0, 4.0]], dtype=np.float32)
+    worker = _worker_with_stdout(_encode_ok(vectors))
+
+    result = await worker._read_response()
+
+    assert result.shape == (2, 3)
+    assert np.array_equal(result, vectors)
+
+
+@pytest.mark.asyncio
+async def test_error_frame_raises():
+    worker = _worker_with_stdout(_encode_error("ValueError: bad input"))
+
+    with pytest.raises(RuntimeError, match="bad input"):
+        await worker._read_response()
+
+
+def _fake_worker(result: np.ndarray | Exception) -> MagicMock:
+    worker = MagicMock()
+    worker.alive = True
+    if isinstance(result, Exception):
+        worker.encode = AsyncMock(side_effect=result)
+    else:
+        worker.encode = AsyncMock(return_value=result)
+    worker.stop = AsyncMock()
+    return worker
+
+
+@pytest.mark.asyncio
+async def test_pool_returns_worker_to_idle_queue():
+    pool = EmbeddingWorkerPool(1, backend="torch", model_name="m")
+    worker = _fake_worker(np.zeros((1, 2), dtype=np.float32))
+    pool._idle.put_nowait(worker)
+
+    await pool.encode(["a"])
+    await pool.encode(["b"])
+
+    assert worker.encode.await_count == 2
+    assert pool._idle.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_stops_crashed_worker():
+    """워커가 비정상 종료되면 RuntimeError로 변환하고 워커를 정리하는지 검증."""
+    pool = EmbeddingWorkerPool(1, backend="onnx", model_name="m")
+    worker = _fake_worker(asyncio.IncompleteReadError(b"", 1))
+    pool._idle.put_nowait(worker)
+
+    with pytest.raises(RuntimeError):
+        await pool.encode(["a"])
+
+    worker.stop.assert_awaited_once()
+    assert pool._idle.qsize() == 1
+    assert pool.name == "onnx-int8"
+
+
+@pytest.mark.asyncio
+async def test_embedding_service_awaits_async_backend():
+    """코루틴 백엔드는 스레드를 거치지 않고 직접 await되는지 검증."""
+    from panager.services.embedding import EmbeddingService
+
+    settings = MagicMock()
+    settings.embedding_model_name = "m"
+    settings.embedding_max_concurrency = 2
+    settings.embedding_batch_window_ms = 0
+    settings.embedding_max_batch_size = 8
+
+    class _AsyncBackend:
+        name = "torch"
+        load = AsyncMock()
+        close = AsyncMock()
+
+        async def encode(self, texts: list[str]) -> np.ndarray:
+            return np.ones((len(texts), 2), dtype=np.float32)
+
+    backend = _AsyncBackend()
+    service = EmbeddingService(settings, backend=backend)
+
+    assert await service.embed("a") == [1.0, 1.0]
+    backend.load.assert_awaited_once()
+
+    await service.close()
+    backend.close.assert_awaited_once()
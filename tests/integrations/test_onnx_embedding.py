@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from panager.integrations.onnx_embedding import (
+    ONNX_CONFIG_FILE,
+    OnnxEmbeddingBackend,
+    mean_pool,
+)
+
+
+def test_mean_pool_ignores_padding():
+    token_embeddings = np.array(
+        [
+            [[1.0, 1.0], [3.0, 3.0], [100.0, 100.0]],
+            [[2.0, 4.0], [0.0, 0.0], [0.0, 0.0]],
+        ]
+    )
+    attention_mask = np.array([[1, 1, 0], [1, 0, 0]])
+
+    pooled = mean_pool(token_embeddings, attention_mask)
+
+    assert pooled.dtype == np.float32
+    assert pooled.tolist() == [[2.0, 2.0], [2.0, 4.0]]
+
+
+def test_load_missing_model_raises(tmp_path):
+    backend = OnnxEmbeddingBackend(str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        backend.load()
+
+
+def test_encode_requires_load(tmp_path):
+    backend = OnnxEmbeddingBackend(str(tmp_path))
+    with pytest.raises(RuntimeError):
+        backend.encode(["hello"])
+
+
+def test_encode_runs_session_and_pools(tmp_path):
+    """tokenizer 출력이 세션 입력으로 전달되고 mean pooling 결과가 반환되는지 검증."""
+    (tmp_path / ONNX_CONFIG_FILE).write_text(json.dumps({"max_seq_length": 64}))
+    backend = OnnxEmbeddingBackend(str(tmp_path))
+
+    tokenizer = MagicMock(
+        return_value={
+            "input_ids": np.array([[5, 6]], dtype=np.int32),
+            "attention_mask": np.array([[1, 1]], dtype=np.int32),
+            "token_type_ids": np.array([[0, 0]], dtype=np.int32),
+        }
+    )
+    session = MagicMock()
+    session.run.return_value = [np.array([[[1.0, 2.0], [3.0, 4.0]]])]
+    backend._tokenizer = tokenizer
+    backend._session = session
+    backend._input_names = ["input_ids", "attention_mask"]
+
+    result = backend.encode(["안녕"])
+
+    assert result.tolist() == [[2.0, 3.0]]
+    feed = session.run.call_args[0][1]
+    assert set(feed) == {"input_ids", "attention_mask"}
+    assert feed["input_ids"].dtype == np.int64
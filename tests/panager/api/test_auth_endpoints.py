@@ -50,6 +50,7 @@ async def test_google_callback(app, mock_bot):
         assert "Google 연동이 완료됐습니다" in response.text
 
         mock_bot.google_service.exchange_code.assert_awaited_once_with("abc", 123)
+        mock_bot.integration_service.invalidate.assert_called_once_with(123)
 
         # Check auth_complete_queue
         event = await mock_bot.auth_complete_queue.get()
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock
 from fastapi.testclient import TestClient
 
 from panager.api.main import create_app
+from panager.core.readiness import ComponentState, ReadinessTracker
 
 
 def test_health_check():
@@ -14,3 +15,25 @@ def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_ready_without_tracker():
+    client = TestClient(create_app(MagicMock()))
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_ready_reports_components():
+    readiness = ReadinessTracker()
+    readiness.register("embedding")
+    client = TestClient(create_app(MagicMock(), readiness))
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["components"]["embedding"]["state"] == "pending"
+
+    readiness.set_state("embedding", ComponentState.READY)
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from panager.services.embedding import EmbeddingService
+
+
+def _fake_encode(texts: list[str]) -> np.ndarray:
+    # 각 텍스트의 길이를 값으로 하는 1차원 벡터
+    return np.array([[float(len(t))] for t in texts])
+
+
+@pytest.fixture
+def settings():
+    settings = MagicMock()
+    settings.embedding_model_name = "test-model"
+    settings.embedding_backend = "torch"
+    settings.embedding_workers = 0
+    settings.embedding_max_concurrency = 1
+    settings.embedding_batch_window_ms = 20
+    settings.embedding_max_batch_size = 4
+    return settings
+
+
+@pytest.mark.asyncio
+async def test_model_loaded_once_under_concurrency(settings):
+    """동시에 여러 번 호출해도 모델은 한 번만 로딩되는지 검증."""
+    service = EmbeddingService(settings)
+
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        results = await asyncio.gather(
+            service.get_backend(), service.get_backend(), service.get_backend()
+        )
+
+        mock_st.assert_called_once_with("test-model")
+        assert all(r is results[0] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_embed_returns_list(settings):
+    """numpy 배열 임베딩이 list[float]로 변환되는지 검증."""
+    service = EmbeddingService(settings)
+
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.array([[0.1, 0.2, 0.3]])
+        mock_st.return_value = mock_model
+
+        result = await service.embed("hello")
+
+        assert result == pytest.approx([0.1, 0.2, 0.3])
+        mock_model.encode.assert_called_once_with(["hello"])
+
+
+@pytest.mark.asyncio
+async def test_shared_instance_between_memory_and_registry(settings):
+    """MemoryService와 ToolRegistry가 같은 엔진을 공유하면 모델이 한 번만 로딩되는지 검증."""
+    from panager.agent.registry import ToolRegistry
+    from panager.services.memory import MemoryService
+
+    service = EmbeddingService(settings)
+    memory = MemoryService(MagicMock(), service)
+    registry = ToolRegistry(MagicMock(), settings, service)
+
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_st.return_value.encode.side_effect = _fake_encode
+
+        await memory._embedding.embed("a")
+        await registry._embedding.embed("b")
+
+        mock_st.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_batched(settings):
+    """윈도우 내 동시 요청이 한 번의 encode 호출로 묶이고 각자 결과를 받는지 검증."""
+    service = EmbeddingService(settings)
+
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_st.return_value.encode.side_effect = _fake_encode
+
+        results = await asyncio.gather(
+            service.embed("a"), service.embed("bb"), service.embed("ccc")
+        )
+
+        assert results == [[1.0], [2.0], [3.0]]
+        mock_st.return_value.encode.assert_called_once_with(["a", "bb", "ccc"])
+
+    stats = service.stats.snapshot()
+    assert stats["batches"] == 1
+    assert stats["requests"] == 3
+    assert stats["max_batch_size"] == 3
+
+
+@pytest.mark.asyncio
+async def test_max_batch_size_flushes_immediately(settings):
+    """max_batch_size에 도달하면 윈도우를 기다리지 않고 배치를 분할하는지 검증."""
+    service = EmbeddingService(settings)
+
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_st.return_value.encode.side_effect = _fake_encode
+
+        texts = ["x" * i for i in range(1, 7)]
+        results = await asyncio.gather(*(service.embed(t) for t in texts))
+
+        assert results == [[float(i)] for i in range(1, 7)]
+        batches = [c.args[0] for c in mock_st.return_value.encode.call_args_list]
+        assert batches == [texts[:4], texts[4:]]
+
+
+@pytest.mark.asyncio
+async def test_encode_failure_propagates_to_all_callers(settings):
+    """배치 인코딩 실패 시 대기 중인 모든 호출자에게 예외가 전달되는지 검증."""
+    service = EmbeddingService(settings)
+
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_st.return_value.encode.side_effect = RuntimeError("boom")
+
+        results = await asyncio.gather(
+            service.embed("a"), service.embed("b"), return_exceptions=True
+        )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_model(settings):
+    """같은(정규화 기준) 텍스트를 반복 요청하면 캐시에서 반환되는지 검증."""
+    from panager.services.embedding_cache import EmbeddingCache
+
+    service = EmbeddingService(settings, cache=EmbeddingCache(max_entries=8))
+
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_st.return_value.encode.side_effect = _fake_encode
+
+        first = await service.embed("오늘 일정 알려줘")
+        second = await service.embed("  오늘 일정   알려줘")
+
+    assert first == second == [9.0]
+    mock_st.return_value.encode.assert_called_once_with(["오늘 일정 알려줘"])
+
+
+def test_backend_selected_from_settings(settings, tmp_path):
+    """embedding_backend 설정에 따라 백엔드가 선택되는지 검증."""
+    from panager.integrations.onnx_embedding import OnnxEmbeddingBackend
+    from panager.services.embedding import (
+        SentenceTransformerBackend,
+        create_embedding_backend,
+    )
+
+    assert isinstance(create_embedding_backend(settings), SentenceTransformerBackend)
+
+    settings.embedding_backend = "onnx"
+    settings.embedding_onnx_dir = str(tmp_path)
+    settings.embedding_onnx_threads = 2
+    backend = create_embedding_backend(settings)
+    assert isinstance(backend, OnnxEmbeddingBackend)
+    assert backend.model_dir == str(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_cache_write_does_not_block_embedding(settings, caplog):
+    """캐시 저장이 끝나지 않아도 임베딩을 반환하고, close()가 저장을 기다리는지 검증."""
+    release = asyncio.Event()
+    stored = []
+
+    async def slow_put(key, model_name, embedding):
+        await release.wait()
+        stored.append(key)
+        raise RuntimeError("db down")
+
+    cache = MagicMock()
+    cache.get = AsyncMock(return_value=None)
+    cache.put = slow_put
+    backend = MagicMock()
+    backend.name = "torch"
+    backend.encode.side_effect = _fake_encode
+    backend.close = AsyncMock()
+    service = EmbeddingService(settings, cache=cache, backend=backend)
+
+    result = await asyncio.wait_for(service.embed("a"), timeout=1)
+
+    assert result == [1.0]
+    assert stored == []
+    release.set()
+    await service.close()
+    assert len(stored) == 1
+    assert "임베딩 캐시 저장 실패" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_cache_namespace_includes_backend(settings):
+    """백엔드가 다르면 같은 텍스트라도 캐시를 공유하지 않는지 검증."""
+    from panager.services.embedding_cache import EmbeddingCache
+
+    cache = EmbeddingCache(max_entries=8)
+    torch_backend = MagicMock()
+    torch_backend.name = "torch"
+    torch_backend.encode.side_effect = _fake_encode
+    onnx_backend = MagicMock()
+    onnx_backend.name = "onnx-int8"
+    onnx_backend.encode.side_effect = _fake_encode
+
+    await EmbeddingService(settings, cache=cache, backend=torch_backend).embed("a")
+    await EmbeddingService(settings, cache=cache, backend=onnx_backend).embed("a")
+
+    torch_backend.encode.assert_called_once()
+    onnx_backend.encode.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_encoding(settings):
+    """같은 텍스트를 동시에 요청하면 한 번만 인코딩하고 결과를 공유하는지 검증."""
+    service = EmbeddingService(settings)
+
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_st.return_value.encode.side_effect = _fake_encode
+
+        results = await asyncio.gather(
+            service.embed("오늘 일정"), service.embed(" 오늘  일정 ")
+        )
+
+    assert results == [[5.0], [5.0]]
+    assert results[0] is not results[1]
+    mock_st.return_value.encode.assert_called_once_with(["오늘 일정"])
+    assert service._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_request(settings):
+    service = EmbeddingService(settings)
+
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_st.return_value.encode.side_effect = _fake_encode
+
+        first = asyncio.create_task(service.embed("abc"))
+        second = asyncio.create_task(service.embed("abc"))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == [3.0]
+
+
+def test_encode_concurrency_defaults_to_worker_count():
+    from panager.services.embedding import encode_concurrency
+
+    settings = MagicMock(embedding_max_concurrency=0, embedding_workers=4)
+    assert encode_concurrency(settings) == 4
+
+    settings.embedding_workers = 0
+    assert encode_concurrency(settings) == 1
+
+    settings.embedding_max_concurrency = 2
+    assert encode_concurrency(settings) == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_batches_encode_concurrently(settings):
+    """기본 설정에서 워커 풀 크기만큼 배치가 동시에 encode되는지 검증."""
+    settings.embedding_max_concurrency = 0
+    settings.embedding_workers = 2
+    running = 0
+    peak = 0
+
+    class _AsyncBackend:
+        name = "torch"
+
+        async def load(self) -> None:
+            pass
+
+        async def encode(self, texts):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return _fake_encode(texts)
+
+    service = EmbeddingService(settings, backend=_AsyncBackend())
+    await asyncio.gather(service.embed_many(["a"]), service.embed_many(["b"]))
+
+    assert peak == 2
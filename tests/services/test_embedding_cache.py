@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from panager.services.embedding_cache import EmbeddingCache, cache_key, normalize_text
+
+
+@pytest.fixture
+def mock_pool():
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__.return_value = AsyncMock()
+    return pool
+
+
+def test_normalize_text_collapses_whitespace():
+    assert normalize_text("  오늘   일정\n알려줘 ") == "오늘 일정 알려줘"
+
+
+def test_cache_key_depends_on_model_and_normalized_text():
+    assert cache_key("오늘 일정 알려줘", "m") == cache_key(" 오늘  일정 알려줘", "m")
+    assert cache_key("오늘 일정 알려줘", "m") != cache_key("오늘 일정 알려줘", "n")
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used():
+    cache = EmbeddingCache(max_entries=2)
+
+    await cache.put("a", "m", [1.0])
+    await cache.put("b", "m", [2.0])
+    # a를 최근 사용으로 갱신한 뒤 c 추가 → b가 제거되어야 함
+    assert await cache.get("a") == [1.0]
+    await cache.put("c", "m", [3.0])
+
+    assert len(cache) == 2
+    assert await cache.get("b") is None
+    assert await cache.get("c") == [3.0]
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_roundtrip(mock_pool):
+    """LRU 미스 시 Postgres 계층에서 조회하여 LRU로 승격하는지 검증."""
+    cache = EmbeddingCache(max_entries=4, pool=mock_pool)
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    stored = np.array([0.5, 0.25], dtype=np.float32).tobytes()
+    conn.fetchrow.return_value = {"embedding": stored}
+
+    assert await cache.get("k") == [0.5, 0.25]
+    assert len(cache) == 1
+
+    assert "SET last_used_at = now()" in conn.fetchrow.call_args[0][0]
+
+    await cache.put("k2", "m", [1.0, 2.0])
+    args = conn.execute.call_args[0]
+    assert "INSERT INTO embedding_cache" in args[0]
+    assert "DO UPDATE SET last_used_at" in args[0]
+    assert args[1:3] == ("k2", "m")
+    assert np.frombuffer(args[3], dtype=np.float32).tolist() == [1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_errors_are_ignored(mock_pool):
+    cache = EmbeddingCache(max_entries=4, pool=mock_pool)
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    conn.fetchrow.side_effect = RuntimeError("db down")
+    conn.execute.side_effect = RuntimeError("db down")
+
+    assert await cache.get("k") is None
+    await cache.put("k", "m", [1.0])
+    assert await cache.get("k") == [1.0]
+
+
+@pytest.mark.asyncio
+async def test_prune_deletes_expired_and_overflow_rows(mock_pool):
+    cache = EmbeddingCache(max_entries=4, pool=mock_pool)
+    conn = mock_pool.acquire.return_value.__aenter__.return_value
+    conn.execute.side_effect = ["DELETE 3", "DELETE 2"]
+
+    assert await cache.prune(ttl_days=30, max_rows=1000) == 5
+
+    (expired_sql, ttl), (overflow_sql, max_rows) = [
+        c.args for c in conn.execute.call_args_list
+    ]
+    assert "last_used_at < now()" in expired_sql and ttl == 30
+    assert "ORDER BY last_used_at DESC" in overflow_sql and max_rows == 1000
+
+
+@pytest.mark.asyncio
+async def test_prune_without_persistent_tier_is_noop():
+    assert await EmbeddingCache(max_entries=4).prune(ttl_days=1, max_rows=1) == 0
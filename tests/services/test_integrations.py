@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from panager.services.integrations import IntegrationService
+
+
+@pytest.fixture
+def mock_pool():
+    pool = MagicMock()
+    conn = AsyncMock()
+    context_manager = AsyncMock()
+    context_manager.__aenter__.return_value = conn
+    pool.acquire.return_value = context_manager
+    return pool, conn
+
+
+@pytest.mark.asyncio
+async def test_connected_providers_single_query(mock_pool):
+    pool, conn = mock_pool
+    conn.fetchrow.return_value = {"google": True, "github": False, "notion": True}
+    service = IntegrationService(pool)
+
+    assert await service.connected_providers(123) == {"google", "notion"}
+    conn.fetchrow.assert_awaited_once()
+    assert conn.fetchrow.call_args[0][1] == 123
+
+
+@pytest.mark.asyncio
+async def test_connected_providers_cached_until_ttl(mock_pool):
+    pool, conn = mock_pool
+    conn.fetchrow.return_value = {"google": False, "github": True, "notion": False}
+    service = IntegrationService(pool, ttl_seconds=60)
+
+    with patch("panager.services.integrations.time.monotonic", return_value=100.0):
+        await service.connected_providers(1)
+        await service.connected_providers(1)
+    assert conn.fetchrow.await_count == 1
+
+    with patch("panager.services.integrations.time.monotonic", return_value=161.0):
+        await service.connected_providers(1)
+    assert conn.fetchrow.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_forces_reload(mock_pool):
+    pool, conn = mock_pool
+    conn.fetchrow.return_value = {"google": False, "github": False, "notion": False}
+    service = IntegrationService(pool)
+
+    assert await service.connected_providers(1) == frozenset()
+
+    conn.fetchrow.return_value = {"google": True, "github": False, "notion": False}
+    service.invalidate(1)
+    assert await service.connected_providers(1) == {"google"}
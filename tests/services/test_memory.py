@@ -8,9 +8,26 @@ import numpy as np
 import pytest
 
 from panager.db.connection import init_pool, close_pool, get_pool
+from panager.services.embedding import EmbeddingService
 from panager.services.memory import MemoryService
 
 
+def _fake_encode(texts: list[str]) -> np.ndarray:
+    return np.array([[0.1] * 768] * len(texts))
+
+
+@pytest.fixture
+def embedding_settings():
+    settings = MagicMock()
+    settings.embedding_model_name = "test-model"
+    settings.embedding_backend = "torch"
+    settings.embedding_workers = 0
+    settings.embedding_max_concurrency = 1
+    settings.embedding_batch_window_ms = 0
+    settings.embedding_max_batch_size = 8
+    return settings
+
+
 @pytest.fixture(autouse=True)
 async def setup_db():
     port = os.environ.get("POSTGRES_PORT", "5432")
@@ -34,38 +51,38 @@ async def setup_db():
 
 
 @pytest.mark.asyncio
-async def test_memory_service_save_and_search():
+async def test_memory_service_save_and_search(embedding_settings):
     # SentenceTransformer를 모킹하여 실제 모델 로딩 및 인코딩 방지
-    with patch("panager.services.memory.SentenceTransformer") as mock_transformer_cls:
+    with patch("sentence_transformers.SentenceTransformer") as mock_transformer_cls:
         mock_model = MagicMock()
-        # 임베딩 결과 모킹 (768차원 리스트 반환하도록 설정)
-        mock_model.encode.return_value = np.array([0.1] * 768)
+        # 임베딩 결과 모킹 (배치 입력마다 768차원 벡터 반환)
+        mock_model.encode.side_effect = _fake_encode
         mock_transformer_cls.return_value = mock_model
 
-        service = MemoryService(get_pool())
+        service = MemoryService(get_pool(), EmbeddingService(embedding_settings))
 
         # 1. 저장 테스트
         content = "인공지능 공부하기"
         memory_id = await service.save_memory(999999, content)
 
         assert isinstance(memory_id, UUID)
-        mock_model.encode.assert_called_with(content)
+        mock_model.encode.assert_called_with([content])
 
         # 2. 검색 테스트
         results = await service.search_memories(999999, "AI")
         assert len(results) >= 1
         assert content in results
-        mock_model.encode.assert_called_with("AI")
+        mock_model.encode.assert_called_with(["AI"])
 
 
 @pytest.mark.asyncio
-async def test_memory_service_delete():
-    with patch("panager.services.memory.SentenceTransformer") as mock_transformer_cls:
+async def test_memory_service_delete(embedding_settings):
+    with patch("sentence_transformers.SentenceTransformer") as mock_transformer_cls:
         mock_model = MagicMock()
-        mock_model.encode.return_value = np.array([0.1] * 768)
+        mock_model.encode.side_effect = _fake_encode
         mock_transformer_cls.return_value = mock_model
 
-        service = MemoryService(get_pool())
+        service = MemoryService(get_pool(), EmbeddingService(embedding_settings))
 
         content = "지울 메모리"
         memory_id = await service.save_memory(999999, content)
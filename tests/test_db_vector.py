@@ -0,0 +1,142 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from panager.db.vector import (
+    VectorLayout,
+    layout_migration_sql,
+    make_binary_codec,
+    register_vector_codecs,
+    verify_layout,
+)
+from panager.db.vector_benchmark import exact_top_k, recall_at_k
+
+
+def test_vector_layout_parse_and_sql_type():
+    layout = VectorLayout.parse("halfvec(384)")
+    assert layout == VectorLayout("halfvec", 384)
+    assert layout.sql_type == "halfvec(384)"
+    assert layout.cosine_ops == "halfvec_cosine_ops"
+
+
+def test_vector_layout_rejects_invalid_values():
+    with pytest.raises(ValueError):
+        VectorLayout("bit", 768)
+    with pytest.raises(ValueError):
+        VectorLayout("vector", 1024)
+    with pytest.raises(ValueError):
+        VectorLayout.parse("text")
+
+
+def test_vector_layout_from_env(monkeypatch):
+    monkeypatch.delenv("VECTOR_STORAGE", raising=False)
+    monkeypatch.delenv("VECTOR_DIMENSIONS", raising=False)
+    assert VectorLayout.from_env() == VectorLayout()
+
+    monkeypatch.setenv("VECTOR_STORAGE", "halfvec")
+    monkeypatch.setenv("VECTOR_DIMENSIONS", "384")
+    assert VectorLayout.from_env() == VectorLayout("halfvec", 384)
+
+
+def test_vector_layout_prepare_truncates():
+    layout = VectorLayout("halfvec", 3)
+    prepared = layout.prepare([0.1, 0.2, 0.3, 0.4])
+    assert prepared.dtype == np.float32
+    np.testing.assert_allclose(prepared, [0.1, 0.2, 0.3])
+
+
+def test_binary_codec_matches_pgvector_wire_format():
+    encode, decode = make_binary_codec("vector")
+    payload = encode([1.0, -2.5])
+    # int16 차원, int16 예약, big-endian float32
+    assert payload == b"\x00\x02\x00\x00" + np.array([1.0, -2.5], ">f4").tobytes()
+    decoded = decode(payload)
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, [1.0, -2.5])
+
+
+def test_binary_codec_halfvec_roundtrip():
+    encode, decode = make_binary_codec("halfvec")
+    vector = np.array([0.5, 0.25, -1.0], dtype=np.float32)
+    payload = encode(vector)
+    assert len(payload) == 4 + 3 * 2
+    np.testing.assert_array_equal(decode(payload), vector)
+
+
+@pytest.mark.asyncio
+async def test_register_vector_codecs_sets_binary_codecs():
+    conn = MagicMock()
+    conn.fetch = AsyncMock(
+        return_value=[
+            {"typname": "vector", "nspname": "public"},
+            {"typname": "halfvec", "nspname": "public"},
+        ]
+    )
+    conn.set_type_codec = AsyncMock()
+
+    await register_vector_codecs(conn)
+
+    assert conn.set_type_codec.await_count == 2
+    assert conn.set_type_codec.await_args.kwargs["format"] == "binary"
+
+
+@pytest.mark.asyncio
+async def test_register_vector_codecs_skips_without_extension():
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+    conn.set_type_codec = AsyncMock()
+
+    await register_vector_codecs(conn)
+
+    conn.set_type_codec.assert_not_awaited()
+
+
+def test_layout_migration_sql_noop_when_equal():
+    layout = VectorLayout()
+    assert layout_migration_sql("memories", layout, layout) == []
+
+
+def test_layout_migration_sql_truncates_with_subvector():
+    statements = layout_migration_sql(
+        "memories", VectorLayout("vector", 768), VectorLayout("halfvec", 384)
+    )
+    assert statements[0] == "DROP INDEX IF EXISTS ix_memories_embedding"
+    assert "subvector(embedding::vector, 1, 384)::halfvec(384)" in statements[1]
+    assert "halfvec_cosine_ops" in statements[2]
+
+
+def test_layout_migration_sql_same_dimensions_casts():
+    statements = layout_migration_sql(
+        "tool_registry", VectorLayout("vector", 768), VectorLayout("halfvec", 768)
+    )
+    assert "USING embedding::halfvec(768)" in statements[1]
+
+
+def test_layout_migration_sql_rejects_increase():
+    with pytest.raises(ValueError):
+        layout_migration_sql(
+            "memories", VectorLayout("vector", 256), VectorLayout("vector", 768)
+        )
+
+
+@pytest.mark.asyncio
+async def test_verify_layout_mismatch_raises():
+    conn = MagicMock()
+    conn.fetchval = AsyncMock(return_value="vector(768)")
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    await verify_layout(pool, VectorLayout())
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        await verify_layout(pool, VectorLayout("halfvec", 384))
+
+
+def test_benchmark_recall_against_exact_top_k():
+    corpus = np.eye(4, dtype=np.float32)
+    queries = np.array([[1.0, 0.1, 0.0, 0.0]], dtype=np.float32)
+    expected = exact_top_k(corpus, queries, 2)
+    assert expected[0].tolist() == [0, 1]
+    assert recall_at_k(expected, [[0, 3]], 2) == 0.5
+    assert recall_at_k(expected, [[0, 1]], 1) == 1.0
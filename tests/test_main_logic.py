@@ -55,8 +55,15 @@ async def test_main_orchestration():
         patch("panager.main.os.makedirs"),
         patch("panager.main.close_pool", new_callable=AsyncMock) as mock_close_pool,
         patch("panager.main.SchedulerService") as mock_scheduler_service_cls,
+        patch("panager.main.EmbeddingService") as mock_embedding_service_cls,
+        patch("panager.main.EmbeddingCache") as mock_embedding_cache_cls,
+        patch("panager.main.VectorLayout"),
+        patch("panager.main.verify_layout", new_callable=AsyncMock) as mock_verify,
+        patch("panager.main.ReadinessTracker") as mock_readiness_cls,
+        patch("panager.main.LLMClient") as mock_llm_client_cls,
     ):
         # Setup mocks
+        mock_embedding_cache_cls.return_value.prune_periodically = AsyncMock()
         mock_registry = MagicMock()
         mock_registry.sync_to_db = AsyncMock()
         mock_registry_cls.return_value = mock_registry
@@ -88,6 +95,11 @@ async def test_main_orchestration():
         mock_scheduler_service.restore_schedules = AsyncMock()
         mock_scheduler_service_cls.return_value = mock_scheduler_service
 
+        mock_embedding_service_cls.return_value.close = AsyncMock()
+        mock_readiness_cls.return_value.warm_up = AsyncMock()
+        mock_llm_client = mock_llm_client_cls.return_value
+        mock_llm_client.aclose = AsyncMock()
+
         # Execute main
         await main()
 
@@ -97,10 +109,22 @@ async def test_main_orchestration():
         mock_pg_connect.assert_called_once()
         mock_saver.setup.assert_called_once()
         mock_build_graph.assert_called_once()
-        mock_create_app.assert_called_once_with(mock_bot)
+        mock_create_app.assert_called_once_with(
+            mock_bot, mock_readiness_cls.return_value
+        )
         mock_server_cls.assert_called_once()
         mock_bot.start.assert_called_once_with(mock_settings.discord_token)
 
         # Verify cleanup
         mock_pg_conn.close.assert_called_once()
         mock_close_pool.assert_called_once()
+        mock_embedding_service_cls.return_value.close.assert_awaited_once()
+        mock_verify.assert_awaited_once()
+        warmup_checks = mock_readiness_cls.return_value.warm_up.call_args.args[0]
+        assert set(warmup_checks) == {"database", "embedding", "llm"}
+        assert warmup_checks["llm"] == mock_llm_client.warm_up
+
+        # 공유 LLM 클라이언트를 그래프에 주입하고 종료 시 연결 풀을 닫음
+        mock_llm_client_cls.assert_called_once_with(mock_settings)
+        assert mock_build_graph.call_args.kwargs["llm_client"] is mock_llm_client
+        mock_llm_client.aclose.assert_awaited_once()
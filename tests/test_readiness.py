@@ -0,0 +1,46 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from panager.core.readiness import ComponentState, ReadinessTracker
+
+
+@pytest.mark.asyncio
+async def test_warm_up_marks_components_ready():
+    tracker = ReadinessTracker()
+    db_check = AsyncMock()
+    embedding_check = AsyncMock()
+
+    await tracker.warm_up({"database": db_check, "embedding": embedding_check})
+
+    assert tracker.is_ready
+    db_check.assert_awaited_once()
+    embedding_check.assert_awaited_once()
+    components = tracker.snapshot()["components"]
+    assert components["database"]["state"] == "ready"
+    assert components["database"]["elapsed_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_warm_up_retries_failed_component():
+    tracker = ReadinessTracker()
+    llm_check = AsyncMock(side_effect=[ConnectionError("down"), None])
+
+    await tracker.warm_up({"llm": llm_check}, retry_interval=0)
+
+    assert tracker.is_ready
+    assert llm_check.await_count == 2
+    assert tracker.snapshot()["components"]["llm"]["attempts"] == 2
+
+
+def test_not_ready_until_all_components_ready():
+    tracker = ReadinessTracker()
+    tracker.register("database")
+    tracker.register("embedding")
+    tracker.set_state("database", ComponentState.READY)
+    assert not tracker.is_ready
+
+    tracker.set_state("embedding", ComponentState.FAILED, error="boom")
+    snapshot = tracker.snapshot()
+    assert snapshot["status"] == "starting"
+    assert snapshot["components"]["embedding"]["error"] == "boom"